@@ -0,0 +1,101 @@
+"""Parse success rate and time per response: ``extract_json`` vs. the former regex-based parser.
+
+Runs over ``benchmarks/corpus/gemini_responses.jsonl``. Each entry holds a Gemini-style answer
+to the search prompt (fenced or bare JSON, prose, inserted citation links, trailing commas,
+single quotes, unquoted keys, truncated output) and the number of store objects it contains.
+Append captured responses in the same format to grow the corpus.
+
+    python benchmarks/bench_json_extract.py [--repeat 20]
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import io
+import json
+import re
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from src.utils.json_stream import JsonExtractionError, extract_json  # noqa: E402
+
+CORPUS = Path(__file__).resolve().parent / "corpus" / "gemini_responses.jsonl"
+
+
+def legacy_parse(text_with_citations: str) -> Any:
+    """The parser as it was in GeminiService._parse_important_nodes (prints silenced)."""
+    data: Any = []
+    with contextlib.redirect_stdout(io.StringIO()):
+        json_match = re.search(r'```json\n(.*?)\n```', text_with_citations, re.DOTALL)
+        json_text = json_match.group(1) if json_match else text_with_citations
+        try:
+            data = json.loads(json_text)
+        except json.JSONDecodeError:
+            fixed_json = re.sub(r',(\s*[}\]])', r'\1', json_text)
+            fixed_json = re.sub(r'(?<!\\)"(?=(?:[^"\\]|\\.)*"[^"]*$)', '\\"', fixed_json)
+            try:
+                data = json.loads(fixed_json)
+            except json.JSONDecodeError:
+                data = []
+    return data
+
+
+def single_pass(text: str) -> Any:
+    try:
+        return extract_json(text)
+    except JsonExtractionError:
+        return []
+
+
+def _ok(result: Any, expected: int) -> bool:
+    return (
+        isinstance(result, list)
+        and len(result) == expected
+        and all(isinstance(item, dict) and item.get("store_name") for item in result)
+    )
+
+
+def measure(parse: Callable[[str], Any], corpus: List[Dict[str, Any]], repeat: int) -> Dict[str, Any]:
+    successes: Dict[str, List[bool]] = {}
+    timings: List[float] = []
+    for entry in corpus:
+        started = time.perf_counter()
+        for _ in range(repeat):
+            result = parse(entry["text"])
+        timings.append((time.perf_counter() - started) / repeat)
+        successes.setdefault(entry["kind"], []).append(_ok(result, entry["expected_items"]))
+    return {"kinds": successes, "timings": timings}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+    corpus = [json.loads(line) for line in CORPUS.read_text(encoding="utf-8").splitlines() if line.strip()]
+
+    results = {name: measure(fn, corpus, args.repeat) for name, fn in (("legacy", legacy_parse), ("single-pass", single_pass))}
+    kinds = sorted({entry["kind"] for entry in corpus})
+    print(f"{len(corpus)} responses, {sum(len(e['text']) for e in corpus) / len(corpus) / 1024:.1f} KiB average\n")
+    print(f"{'kind':<18}" + "".join(f"{name:>14}" for name in results))
+    for kind in kinds:
+        row = "".join(f"{sum(r['kinds'][kind])}/{len(r['kinds'][kind])}".rjust(14) for r in results.values())
+        print(f"{kind:<18}{row}")
+    print()
+    for name, r in results.items():
+        ok = sum(sum(v) for v in r["kinds"].values())
+        timings = sorted(r["timings"])
+        p95 = timings[int(len(timings) * 0.95) - 1]
+        print(
+            f"{name:<12} success {ok}/{len(corpus)} ({ok / len(corpus):.0%})  "
+            f"mean {statistics.mean(timings) * 1e6:8.1f} us  p95 {p95 * 1e6:8.1f} us  max {timings[-1] * 1e6:8.1f} us"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""Throughput of the pure ASGI middleware stack vs. the previous BaseHTTPMiddleware stack.
+
+Drives the app in-process through httpx's ASGI transport (no sockets), so the numbers isolate
+framework + middleware overhead. ``/api/v1/search`` uses a stubbed SearchService.
+
+    python benchmarks/bench_middleware.py [--requests 5000] [--concurrency 50]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+import sys
+import time
+import uuid
+from pathlib import Path
+from typing import Callable
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import httpx  # noqa: E402
+from fastapi import FastAPI, Request  # noqa: E402
+from fastapi.middleware.cors import CORSMiddleware  # noqa: E402
+from starlette.middleware.base import BaseHTTPMiddleware  # noqa: E402
+
+from src.middleware.error_handler import ErrorHandlingMiddleware  # noqa: E402
+from src.middleware.request_id import RequestIDMiddleware  # noqa: E402
+from src.routes.health_route import router as health_router  # noqa: E402
+from src.routes.search_route import get_service, router as search_router  # noqa: E402
+from src.utils.logger import get_logger, set_request_id  # noqa: E402
+from src.validation.schemas import SearchResponse, StatusInfo  # noqa: E402
+
+logger = get_logger(__name__)
+
+SEARCH_BODY = {"productName": "milk", "zip": "98101", "min_store_results": "5", "radius_miles": "5"}
+
+
+class StubSearchService:
+    async def search_cached(self, req):
+        return SearchResponse(stores_list=[], status_info=StatusInfo(http_code=200, reason_details=[])), "HIT"
+
+
+class LegacyRequestIDMiddleware(BaseHTTPMiddleware):
+    """The request-id middleware as it was before the ASGI rewrite."""
+
+    async def dispatch(self, request: Request, call_next: Callable):
+        request_id = request.headers.get("X-Request-ID") or str(uuid.uuid4())
+        set_request_id(request_id)
+        try:
+            logger.info("Request start %s %s | request_id=%s", request.method, request.url.path, request_id)
+            response = await call_next(request)
+            response.headers["X-Request-ID"] = request_id
+            logger.info("Request end %s %s %s | request_id=%s", request.method, request.url.path, response.status_code, request_id)
+            return response
+        finally:
+            set_request_id(None)
+
+
+class LegacyErrorHandlingMiddleware(BaseHTTPMiddleware):
+    async def dispatch(self, request: Request, call_next: Callable):
+        return await call_next(request)
+
+
+def build_app(legacy: bool) -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(LegacyRequestIDMiddleware if legacy else RequestIDMiddleware)
+    app.add_middleware(CORSMiddleware, allow_origins=["*"], allow_methods=["*"], allow_headers=["*"])
+    app.add_middleware(LegacyErrorHandlingMiddleware if legacy else ErrorHandlingMiddleware)
+    app.include_router(search_router)
+    app.include_router(health_router)
+    stub = StubSearchService()
+    app.dependency_overrides[get_service] = lambda: stub
+    return app
+
+
+async def run(app: FastAPI, method: str, path: str, total: int, concurrency: int) -> float:
+    """Return requests per second."""
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+        sem = asyncio.Semaphore(concurrency)
+
+        async def one() -> None:
+            async with sem:
+                if method == "GET":
+                    r = await client.get(path)
+                else:
+                    r = await client.post(path, json=SEARCH_BODY)
+                r.raise_for_status()
+
+        # Warm up routing/validation caches
+        await asyncio.gather(*(one() for _ in range(min(200, total))))
+        started = time.perf_counter()
+        await asyncio.gather(*(one() for _ in range(total)))
+        return total / (time.perf_counter() - started)
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    args = parser.parse_args()
+    # Logging volume is the same for both stacks; silence it so stdout writes do not dominate.
+    get_logger().setLevel(logging.WARNING)
+
+    print(f"{'endpoint':<22}{'BaseHTTPMiddleware':>20}{'pure ASGI':>14}{'speedup':>10}")
+    for method, path in (("GET", "/health"), ("POST", "/api/v1/search")):
+        legacy = await run(build_app(legacy=True), method, path, args.requests, args.concurrency)
+        current = await run(build_app(legacy=False), method, path, args.requests, args.concurrency)
+        print(f"{method + ' ' + path:<22}{legacy:>16.0f} r/s{current:>10.0f} r/s{current / legacy:>9.2f}x")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
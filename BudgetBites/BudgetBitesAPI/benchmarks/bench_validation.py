@@ -0,0 +1,91 @@
+"""Requests/s for SearchRequest parsing plus business validation: precompiled model vs. former code.
+
+The former ``SearchService._validate_search_request`` compiled its regexes and stripped every
+field on each call; ``validate_search_criteria`` runs one pydantic-core validation against
+patterns compiled when the schema class was built.
+
+    python benchmarks/bench_validation.py [--iterations 50000]
+"""
+
+from __future__ import annotations
+
+import argparse
+import re
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from src.validation.schemas import Request_Object_Validator, SearchRequest, validate_search_criteria  # noqa: E402
+
+BODIES: List[Dict[str, Any]] = [
+    {"product_name": "milk", "zip_code": "98101", "min_store_results": "5", "radius_miles": "10"},
+    {"productName": "organic eggs", "zip": 98101, "minStoreResults": 5, "radiusMiles": 10},
+    {"product_name": "bread!", "postalCode": "9810", "min_store_results": "5", "radius_miles": "10"},
+    {"product_name": " ", "city": "Seattle", "state": "WA", "min_store_results": "5", "radius_miles": "x"},
+]
+
+
+def legacy_validate(req: SearchRequest) -> Optional[List[Request_Object_Validator]]:
+    """The validator as it was in SearchService (regexes compiled per call)."""
+    product_name_pattern = re.compile(r"^[a-zA-Z0-9\s]+$")
+    zip_code_pattern = re.compile(r"^\d{5}(-\d{4})?$")
+    errors = []
+    product_name = req.product_name.strip() if req.product_name else ""
+    if not product_name:
+        errors.append(Request_Object_Validator(field="product_name", message="Product name is required"))
+    elif not product_name_pattern.match(product_name):
+        errors.append(Request_Object_Validator(
+            field="product_name",
+            message="Product name contains invalid characters; only letters, numbers, and spaces are allowed",
+        ))
+    zip_code = req.zip_code.strip() if req.zip_code else ""
+    if not zip_code:
+        errors.append(Request_Object_Validator(field="location", message="Zip code is required"))
+    elif not zip_code_pattern.match(zip_code):
+        errors.append(Request_Object_Validator(field="zip_code", message="Zip code must be in format 12345 or 12345-6789"))
+    min_store_results = req.min_store_results.strip() if req.min_store_results else ""
+    if not min_store_results or not str(min_store_results).isdigit():
+        errors.append(Request_Object_Validator(field="min_store_results", message="Minimum store results must be a valid number"))
+    radius_miles = req.radius_miles.strip() if req.radius_miles else ""
+    if not radius_miles or not str(radius_miles).isdigit():
+        errors.append(Request_Object_Validator(field="radius_miles", message="Radius miles must be a valid number"))
+    return errors if errors else None
+
+
+def _dump(errors: Optional[List[Request_Object_Validator]]) -> List[Any]:
+    return [e.model_dump() for e in errors or []]
+
+
+def measure(validate: Callable[[SearchRequest], Any], bodies: List[Dict[str, Any]], iterations: int, parse: bool) -> float:
+    requests = [SearchRequest.model_validate(dict(body)) for body in bodies]
+    started = time.perf_counter()
+    for i in range(iterations):
+        req = SearchRequest.model_validate(dict(bodies[i % len(bodies)])) if parse else requests[i % len(requests)]
+        validate(req)
+    return iterations / (time.perf_counter() - started)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=50000)
+    args = parser.parse_args()
+
+    for body in BODIES:
+        req = SearchRequest.model_validate(dict(body))
+        assert _dump(legacy_validate(req)) == _dump(validate_search_criteria(req)), body
+
+    mixes = (("valid", BODIES[:2]), ("invalid", BODIES[2:]))
+    print(f"{args.iterations} requests per cell\n")
+    print(f"{'':<14}{'':<10}{'validate only':>16}{'parse + validate':>18}")
+    for mix, bodies in mixes:
+        for name, fn in (("legacy", legacy_validate), ("precompiled", validate_search_criteria)):
+            only = measure(fn, bodies, args.iterations, parse=False)
+            full = measure(fn, bodies, args.iterations, parse=True)
+            print(f"{name:<14}{mix:<10}{only:>12,.0f} r/s{full:>14,.0f} r/s")
+
+
+if __name__ == "__main__":
+    main()
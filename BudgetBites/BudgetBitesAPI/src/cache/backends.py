@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, NamedTuple, Optional
+
+
+class CacheEntry(NamedTuple):
+    value: Any
+    stored_at: float
+    expires_at: float  # end of the fresh window (monotonic seconds)
+    stale_until: float  # end of the stale-while-revalidate window
+
+
+class CacheBackend(ABC):
+    """Storage interface for response caches.
+
+    Implementations for shared stores (e.g. Redis/Memcached) must serialize ``CacheEntry.value``
+    themselves and may enforce their own eviction; TTL decisions stay in the cache front-end.
+    """
+
+    @abstractmethod
+    async def get(self, key: str) -> Optional[CacheEntry]:
+        ...
+
+    @abstractmethod
+    async def set(self, key: str, entry: CacheEntry) -> None:
+        ...
+
+    @abstractmethod
+    async def delete(self, key: str) -> None:
+        ...
+
+    @abstractmethod
+    async def clear(self) -> None:
+        ...
+
+
+class LRUDict:
+    """Bounded mapping that evicts the least recently used key once ``max_entries`` is exceeded."""
+
+    def __init__(self, max_entries: int) -> None:
+        self.max_entries = max(1, int(max_entries))
+        self._data: "OrderedDict[str, Any]" = OrderedDict()
+
+    def get(self, key: str) -> Any:
+        value = self._data.get(key)
+        if value is not None:
+            self._data.move_to_end(key)
+        return value
+
+    def set(self, key: str, value: Any) -> None:
+        self._data[key] = value
+        self._data.move_to_end(key)
+        while len(self._data) > self.max_entries:
+            self._data.popitem(last=False)
+
+    def pop(self, key: str) -> None:
+        self._data.pop(key, None)
+
+    def clear(self) -> None:
+        self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._data
+
+
+class InMemoryCacheBackend(CacheBackend):
+    """Process-local LRU backend. All access happens on the event loop thread, so no locking is needed."""
+
+    def __init__(self, max_entries: int = 1000) -> None:
+        self._entries = LRUDict(max_entries)
+
+    async def get(self, key: str) -> Optional[CacheEntry]:
+        return self._entries.get(key)
+
+    async def set(self, key: str, entry: CacheEntry) -> None:
+        self._entries.set(key, entry)
+
+    async def delete(self, key: str) -> None:
+        self._entries.pop(key)
+
+    async def clear(self) -> None:
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -0,0 +1,143 @@
+from __future__ import annotations
+
+import asyncio
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import NamedTuple, Optional, Tuple
+
+from ..utils.config import get_setting
+from ..utils.logger import get_logger
+from .backends import LRUDict
+
+logger = get_logger(__name__)
+
+_PROJECT_ROOT = Path(__file__).resolve().parents[2]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS place_lookup (
+    query TEXT PRIMARY KEY,
+    place_id TEXT,
+    formatted_address TEXT,
+    website TEXT,
+    found INTEGER NOT NULL,
+    expires_at REAL NOT NULL,
+    latitude REAL,
+    longitude REAL
+)
+"""
+# Columns added after the first release; ALTERed into existing databases on connect
+_ADDED_COLUMNS = (("latitude", "REAL"), ("longitude", "REAL"))
+
+
+class PlaceRecord(NamedTuple):
+    place_id: Optional[str]
+    formatted_address: Optional[str]
+    website: Optional[str]
+    latitude: Optional[float] = None
+    longitude: Optional[float] = None
+
+
+def normalize_place_query(query: str) -> str:
+    return " ".join(query.split()).lower()
+
+
+class PlaceCache:
+    """Persistent cache of Places enrichment lookups (query -> place_id, address, website, coordinates).
+
+    An in-memory LRU sits in front of a local SQLite table so warm lookups never leave the
+    event loop. "Not found" answers are cached too, with their own (shorter) TTL, so unknown
+    stores do not trigger a Text Search on every request. Errors are never cached.
+    """
+
+    def __init__(self, path: Optional[str] = None) -> None:
+        self.enabled: bool = bool(get_setting("cache.places.enabled", True))
+        self.positive_ttl: float = float(get_setting("cache.places.positive_ttl_seconds", 30 * 24 * 3600))
+        self.negative_ttl: float = float(get_setting("cache.places.negative_ttl_seconds", 24 * 3600))
+        db_path = Path(path or get_setting("cache.places.path", ".cache/places.sqlite3"))
+        self.path = db_path if db_path.is_absolute() else _PROJECT_ROOT / db_path
+        self._memory = LRUDict(int(get_setting("cache.places.memory_max_entries", 5000)))
+        self._conn: Optional[sqlite3.Connection] = None
+        self._db_lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.path), check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(_SCHEMA)
+            existing = {row[1] for row in conn.execute("PRAGMA table_info(place_lookup)")}
+            for column, kind in _ADDED_COLUMNS:
+                if column not in existing:
+                    conn.execute(f"ALTER TABLE place_lookup ADD COLUMN {column} {kind}")
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    def _db_get(self, key: str) -> Optional[Tuple[Optional[PlaceRecord], float]]:
+        with self._db_lock:
+            row = self._connect().execute(
+                "SELECT place_id, formatted_address, website, found, expires_at, latitude, longitude "
+                "FROM place_lookup WHERE query = ?",
+                (key,),
+            ).fetchone()
+        if row is None:
+            return None
+        record = PlaceRecord(row[0], row[1], row[2], row[5], row[6]) if row[3] else None
+        return record, row[4]
+
+    def _db_set(self, key: str, record: Optional[PlaceRecord], expires_at: float) -> None:
+        values = record or PlaceRecord(None, None, None)
+        with self._db_lock:
+            conn = self._connect()
+            conn.execute(
+                "INSERT OR REPLACE INTO place_lookup "
+                "(query, place_id, formatted_address, website, found, expires_at, latitude, longitude) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    key, values.place_id, values.formatted_address, values.website, int(record is not None),
+                    expires_at, values.latitude, values.longitude,
+                ),
+            )
+            conn.commit()
+
+    async def get(self, query: str) -> Tuple[bool, Optional[PlaceRecord]]:
+        """Return ``(hit, record)``; a hit with ``record=None`` is a cached "not found"."""
+        if not self.enabled:
+            return False, None
+        key = normalize_place_query(query)
+        now = time.time()
+        cached = self._memory.get(key)
+        if cached is None:
+            try:
+                cached = await asyncio.to_thread(self._db_get, key)
+            except sqlite3.Error as exc:
+                logger.warning("Place cache read failed: %s", exc)
+                return False, None
+            if cached is None:
+                return False, None
+            self._memory.set(key, cached)
+        record, expires_at = cached
+        if now >= expires_at:
+            self._memory.pop(key)
+            return False, None
+        return True, record
+
+    async def set(self, query: str, record: Optional[PlaceRecord]) -> None:
+        if not self.enabled:
+            return
+        key = normalize_place_query(query)
+        expires_at = time.time() + (self.positive_ttl if record is not None else self.negative_ttl)
+        self._memory.set(key, (record, expires_at))
+        try:
+            await asyncio.to_thread(self._db_set, key, record, expires_at)
+        except sqlite3.Error as exc:
+            logger.warning("Place cache write failed: %s", exc)
+
+    def close(self) -> None:
+        with self._db_lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from typing import Awaitable, Callable, Optional, Set, Tuple
+
+from ..utils.config import get_setting
+from ..utils.logger import get_logger
+from ..validation.schemas import SearchRequest, SearchResponse
+from .backends import CacheBackend, CacheEntry, InMemoryCacheBackend
+
+logger = get_logger(__name__)
+
+CACHE_HIT = "HIT"
+CACHE_MISS = "MISS"
+CACHE_STALE = "STALE"
+CACHE_BYPASS = "BYPASS"
+
+Loader = Callable[[], Awaitable[SearchResponse]]
+
+
+def _norm(value: Optional[str]) -> str:
+    return " ".join(str(value).split()).lower() if value else ""
+
+
+def search_cache_key(req: SearchRequest) -> str:
+    """Build a cache key from the normalized request (case and whitespace insensitive)."""
+    return "search:v1:" + "|".join(
+        (
+            _norm(req.product_name),
+            _norm(req.zip_code),
+            _norm(req.city_name),
+            _norm(req.state_name),
+            _norm(req.radius_miles),
+            _norm(req.min_store_results),
+        )
+    )
+
+
+class SearchCache:
+    """TTL + LRU cache in front of ``SearchService`` with stale-while-revalidate refresh.
+
+    Fresh entries are served directly. Entries past their TTL but still inside the
+    ``stale_while_revalidate_seconds`` window are served immediately while a single background
+    refresh reloads them. Only successful, non-empty responses are stored.
+    """
+
+    def __init__(self, backend: Optional[CacheBackend] = None) -> None:
+        self.enabled: bool = bool(get_setting("cache.search.enabled", True))
+        self.ttl: float = float(get_setting("cache.search.ttl_seconds", 300))
+        self.stale_ttl: float = float(get_setting("cache.search.stale_while_revalidate_seconds", 600))
+        if backend is None:
+            backend = InMemoryCacheBackend(int(get_setting("cache.search.max_entries", 1000)))
+        self.backend: CacheBackend = backend
+        self._refreshing: Set[str] = set()
+        self._tasks: Set[asyncio.Task] = set()
+
+    @staticmethod
+    def is_cacheable(response: SearchResponse) -> bool:
+        return response.status_info.http_code == 200 and bool(response.stores_list)
+
+    async def get_or_load(self, req: SearchRequest, loader: Loader) -> Tuple[SearchResponse, str]:
+        """Return ``(response, cache_status)`` where status is HIT, STALE, MISS or BYPASS."""
+        if not self.enabled:
+            return await loader(), CACHE_BYPASS
+        key = search_cache_key(req)
+        entry = await self.backend.get(key)
+        now = time.monotonic()
+        if entry is not None:
+            if now < entry.expires_at:
+                return entry.value, CACHE_HIT
+            if now < entry.stale_until:
+                self._schedule_refresh(key, loader)
+                return entry.value, CACHE_STALE
+            await self.backend.delete(key)
+        response = await loader()
+        await self._store(key, response)
+        return response, CACHE_MISS
+
+    async def lookup(self, req: SearchRequest) -> Optional[SearchResponse]:
+        """Return a fresh cached response for ``req`` without loading on a miss."""
+        if not self.enabled:
+            return None
+        entry = await self.backend.get(search_cache_key(req))
+        if entry is not None and time.monotonic() < entry.expires_at:
+            return entry.value
+        return None
+
+    async def put(self, req: SearchRequest, response: SearchResponse) -> None:
+        if self.enabled:
+            await self._store(search_cache_key(req), response)
+
+    async def _store(self, key: str, response: SearchResponse) -> None:
+        if not self.is_cacheable(response):
+            return
+        now = time.monotonic()
+        expires_at = now + self.ttl
+        await self.backend.set(key, CacheEntry(response, now, expires_at, expires_at + self.stale_ttl))
+
+    def _schedule_refresh(self, key: str, loader: Loader) -> None:
+        if key in self._refreshing:
+            return
+        self._refreshing.add(key)
+        task = asyncio.create_task(self._refresh(key, loader))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _refresh(self, key: str, loader: Loader) -> None:
+        try:
+            await self._store(key, await loader())
+        except Exception as exc:  # pylint: disable=broad-except
+            logger.warning("Background cache refresh failed for %s: %s", key, exc)
+        finally:
+            self._refreshing.discard(key)
+
+    async def clear(self) -> None:
+        await self.backend.clear()
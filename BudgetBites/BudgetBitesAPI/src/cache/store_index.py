@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import time
+from typing import Dict, List, Optional, Tuple
+
+from ..utils.config import get_setting
+from ..utils.geo import GeoGrid
+from ..validation.schemas import StoreItem
+from .backends import LRUDict
+
+
+class _ProductStores:
+    __slots__ = ("grid", "items")
+
+    def __init__(self, cell_degrees: float) -> None:
+        self.grid: GeoGrid[str] = GeoGrid(cell_degrees)
+        self.items: Dict[str, Tuple[StoreItem, float]] = {}  # store key -> (item, stored_at)
+
+
+class NearbyStoreIndex:
+    """Recently seen stores with Places coordinates, per product, in a spatial grid.
+
+    A search near a ZIP that was answered before (for the same product) can be served from the
+    stores already known within its radius instead of a new Gemini call. Entries expire after
+    ``geo.reuse_ttl_seconds`` since prices go stale. All access happens on the event loop thread.
+    """
+
+    def __init__(self) -> None:
+        self.enabled: bool = bool(get_setting("geo.reuse_nearby_stores", True))
+        self.ttl: float = float(get_setting("geo.reuse_ttl_seconds", 3600))
+        self.cell_degrees: float = float(get_setting("geo.grid_cell_degrees", 0.25))
+        self.max_per_product: int = int(get_setting("geo.max_stores_per_product", 500))
+        self._products = LRUDict(int(get_setting("geo.max_products", 1000)))
+
+    @staticmethod
+    def _store_key(store: StoreItem) -> str:
+        details = store.store_details
+        return " ".join(f"{details.store_name} {details.store_address}".split()).lower()
+
+    def add(self, product: str, stores: List[StoreItem]) -> int:
+        """Index the stores that have coordinates; returns how many were added."""
+        if not self.enabled or not product:
+            return 0
+        bucket: Optional[_ProductStores] = self._products.get(product)
+        if bucket is None:
+            bucket = _ProductStores(self.cell_degrees)
+            self._products.set(product, bucket)
+        now = time.monotonic()
+        added = 0
+        for store in stores:
+            details = store.store_details
+            if details.latitude is None or details.longitude is None:
+                continue
+            key = self._store_key(store)
+            bucket.items[key] = (store.model_copy(deep=True), now)
+            bucket.grid.add(key, details.latitude, details.longitude)
+            added += 1
+        if len(bucket.items) > self.max_per_product:
+            oldest = sorted(bucket.items, key=lambda k: bucket.items[k][1])[: len(bucket.items) - self.max_per_product]
+            for key in oldest:
+                del bucket.items[key]
+                bucket.grid.remove(key)
+        return added
+
+    def nearby(self, product: str, lat: float, lng: float, radius_miles: float) -> List[Tuple[StoreItem, float]]:
+        """Fresh stores for ``product`` within the radius as ``(copy, distance_miles)``, nearest first."""
+        if not self.enabled:
+            return []
+        bucket: Optional[_ProductStores] = self._products.get(product)
+        if bucket is None:
+            return []
+        cutoff = time.monotonic() - self.ttl
+        found = []
+        for key, distance in bucket.grid.within(lat, lng, radius_miles):
+            store, stored_at = bucket.items[key]
+            if stored_at < cutoff:
+                del bucket.items[key]
+                bucket.grid.remove(key)
+                continue
+            found.append((store.model_copy(deep=True), distance))
+        return found
+
+    def clear(self) -> None:
+        self._products.clear()
@@ -1,25 +1,43 @@
-from fastapi import Request
 from fastapi.responses import JSONResponse
-from starlette.middleware.base import BaseHTTPMiddleware
-from typing import Callable
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 from ..utils.logger import get_logger
 from ..utils.config import get_setting
-from ..validation.schemas import SearchResponse, StatusInfo
+from ..validation.schemas import ReasonDetails, Request_Object_Validator, SearchResponse, StatusInfo
 
 logger = get_logger()
 
-class ErrorHandlingMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request: Request, call_next: Callable):
+class ErrorHandlingMiddleware:
+    """Pure ASGI middleware turning unhandled exceptions into a structured 500 ``SearchResponse``."""
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        response_started = False
+
+        async def track_start(message: Message) -> None:
+            nonlocal response_started
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
+
         try:
-            response = await call_next(request)
-            return response
+            await self.app(scope, receive, track_start)
         except Exception as exc:  # pylint: disable=broad-except
             logger.exception("Unhandled error: %s", exc)
+            if response_started:
+                # Headers are already on the wire; the server will abort the connection.
+                raise
             status = StatusInfo(
                 http_code=500,
-                reason_code="INTERNAL_ERROR",
-                reason_status="failure",
-                reason_details="An unexpected error occurred.",
+                reason_details=[ReasonDetails(
+                    reason_code="INTERNAL_ERROR",
+                    reason_status="failure",
+                    reason_details=[Request_Object_Validator(field="message", message="An unexpected error occurred.")],
+                )],
             )
             response = SearchResponse(
                 stores_list=[],
@@ -27,4 +45,4 @@ class ErrorHandlingMiddleware(BaseHTTPMiddleware):
                 prompt_used=None,
                 api_name=get_setting("app.api_name", "UFA - Budget Bite API"),
             )
-            return JSONResponse(status_code=500, content=response.model_dump())
+            await JSONResponse(status_code=500, content=response.model_dump())(scope, receive, send)
@@ -1,34 +1,79 @@
 from __future__ import annotations
 
+import random
+import time
 import uuid
-from typing import Callable
-from fastapi import Request
-from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from ..utils.config import get_setting
 from ..utils.logger import get_logger, set_request_id
+from ..utils.metrics import HTTP_IN_FLIGHT, HTTP_LATENCY, HTTP_REQUESTS
+from ..utils.tracing import get_tracer, parse_traceparent, trace_id_from_request_id
 
 logger = get_logger(__name__)
 
-class RequestIDMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request: Request, call_next: Callable):
+class RequestIDMiddleware:
+    """Pure ASGI middleware: request id + trace context, request metrics and start/end logging.
+
+    Unlike ``BaseHTTPMiddleware`` it runs in the request's own task and only rewrites the
+    ``http.response.start`` message, so response bodies (including streams) pass straight through.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+        # Share of requests whose start/end lines are logged; failures and 5xx are always logged
+        self.log_sample_rate = float(get_setting("logging.request_sample_rate", 1.0))
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        headers = Headers(scope=scope)
+        method = scope["method"]
+        path = scope["path"]
         # Honor incoming request id header if present
-        incoming = request.headers.get("X-Request-ID") or request.headers.get("x-request-id")
-        request_id = incoming or str(uuid.uuid4())
+        incoming = headers.get("x-request-id")
+        traceparent = headers.get("traceparent")
+        parent = parse_traceparent(traceparent)
+        # Without an explicit request id, a caller's W3C trace id doubles as one (and vice versa)
+        request_id = incoming or (parent.trace_id if parent else str(uuid.uuid4()))
         set_request_id(request_id)
-        try:
-            logger.info("Request start %s %s | request_id=%s", request.method, request.url.path, request_id)
-            response = await call_next(request)
-            response.headers["X-Request-ID"] = request_id
-            logger.info(
-                "Request end %s %s %s | request_id=%s",
-                request.method,
-                request.url.path,
-                response.status_code,
-                request_id,
-            )
-            return response
-        except Exception as exc:  # pylint: disable=broad-except
-            logger.exception("Request failed %s %s | request_id=%s | error=%s", request.method, request.url.path, request_id, exc)
-            raise
-        finally:
-            # Clear context to avoid leaking into background tasks
-            set_request_id(None)
+        started = time.perf_counter()
+        status_code = 500
+        HTTP_IN_FLIGHT.inc()
+        with get_tracer().start_trace(
+            f"{method} {path}",
+            traceparent=traceparent,
+            trace_id=trace_id_from_request_id(request_id),
+            request_id=request_id,
+        ) as root_span:
+
+            async def send_with_headers(message: Message) -> None:
+                nonlocal status_code
+                if message["type"] == "http.response.start":
+                    status_code = message["status"]
+                    response_headers = MutableHeaders(scope=message)
+                    response_headers["X-Request-ID"] = request_id
+                    response_headers["traceparent"] = root_span.traceparent
+                await send(message)
+
+            sampled = self.log_sample_rate >= 1.0 or random.random() < self.log_sample_rate
+            try:
+                if sampled:
+                    logger.info("Request start %s %s | request_id=%s", method, path, request_id)
+                await self.app(scope, receive, send_with_headers)
+                if sampled or status_code >= 500:
+                    logger.info("Request end %s %s %s | request_id=%s", method, path, status_code, request_id)
+            except Exception as exc:  # pylint: disable=broad-except
+                logger.exception("Request failed %s %s | request_id=%s | error=%s", method, path, request_id, exc)
+                raise
+            finally:
+                HTTP_IN_FLIGHT.dec()
+                # Label by route template, not raw path, to keep series cardinality bounded
+                route_path = getattr(scope.get("route"), "path", "unmatched")
+                HTTP_REQUESTS.labels(method, route_path, str(status_code)).inc()
+                HTTP_LATENCY.labels(route_path).observe(time.perf_counter() - started)
+                root_span.name = f"{method} {route_path}"
+                root_span.set_attribute("http.status_code", status_code)
+                # Clear context to avoid leaking into background tasks
+                set_request_id(None)
@@ -1,15 +1,64 @@
-from fastapi import APIRouter
-from ..validation.schemas import SearchRequest, SearchResponse
+import json
+from typing import Any, AsyncIterator, Dict
+from fastapi import APIRouter, Depends, Request, Response
+from fastapi.responses import StreamingResponse
+from ..validation.schemas import BatchSearchRequest, BatchSearchResponse, SearchRequest, SearchResponse
 from ..services.search_service import SearchService
+from ..utils.config import get_setting
+from ..utils.metrics import STAGE_SERIALIZATION
 
 router = APIRouter(prefix="/api/v1", tags=["search"])
 
-def get_service() -> SearchService:
-    # Lazy instantiation avoids startup crashes when external API keys missing.
-    # Could be enhanced with caching (singleton) if desired.
-    return SearchService()
+def get_service(request: Request) -> SearchService:
+    # App-scoped singleton built in create_app(); tests can replace it via app.dependency_overrides.
+    return request.app.state.search_service
 
 @router.post("/search", response_model=SearchResponse)
-async def search_products(payload: SearchRequest) -> SearchResponse:
-    service = get_service()
-    return await service.search(payload)
+async def search_products(
+    payload: SearchRequest,
+    service: SearchService = Depends(get_service),
+) -> Response:
+    result, cache_status = await service.search_cached(payload)
+    headers = {"X-Cache": cache_status}
+    status_code = 200
+    if result.status_info.http_code == 503:
+        # Upstream limiter shed the request; surface it so clients and load balancers back off
+        status_code = 503
+        headers["Retry-After"] = str(get_setting("upstream_limits.retry_after_seconds", 1))
+    # Serialize here (once, straight to JSON) so the cost shows up as its own stage in /metrics
+    with STAGE_SERIALIZATION.time():
+        body = result.model_dump_json()
+    return Response(content=body, status_code=status_code, media_type="application/json", headers=headers)
+
+
+@router.post("/search/batch", response_model=BatchSearchResponse)
+async def search_products_batch(
+    payload: BatchSearchRequest,
+    service: SearchService = Depends(get_service),
+) -> BatchSearchResponse:
+    return await service.search_batch(payload)
+
+async def _ndjson(events: AsyncIterator[Dict[str, Any]]) -> AsyncIterator[str]:
+    async for event in events:
+        yield json.dumps(event, ensure_ascii=False) + "\n"
+
+async def _sse(events: AsyncIterator[Dict[str, Any]]) -> AsyncIterator[str]:
+    async for event in events:
+        yield f"event: {event['event']}\ndata: {json.dumps(event, ensure_ascii=False)}\n\n"
+
+@router.post("/search/stream")
+async def search_products_stream(
+    payload: SearchRequest,
+    request: Request,
+    service: SearchService = Depends(get_service),
+) -> StreamingResponse:
+    """Stream stores as Gemini produces them, then Places enrichment patches.
+
+    Responds with Server-Sent Events when the client sends ``Accept: text/event-stream``,
+    otherwise with newline-delimited JSON.
+    """
+    events = service.search_stream(payload)
+    headers = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    if "text/event-stream" in request.headers.get("accept", ""):
+        return StreamingResponse(_sse(events), media_type="text/event-stream", headers=headers)
+    return StreamingResponse(_ndjson(events), media_type="application/x-ndjson", headers=headers)
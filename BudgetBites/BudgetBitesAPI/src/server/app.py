@@ -6,20 +6,81 @@ if __package__ is None or __package__ == "":  # executed as a script, not as a m
     project_root = Path(__file__).resolve().parents[2]  # .../BudgetBitesAPI
     sys.path.insert(0, str(project_root))
 
+import asyncio
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from src.middleware.error_handler import ErrorHandlingMiddleware
 from src.middleware.request_id import RequestIDMiddleware
 from src.routes.search_route import router as search_router
 from src.routes.health_route import router as health_router
-from src.utils.config import load_config, get_setting
+from src.routes.metrics_route import router as metrics_router
+from src.cache.place_cache import PlaceCache
+from src.cache.search_cache import SearchCache
+from src.cache.store_index import NearbyStoreIndex
+from src.services.gemini_service import GeminiService
+from src.services.places_service import PlacesService
+from src.services.search_service import SearchService
+from src.utils.config import ConfigError, add_reload_listener, get_setting, load_config, remove_reload_listener, validate_config
+from src.utils.config_watch import install_sighup_handler, remove_sighup_handler, watch_config
+from src.utils.http_pool import HttpClientPool
 from src.utils.logger import get_logger
+from src.utils.metrics import monitor_event_loop_lag
+from src.utils.tracing import get_tracer
 
 logger = get_logger()
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    lag_monitor = None
+    if get_setting("metrics.enabled", True):
+        lag_monitor = asyncio.create_task(
+            monitor_event_loop_lag(float(get_setting("metrics.event_loop_lag_interval_seconds", 0.5)))
+        )
+    config_watcher = None
+    sighup_installed = False
+    if get_setting("geo.enabled", True):
+        # Load the ZIP centroids now so a seed-only file is reported at startup, not on the first search
+        len(app.state.search_service.zip_centroids)
+    add_reload_listener(app.state.search_service.reload_settings)
+    if get_setting("config_reload.enabled", True):
+        config_watcher = asyncio.create_task(watch_config(float(get_setting("config_reload.poll_interval_seconds", 2))))
+        sighup_installed = install_sighup_handler()
+    try:
+        yield
+    finally:
+        if lag_monitor is not None:
+            lag_monitor.cancel()
+        if config_watcher is not None:
+            config_watcher.cancel()
+        if sighup_installed:
+            remove_sighup_handler()
+        remove_reload_listener(app.state.search_service.reload_settings)
+        # Drain keep-alive connections shared by the Places/Gemini services
+        await app.state.http_pool.aclose()
+        app.state.search_service.place_cache.close()
+        # Flush buffered span exports
+        get_tracer().shutdown()
+
 def create_app() -> FastAPI:
     load_config()  # Ensure config is loaded early
-    app = FastAPI(title="Budget Bites API", version="1.0.0")
+    problems = validate_config()
+    if problems:
+        # Fail fast: a broken template or limit would otherwise surface on every request
+        for problem in problems:
+            logger.error("Invalid configuration: %s", problem)
+        raise ConfigError("Invalid configuration: " + "; ".join(problems))
+    app = FastAPI(title="Budget Bites API", version="1.0.0", lifespan=lifespan)
+    app.state.http_pool = HttpClientPool()
+    # App-scoped singletons; construction never fails on missing API keys (checked per call)
+    app.state.search_service = SearchService(
+        http_pool=app.state.http_pool,
+        gemini=GeminiService(app.state.http_pool),
+        places=PlacesService(app.state.http_pool),
+        cache=SearchCache(),
+        place_cache=PlaceCache(),
+        store_index=NearbyStoreIndex(),
+    )
     # Middlewares (order: request id -> CORS -> error handler)
     app.add_middleware(RequestIDMiddleware)
     app.add_middleware(
@@ -34,6 +95,8 @@ def create_app() -> FastAPI:
     app.add_middleware(ErrorHandlingMiddleware)
     app.include_router(search_router)
     app.include_router(health_router)
+    if get_setting("metrics.enabled", True):
+        app.include_router(metrics_router)
     return app
 
 app = create_app()
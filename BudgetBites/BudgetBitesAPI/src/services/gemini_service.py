@@ -1,22 +1,55 @@
 from __future__ import annotations
 
 from fastapi import params, types
+import asyncio
 import httpx
-import json
-import re
-from typing import Any, Dict, List
+import time
+from bisect import bisect_right
+from types import SimpleNamespace
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
 from google import genai
-from google.genai import types
+from google.genai import errors, types
 from ..utils.config import get_setting
+from ..utils.http_pool import HttpClientPool
+from ..utils.json_stream import JsonArrayStreamParser, JsonExtractionError, array_element_spans, extract_json
 from ..utils.logger import get_logger
+from ..utils.metrics import STAGE_CITATIONS, STAGE_GEMINI, STAGE_JSON_PARSE, UPSTREAM_LATENCY, UPSTREAM_REQUESTS
+from ..utils.tracing import span
+from ..utils.resilience import DeadlineExceededError, RetryPolicy, retry_async
+from ..utils.upstream_limiter import AdaptiveLimiter, Permit, UpstreamBusyError, get_limiter, is_overload_status
+from ..validation.schemas import Citation
 
 logger = get_logger(__name__)
 
+# Gemini HTTP codes worth retrying (timeouts, throttling, transient server errors)
+_RETRYABLE_CODES = {408, 429, 500, 502, 503, 504}
+
 class GeminiServiceError(Exception):
     pass
 
+def _is_retryable(exc: BaseException) -> bool:
+    if isinstance(exc, errors.APIError):
+        return exc.code in _RETRYABLE_CODES
+    return isinstance(exc, httpx.TransportError)
+
+def _outcome(exc: BaseException) -> str:
+    """Metrics status label for a failed Gemini attempt."""
+    if isinstance(exc, errors.APIError):
+        return str(exc.code)
+    if isinstance(exc, (httpx.TimeoutException, asyncio.TimeoutError)):
+        return "timeout"
+    if isinstance(exc, asyncio.CancelledError):
+        return "cancelled"
+    return "error"
+
 class GeminiService:
-    def __init__(self) -> None:
+    def __init__(self, http_pool: Optional[HttpClientPool] = None) -> None:
+        self.http_pool = http_pool or HttpClientPool()
+        self.limiter: AdaptiveLimiter = get_limiter("gemini")
+        self.reload_settings()
+
+    def reload_settings(self) -> None:
+        """(Re)read key, model, timeouts and retry policy from the published config."""
         self.api_key = get_setting("providers.google.generative_ai.api_key")
         self.model = get_setting("providers.google.generative_ai.model")
         # Defer hard failures until call time so app can start without keys (e.g., health checks)
@@ -26,132 +59,248 @@ class GeminiService:
             logger.warning("Gemini model not configured; using placeholder 'gemini-2.5-flash'.")
             self.model = "gemini-2.5-flash"
         self.timeout = get_setting("app.http_client_timeout_seconds", 15)
+        self.retry_policy = RetryPolicy.from_config()
+        # Share of the remaining request deadline one Gemini attempt may use (rest is for retries/enrichment)
+        self.deadline_share = float(get_setting("resilience.gemini_deadline_share", 0.8))
 
     async def generate_store_list(self, prompt: str) -> List[Dict[str, Any]]:
         """
         Calls the Gemini model with a structured prompt expecting JSON array of store objects.
         Returns a list of dicts on success.
+
+        Uses the SDK's async client (``client.aio``) so the LLM round-trip is awaited
+        instead of blocking the event loop for every other in-flight request.
+        """
+        with span("GeminiService.generate_store_list", model=self.model):
+            return await self._generate_store_list(prompt)
+
+    async def _generate_store_list(self, prompt: str) -> List[Dict[str, Any]]:
+        if not self.api_key:
+            raise GeminiServiceError("Gemini API key missing")
+        client = self.http_pool.genai_client(self.api_key)
+
+        try:
+            with STAGE_GEMINI.time():
+                resp = await retry_async(
+                    lambda: self._generate_once(client, prompt),
+                    policy=self.retry_policy,
+                    is_retryable=_is_retryable,
+                    name="Gemini",
+                    timeout_share=self.deadline_share,
+                )
+        except (UpstreamBusyError, DeadlineExceededError):
+            raise
+        except Exception as exc:  # google-genai raises library-specific exceptions
+            logger.error("Gemini client error: %r", exc)
+            raise GeminiServiceError("Failed to call Gemini API") from exc
+
+        # google-genai returns a rich object, not httpx.Response
+        raw_text = getattr(resp, "text", None)
+        if not raw_text:
+            logger.error("Unexpected Gemini response type; no text available: %r", resp)
+            raise GeminiServiceError("Unexpected response format from Gemini API")
+        # Parse the plain text (no inline links to trip over); citations are attached as data
+        with STAGE_JSON_PARSE.time(), span("GeminiService._parse_important_nodes"):
+            parsed = self._parse_important_nodes(raw_text)
+        try:
+            with STAGE_CITATIONS.time(), span("GeminiService._attach_citations"):
+                self._attach_citations(resp, parsed)
+        except Exception as exc:  # pylint: disable=broad-except
+            logger.warning("Could not map grounding citations to store items: %s", exc)
+        return parsed
+
+    async def stream_store_items(self, prompt: str) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Streams the Gemini response and yields each store object as soon as it closes in the
+        model output, instead of waiting for the full answer. Falls back to parsing the whole
+        text at the end when no array elements could be extracted incrementally.
+
+        Grounding metadata only arrives with the last chunks, so citations are attached to the
+        yielded dicts (in place) once the stream ends; consumers that already forwarded an item
+        read its ``citations`` again after the iteration finishes.
         """
         if not self.api_key:
             raise GeminiServiceError("Gemini API key missing")
-        client = genai.Client(api_key=self.api_key)
+        client = self.http_pool.genai_client(self.api_key)
+        parser = JsonArrayStreamParser()
+        chunks: List[str] = []
+        emitted: List[Dict[str, Any]] = []
+        grounded: Any = None  # last chunk carrying grounding supports
+        async with self.limiter.slot() as permit:
+            started = time.perf_counter()
+            status = "200"
+            try:
+                # Only opening the stream is retried; once chunks flow they have been yielded already.
+                stream = await retry_async(
+                    lambda: client.aio.models.generate_content_stream(
+                        model=self.model,
+                        contents=prompt,
+                        config=self._grounded_config(),
+                    ),
+                    policy=self.retry_policy,
+                    is_retryable=_is_retryable,
+                    name="Gemini stream",
+                    timeout_share=self.deadline_share,
+                )
+                async for chunk in stream:
+                    if self._has_grounding(chunk):
+                        grounded = chunk
+                    text = getattr(chunk, "text", None)
+                    if not text:
+                        continue
+                    chunks.append(text)
+                    for item in parser.feed(text):
+                        emitted.append(item)
+                        yield item
+            except DeadlineExceededError:
+                status = "deadline"
+                raise
+            except Exception as exc:  # google-genai raises library-specific exceptions
+                status = _outcome(exc)
+                self._flag_overload(permit, exc)
+                logger.error("Gemini streaming client error: %s", exc)
+                raise GeminiServiceError("Failed to call Gemini API") from exc
+            except BaseException:
+                status = "cancelled"
+                raise
+            finally:
+                UPSTREAM_REQUESTS.labels("gemini", "stream", status).inc()
+                UPSTREAM_LATENCY.labels("gemini", "stream").observe(time.perf_counter() - started)
+
+        full_text = "".join(chunks)
+        if not emitted and chunks:
+            parsed = self._parse_important_nodes(full_text)
+            items = [item for item in parsed if isinstance(item, dict)] if isinstance(parsed, list) else []
+            self._attach_stream_citations(grounded, full_text, items)
+            for item in items:
+                yield item
+        else:
+            self._attach_stream_citations(grounded, full_text, emitted)
+
+    def _attach_stream_citations(self, grounded: Any, full_text: str, items: List[Dict[str, Any]]) -> None:
+        if grounded is None or not items:
+            return
+        # Segment offsets refer to the whole answer, not to the chunk that carried them
+        response = SimpleNamespace(text=full_text, candidates=grounded.candidates)
+        try:
+            with STAGE_CITATIONS.time(), span("GeminiService._attach_citations"):
+                self._attach_citations(response, items)
+        except Exception as exc:  # pylint: disable=broad-except
+            logger.warning("Could not map grounding citations to streamed store items: %s", exc)
+
+    @staticmethod
+    def _has_grounding(chunk: Any) -> bool:
+        try:
+            metadata = chunk.candidates[0].grounding_metadata
+        except (AttributeError, IndexError, TypeError):
+            return False
+        return bool(getattr(metadata, "grounding_supports", None))
+
+    async def _generate_once(self, client: genai.Client, prompt: str) -> Any:
+        """Single Gemini attempt under the process-wide Gemini limiter."""
+        async with self.limiter.slot() as permit:
+            started = time.perf_counter()
+            status = "200"
+            try:
+                return await client.aio.models.generate_content(
+                    model=self.model,
+                    contents=prompt,
+                    config=self._grounded_config(),
+                )
+            except BaseException as exc:
+                status = _outcome(exc)
+                if isinstance(exc, Exception):
+                    self._flag_overload(permit, exc)
+                raise
+            finally:
+                UPSTREAM_REQUESTS.labels("gemini", "generate", status).inc()
+                UPSTREAM_LATENCY.labels("gemini", "generate").observe(time.perf_counter() - started)
 
+    @staticmethod
+    def _flag_overload(permit: Permit, exc: Exception) -> None:
+        if isinstance(exc, errors.APIError) and is_overload_status(exc.code):
+            permit.mark_overloaded()
+
+    @staticmethod
+    def _grounded_config() -> types.GenerateContentConfig:
         grounding_tool = types.Tool(
             google_search=types.GoogleSearch()
         )
-
-        config = types.GenerateContentConfig(
+        return types.GenerateContentConfig(
             tools=[grounding_tool]
         )
 
+    @staticmethod
+    def _grounded_segments(response) -> List[Tuple[int, List[Citation]]]:
+        """(byte end offset, citations) for each grounding support, sorted by offset."""
         try:
-            resp = client.models.generate_content(
-                model=self.model,
-                contents=prompt,
-                config=config,
-            )
-        except Exception as exc:  # google-genai raises library-specific exceptions
-            logger.error("Gemini client error: %s", exc)
-            raise GeminiServiceError("Failed to call Gemini API") from exc
+            metadata = response.candidates[0].grounding_metadata
+        except (AttributeError, IndexError, TypeError):
+            return []
+        supports = getattr(metadata, "grounding_supports", None) or []
+        chunks = getattr(metadata, "grounding_chunks", None) or []
+        if not supports or not chunks:
+            return []
+        size = len((response.text or "").encode("utf-8"))
+        segments: List[Tuple[int, List[Citation]]] = []
+        for support in supports:
+            citations = []
+            for i in support.grounding_chunk_indices or []:
+                web = getattr(chunks[i], "web", None) if 0 <= i < len(chunks) else None
+                if web is not None and web.uri:
+                    citations.append(Citation(index=i + 1, uri=web.uri, title=getattr(web, "title", None)))
+            end = getattr(support.segment, "end_index", None) if support.segment is not None else None
+            if citations and end is not None:
+                segments.append((min(max(int(end), 0), size), citations))
+        segments.sort(key=lambda seg: seg[0])  # stable: equal offsets keep Gemini's order
+        return segments
 
-        # Extract text content from response object (google-genai returns a rich object, not httpx.Response)
-        try:
-            text_with_citations = self.add_citations(resp)
-        except Exception as exc:
-            # Fallback: attempt to use plain text if available
-            raw_text = getattr(resp, "text", None)
-            if not raw_text:
-                logger.error("Unexpected Gemini response type; no text available: %r", resp)
-                raise GeminiServiceError("Unexpected response format from Gemini API") from exc
-            text_with_citations = raw_text
-        # Attempt to locate JSON substring
-        parsed = self._parse_important_nodes(text_with_citations)
-        return parsed
+    def _attach_citations(self, response, items: Any) -> None:
+        """Attach structured citations to each parsed store dict whose JSON span a segment ends in."""
+        if not isinstance(items, list) or not items:
+            return
+        segments = self._grounded_segments(response)
+        if not segments:
+            return
+        text = response.text or ""
+        spans = array_element_spans(text)
+        if len(spans) != len(items):
+            logger.debug("Skipping citation mapping: %d JSON spans for %d items", len(spans), len(items))
+            return
+        # Convert char spans to UTF-8 byte offsets incrementally (linear in the text length)
+        byte_spans: List[Tuple[int, int]] = []
+        char_pos = byte_pos = 0
+        for start, end in spans:
+            byte_pos += len(text[char_pos:start].encode("utf-8"))
+            start_b = byte_pos
+            byte_pos += len(text[start:end].encode("utf-8"))
+            char_pos = end
+            byte_spans.append((start_b, byte_pos))
+        starts = [start for start, _ in byte_spans]
+        for end, citations in segments:
+            idx = bisect_right(starts, end - 1) - 1
+            if idx < 0 or end > byte_spans[idx][1]:
+                continue  # segment ends in prose outside any store object
+            item = items[idx]
+            if not isinstance(item, dict):
+                continue
+            existing = item.setdefault("citations", [])
+            seen = {c.get("uri") for c in existing if isinstance(c, dict)}
+            for citation in citations:
+                if citation.uri not in seen:
+                    seen.add(citation.uri)
+                    existing.append(citation.model_dump())
 
-    def add_citations(self, response):
-        text = response.text
-        
-        # Check if grounding metadata exists and is not None
-        try:
-            if (hasattr(response, 'candidates') and 
-                len(response.candidates) > 0 and 
-                hasattr(response.candidates[0], 'grounding_metadata') and 
-                response.candidates[0].grounding_metadata is not None):
-                
-                grounding_metadata = response.candidates[0].grounding_metadata
-                supports = getattr(grounding_metadata, 'grounding_supports', None)
-                chunks = getattr(grounding_metadata, 'grounding_chunks', None)
-                
-                # Only proceed if we have both supports and chunks
-                if supports is not None and chunks is not None:
-                    # Sort supports by end_index in descending order to avoid shifting issues when inserting.
-                    sorted_supports = sorted(supports, key=lambda s: s.segment.end_index, reverse=True)
-
-                    for support in sorted_supports:
-                        end_index = support.segment.end_index
-                        if support.grounding_chunk_indices:
-                            # Create citation string like [1](link1)[2](link2)
-                            citation_links = []
-                            for i in support.grounding_chunk_indices:
-                                if i < len(chunks):
-                                    uri = chunks[i].web.uri
-                                    citation_links.append(f"[{i + 1}]({uri})")
-
-                            citation_string = ", ".join(citation_links)
-                            text = text[:end_index] + citation_string + text[end_index:]
-                else:
-                    print("Note: No grounding metadata available for citations.")
-            else:
-                print("Note: No grounding metadata found in response.")
-        except Exception as e:
-            print(f"Warning: Error processing citations: {e}")
-        
-        return text
-
-    def _parse_important_nodes(self, text_with_citations):
+    def _parse_important_nodes(self, text_with_citations: str) -> Any:
+        """
+        Extract the first JSON array/object from the model text in a single scan.
+        Code fences, leading prose and citation links are skipped; trailing commas,
+        unquoted/single-quoted keys and truncated arrays are repaired. Returns [] when
+        nothing parseable is found.
         """
-        Parse and display important nodes from the text_with_citations variable.
-        Extracts key information like stores, prices, and search details.
-        """    
         try:
-            # Extract JSON from the text (handles markdown code blocks)
-            json_match = re.search(r'```json\n(.*?)\n```', text_with_citations, re.DOTALL)
-            if json_match:
-                json_text = json_match.group(1)
-            else:
-                # Try to find JSON without markdown formatting
-                json_text = text_with_citations
-            
-            # Parse the JSON data with error handling
-            try:
-                data = json.loads(json_text)
-            except json.JSONDecodeError as json_error:
-                print(f"Warning: JSON parsing error: {json_error}")
-                print("Attempting to fix common JSON issues...")
-                
-                # Try to fix common JSON issues
-                fixed_json = json_text
-                
-                # Fix trailing commas
-                fixed_json = re.sub(r',(\s*[}\]])', r'\1', fixed_json)
-                
-                # Fix unescaped quotes in strings
-                fixed_json = re.sub(r'(?<!\\)"(?=(?:[^"\\]|\\.)*"[^"]*$)', '\\"', fixed_json)
-                
-                # Try parsing again
-                try:
-                    data = json.loads(fixed_json)
-                    print("Successfully parsed JSON after fixing common issues.")
-                except json.JSONDecodeError:
-                    print("Could not fix JSON automatically. Using empty data structure.")
-                    data = []
-            
-        except json.JSONDecodeError as e:
-            print(f"Error parsing JSON: {e}")
-            print("Raw text content preview:")
-            print(text_with_citations[:500] + "..." if len(text_with_citations) > 500 else text_with_citations)
-        except Exception as e:
-            print(f"Error displaying important nodes: {e}")
-            print("Raw text content preview:")
-            print(text_with_citations[:500] + "..." if len(text_with_citations) > 500 else text_with_citations)
-        return data
\ No newline at end of file
+            return extract_json(text_with_citations)
+        except JsonExtractionError as exc:
+            preview = text_with_citations[:500] + "..." if len(text_with_citations) > 500 else text_with_citations
+            logger.warning("Could not extract JSON from Gemini response: %s | preview=%r", exc, preview)
+            return []
@@ -1,55 +1,133 @@
 from __future__ import annotations
 
+import asyncio
+import time
 import httpx
 from typing import Any, Dict, Optional
 from ..utils.config import get_setting
+from ..utils.http_pool import HttpClientPool
 from ..utils.logger import get_logger
+from ..utils.metrics import UPSTREAM_LATENCY, UPSTREAM_REQUESTS
+from ..utils.tracing import span
+from ..utils.resilience import CircuitBreaker, DeadlineExceededError, RetryPolicy, hedged, retry_async
+from ..utils.upstream_limiter import AdaptiveLimiter, get_limiter, is_overload_status
 
 logger = get_logger(__name__)
 
 class PlacesServiceError(Exception):
-    pass
+    def __init__(self, message: str = "", retryable: bool = False) -> None:
+        super().__init__(message)
+        # Transient failures (transport errors, 429/5xx, quota) count against the circuit breaker
+        self.retryable = retryable
+
+# Places statuses that mean "no match" rather than a failed call
+_NO_MATCH_STATUSES = {"ZERO_RESULTS", "NOT_FOUND"}
+# Places statuses worth retrying
+_TRANSIENT_STATUSES = {"OVER_QUERY_LIMIT", "UNKNOWN_ERROR"}
+
+def _is_retryable(exc: BaseException) -> bool:
+    return isinstance(exc, PlacesServiceError) and exc.retryable
 
 class PlacesService:
-    def __init__(self) -> None:
+    def __init__(self, http_pool: Optional[HttpClientPool] = None) -> None:
+        # Reuse the app-wide keep-alive pool; standalone callers get a private one.
+        self.http_pool = http_pool or HttpClientPool()
+        self.text_search_url = "https://maps.googleapis.com/maps/api/place/textsearch/json"
+        self.details_url = "https://maps.googleapis.com/maps/api/place/details/json"
+        self.limiter: AdaptiveLimiter = get_limiter("places")
+        self.breaker = CircuitBreaker.from_config("places")
+        self.reload_settings()
+
+    def reload_settings(self) -> None:
+        """(Re)read key, timeouts, retry policy and hedging delay from the published config."""
         self.api_key = get_setting("providers.google.places.api_key") or get_setting("providers.google.generative_ai.api_key")
+        # Defer hard failures until call time so the app-scoped instance can be built without keys
         if not self.api_key:
-            raise PlacesServiceError("Google Places API key missing")
+            logger.warning("Google Places API key not configured; enrichment will be skipped until provided.")
         self.timeout = get_setting("app.http_client_timeout_seconds", 15)
-        self.text_search_url = "https://maps.googleapis.com/maps/api/place/textsearch/json"
-        self.details_url = "https://maps.googleapis.com/maps/api/place/details/json"
+        self.retry_policy = RetryPolicy.from_config()
+        self.hedge_delay = float(get_setting("resilience.places_hedge_delay_ms", 0)) / 1000.0
+
+    def _require_api_key(self) -> None:
+        if not self.api_key:
+            raise PlacesServiceError("Google Places API key missing")
 
     async def search_place(self, query: str) -> Optional[Dict[str, Any]]:
-        params = {"query": query, "key": self.api_key}
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
-            try:
-                resp = await client.get(self.text_search_url, params=params)
-            except httpx.HTTPError as exc:
-                logger.error("Places Text Search HTTP error: %s", exc)
-                raise PlacesServiceError("Failed to call Places Text Search") from exc
-        if resp.status_code != 200:
-            logger.warning("Places Text Search non-200 %s: %s", resp.status_code, resp.text)
-            return None
-        data = resp.json()
+        data = await self._get("Text Search", self.text_search_url, {"query": query})
         results = data.get("results", [])
         return results[0] if results else None
 
     async def get_details(self, place_id: str) -> Optional[Dict[str, Any]]:
         params = {
             "place_id": place_id,
-            "fields": "formatted_address,website,name,url",
-            "key": self.api_key,
+            "fields": "formatted_address,website,name,url,geometry",
         }
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
-            try:
-                resp = await client.get(self.details_url, params=params)
-            except httpx.HTTPError as exc:
-                logger.error("Places Details HTTP error: %s", exc)
-                raise PlacesServiceError("Failed to call Places Details") from exc
-        if resp.status_code != 200:
-            logger.warning("Places Details non-200 %s: %s", resp.status_code, resp.text)
-            return None
-        data = resp.json()
+        data = await self._get("Details", self.details_url, params)
         if data.get("status") != "OK":
             return None
         return data.get("result")
+
+    async def _get(self, operation: str, url: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        """GET a Places endpoint with retries, optional hedging and the circuit breaker; returns the JSON body."""
+        self._require_api_key()
+        if not self.breaker.allow():
+            raise PlacesServiceError(f"Places circuit open; skipping {operation}")
+        params = {**params, "key": self.api_key}
+        try:
+            with span(f"PlacesService.{operation.replace(' ', '')}"):
+                data = await retry_async(
+                    lambda: hedged(lambda: self._get_once(operation, url, params), self.hedge_delay),
+                    policy=self.retry_policy,
+                    is_retryable=_is_retryable,
+                    name=f"Places {operation}",
+                    timeout_cap=float(self.timeout),
+                )
+        except PlacesServiceError as exc:
+            if exc.retryable:
+                self.breaker.record_failure()
+            raise
+        except asyncio.TimeoutError as exc:
+            self.breaker.record_failure()
+            raise PlacesServiceError(f"Places {operation} timed out", retryable=True) from exc
+        except DeadlineExceededError as exc:
+            raise PlacesServiceError(f"Request deadline exceeded before Places {operation}") from exc
+        self.breaker.record_success()
+        return data
+
+    async def _get_once(self, operation: str, url: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        """Single GET under the process-wide Places limiter."""
+        async with self.limiter.slot() as permit:
+            started = time.perf_counter()
+            status = "cancelled"
+            try:
+                resp = await self.http_pool.client.get(url, params=params)
+                status = str(resp.status_code)
+            except httpx.HTTPError as exc:
+                status = "timeout" if isinstance(exc, httpx.TimeoutException) else "error"
+                logger.error("Places %s HTTP error: %s", operation, exc)
+                raise PlacesServiceError(f"Failed to call Places {operation}", retryable=True) from exc
+            finally:
+                label = operation.lower().replace(" ", "_")
+                UPSTREAM_REQUESTS.labels("places", label, status).inc()
+                UPSTREAM_LATENCY.labels("places", label).observe(time.perf_counter() - started)
+            if resp.status_code != 200:
+                if is_overload_status(resp.status_code):
+                    permit.mark_overloaded()
+                logger.warning("Places %s non-200 %s: %s", operation, resp.status_code, resp.text)
+                raise PlacesServiceError(
+                    f"Places {operation} returned HTTP {resp.status_code}",
+                    retryable=resp.status_code == 429 or resp.status_code >= 500,
+                )
+            data = resp.json()
+            if data.get("status") == "OVER_QUERY_LIMIT":
+                permit.mark_overloaded()
+            self._check_status(operation, data)
+            return data
+
+    @staticmethod
+    def _check_status(operation: str, data: Dict[str, Any]) -> None:
+        """Raise on quota/auth/server errors so they are not mistaken for "no match" (and cached as such)."""
+        status = data.get("status", "OK")
+        if status != "OK" and status not in _NO_MATCH_STATUSES:
+            logger.warning("Places %s status %s: %s", operation, status, data.get("error_message"))
+            raise PlacesServiceError(f"Places {operation} failed with status {status}", retryable=status in _TRANSIENT_STATUSES)
@@ -0,0 +1,216 @@
+"""Price and unit normalization, and multi-key ranking of store results.
+
+Gemini returns prices and sizes as free text ("$3.99/lb", "2 for $5", "99¢", "6 x 12 fl oz").
+``parse_price`` turns a ``(product_price, unit_quantity)`` pair into a price per item and a unit
+price on a common basis: per ``oz`` for weight, per ``fl oz`` for volume and per ``each`` for
+counts. ``rank_stores`` sorts a whole result list by configurable keys in one pass.
+"""
+
+from __future__ import annotations
+
+import re
+from collections import Counter
+from datetime import datetime
+from functools import lru_cache
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+from ..validation.schemas import StoreItem
+
+INF = float("inf")
+
+RANKING_KEYS = ("unit_price", "price", "distance", "freshness")
+DEFAULT_RANKING: Tuple[str, ...] = RANKING_KEYS
+
+# unit token -> (basis, amount of the basis in one unit)
+_UNITS: Dict[str, Tuple[str, float]] = {}
+for _names, _basis, _factor in (
+    (("oz", "ounce", "ounces"), "oz", 1.0),
+    (("lb", "lbs", "pound", "pounds"), "oz", 16.0),
+    (("g", "gr", "gram", "grams"), "oz", 0.035274),
+    (("kg", "kilo", "kilos", "kilogram", "kilograms"), "oz", 35.274),
+    (("fl oz", "floz", "fluid ounce", "fluid ounces"), "fl oz", 1.0),
+    (("gal", "gallon", "gallons"), "fl oz", 128.0),
+    (("qt", "quart", "quarts"), "fl oz", 32.0),
+    (("pt", "pint", "pints"), "fl oz", 16.0),
+    (("cup", "cups"), "fl oz", 8.0),
+    (("l", "liter", "liters", "litre", "litres"), "fl oz", 33.814),
+    (("ml", "milliliter", "milliliters", "millilitre", "millilitres"), "fl oz", 0.033814),
+    (("ct", "count", "ea", "each", "pc", "pcs", "piece", "pieces", "unit", "units", "item", "items"), "each", 1.0),
+    (("dozen", "doz", "dz"), "each", 12.0),
+):
+    for _name in _names:
+        _UNITS[_name] = (_basis, _factor)
+
+_NUM = r"\d+(?:\.\d+)?|\.\d+"
+_UNIT_ALT = "|".join(sorted((re.escape(u).replace(r"\ ", r"\.?\s*") for u in _UNITS), key=len, reverse=True))
+_UNIT_RE = re.compile(rf"(?:(?P<qty>{_NUM}|\d+\s*/\s*\d+)\s*-?\s*)?(?<![a-z])(?P<unit>{_UNIT_ALT})\b\.?")
+_PACK_RE = re.compile(rf"(?P<count>\d+)\s*(?:x|×|pk|pack|-pack|packs|ct of|count of)\s*(?=(?:{_NUM})\s*[a-z])")
+_COUNT_WORD_RE = re.compile(r"(?P<qty>\d+)\s+[a-z]+")
+_AMOUNT_RE = re.compile(r"\$?\s*(?P<whole>\d{1,3}(?:,\d{3})+|\d+)?(?P<frac>\.\d+)?\s*(?P<cents>¢|cents?\b|c\b)?")
+_MULTI_BUY_RE = re.compile(r"(?P<count>\d+)\s*(?:for|/)\s*(?=\$|\d)")
+_PER_RE = re.compile(r"^\s*(?:/|per\b|a\b|an\b)\s*")
+_DISTANCE_RE = re.compile(
+    rf"(?P<value>{_NUM})\s*(?:(?P<unit>mi|miles?|km|kilometers?|kilometres?|m|meters?|metres?|ft|feet)\b|$)"
+)
+_DISTANCE_TO_MILES = {
+    "km": 0.621371, "kilometer": 0.621371, "kilometers": 0.621371, "kilometre": 0.621371, "kilometres": 0.621371,
+    "m": 0.000621371, "meter": 0.000621371, "meters": 0.000621371, "metre": 0.000621371, "metres": 0.000621371,
+    "ft": 1 / 5280, "feet": 1 / 5280,
+}
+_DATE_FORMATS = ("%m/%d/%Y", "%m/%d/%y", "%B %d, %Y", "%b %d, %Y", "%B %Y", "%b %Y", "%Y-%m")
+
+
+class PriceQuote(NamedTuple):
+    price: Optional[float]  # price of one item (a multi-buy offer divided by its count)
+    unit_price: Optional[float]  # price per one ``basis`` unit
+    basis: Optional[str]  # "oz", "fl oz" or "each"
+
+
+_NO_QUOTE = PriceQuote(None, None, None)
+
+
+def _number(text: str) -> float:
+    if "/" in text:
+        num, den = text.split("/", 1)
+        return float(num) / float(den) if float(den) else 0.0
+    return float(text)
+
+
+def _unit_key(token: str) -> str:
+    return re.sub(r"[.\s]+", " ", token).strip().replace("floz", "fl oz")
+
+
+def parse_quantity(text: Optional[str]) -> Optional[Tuple[float, str]]:
+    """``"6 x 12 fl oz"`` -> ``(72.0, "fl oz")``; ``"1 lb"`` -> ``(16.0, "oz")``; None if unknown."""
+    if not text:
+        return None
+    text = text.lower().replace("half", "0.5")
+    pack = 1.0
+    pack_match = _PACK_RE.search(text)
+    if pack_match:
+        pack = float(pack_match.group("count"))
+        text = text[pack_match.end():]
+    match = _UNIT_RE.search(text)
+    if match:
+        basis, factor = _UNITS[_unit_key(match.group("unit"))]
+        qty = _number(match.group("qty").replace(" ", "")) if match.group("qty") else 1.0
+        return (pack * qty * factor, basis) if qty > 0 else None
+    # "12 eggs", "4 rolls": a count of something we have no unit for
+    count = _COUNT_WORD_RE.search(text)
+    if count and float(count.group("qty")) > 0:
+        return pack * float(count.group("qty")), "each"
+    return None
+
+
+def _parse_amount(text: str, start: int) -> Tuple[Optional[float], int]:
+    for match in _AMOUNT_RE.finditer(text, start):
+        whole, frac = match.group("whole"), match.group("frac")
+        if whole is None and frac is None:
+            continue
+        value = float((whole or "0").replace(",", "") + (frac or ""))
+        if match.group("cents"):
+            value /= 100.0
+        return value, match.end()
+    return None, len(text)
+
+
+@lru_cache(maxsize=4096)
+def parse_price(product_price: Optional[str], unit_quantity: Optional[str] = None) -> PriceQuote:
+    """Normalize one price/size pair. Results are cached: Gemini repeats the same formats."""
+    if not product_price:
+        return _NO_QUOTE
+    text = str(product_price).lower().strip()
+    count = 1.0
+    multi = _MULTI_BUY_RE.match(text)
+    if multi:
+        count = float(multi.group("count")) or 1.0
+        amount, end = _parse_amount(text, multi.end())
+    else:
+        amount, end = _parse_amount(text, 0)
+    if amount is None:
+        return _NO_QUOTE
+    price = amount / count
+
+    # "$3.99/lb", "$1.99 per 100 g", "$0.50 each": the price already names its unit
+    per = _PER_RE.match(text, end) if end < len(text) else None
+    per_unit = parse_quantity(text[per.end():]) if per else parse_quantity(text[end:]) if text[end:].strip() else None
+    if per_unit is not None:
+        qty, basis = per_unit
+        return PriceQuote(price, price / qty, basis)
+
+    size = parse_quantity(str(unit_quantity)) if unit_quantity else None
+    if size is not None:
+        qty, basis = size
+        return PriceQuote(price, price / qty, basis)
+    if count > 1:
+        return PriceQuote(price, price, "each")
+    return PriceQuote(price, None, None)
+
+
+@lru_cache(maxsize=1024)
+def parse_distance(text: Optional[str]) -> Optional[float]:
+    """Distance in miles from text like ``"1.2 mi"``, ``"800 m"`` or ``"3 km"``.
+
+    A number with nothing after it counts as miles; drive times such as ``"5 min"`` are not
+    distances and give None.
+    """
+    if not text:
+        return None
+    match = _DISTANCE_RE.search(str(text).lower())
+    if not match:
+        return None
+    return float(match.group("value")) * _DISTANCE_TO_MILES.get(match.group("unit") or "mi", 1.0)
+
+
+@lru_cache(maxsize=1024)
+def parse_as_of(text: Optional[str]) -> Optional[float]:
+    """POSIX timestamp of a price date (ISO 8601 or common US formats); None when unparseable."""
+    if not text:
+        return None
+    text = str(text).strip()
+    try:
+        return datetime.fromisoformat(text.replace("Z", "+00:00")).timestamp()
+    except ValueError:
+        pass
+    for fmt in _DATE_FORMATS:
+        try:
+            return datetime.strptime(text, fmt).timestamp()
+        except ValueError:
+            continue
+    return None
+
+
+def _primary_basis(quotes: Sequence[PriceQuote]) -> Optional[str]:
+    """Unit prices are only comparable on one basis; use the most common one in the batch."""
+    bases = Counter(q.basis for q in quotes if q.unit_price is not None)
+    return bases.most_common(1)[0][0] if bases else None
+
+
+def rank_stores(stores: List[StoreItem], keys: Sequence[str] = DEFAULT_RANKING) -> List[StoreItem]:
+    """Return ``stores`` sorted by ``keys`` (lowest first); unknown values sort last, ties keep input order.
+
+    ``unit_price`` compares items on the batch's most common basis (others count as unknown),
+    ``price`` uses the per-item price, ``distance`` the distance in miles and ``freshness``
+    prefers the most recent ``price_as_of``. Each key is computed once per batch as a column.
+    """
+    if len(stores) < 2:
+        return list(stores)
+    quotes = [parse_price(s.product_price, s.unit_quantity) for s in stores]
+    columns: List[List[float]] = []
+    for key in keys:
+        if key == "unit_price":
+            primary = _primary_basis(quotes)
+            columns.append([q.unit_price if q.basis == primary and q.unit_price is not None else INF for q in quotes])
+        elif key == "price":
+            columns.append([q.price if q.price is not None else INF for q in quotes])
+        elif key == "distance":
+            distances = [parse_distance(s.store_details.distance_from_zipcode) for s in stores]
+            columns.append([d if d is not None else INF for d in distances])
+        elif key == "freshness":
+            stamps = [parse_as_of(s.price_as_of) for s in stores]
+            columns.append([-t if t is not None else INF for t in stamps])
+        else:
+            raise ValueError(f"Unknown ranking key {key!r}; expected one of {', '.join(RANKING_KEYS)}")
+    rows = list(zip(*columns)) if columns else [()] * len(stores)
+    order = sorted(range(len(stores)), key=lambda i: rows[i])
+    return [stores[i] for i in order]
@@ -1,24 +1,112 @@
 from __future__ import annotations
 
 import asyncio
-import re
-from typing import Any, Dict, List, Optional
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
 
-from ..utils.config import get_setting
+from pydantic import ValidationError
+
+from ..cache.place_cache import PlaceCache, PlaceRecord, normalize_place_query
+from ..cache.search_cache import CACHE_BYPASS, SearchCache, search_cache_key
+from ..cache.store_index import NearbyStoreIndex
+from ..utils.config import Settings, get_setting
+from ..utils.geo import get_zip_centroids, haversine_many
+from ..utils.http_pool import HttpClientPool
 from ..utils.logger import get_logger
-from ..validation.schemas import ReasonDetails, SearchRequest, StoreDetails, StoreItem, SearchResponse, StatusInfo
+from ..utils.metrics import (
+    CACHE_REQUESTS,
+    STAGE_BUILD_PROMPT,
+    STAGE_ENRICHMENT,
+    STAGE_PLACES_DETAILS,
+    STAGE_PLACES_TEXT_SEARCH,
+    STAGE_PROCESS_RESULTS,
+    STAGE_VALIDATE,
+    ZIP_CENTROID_HIT,
+    ZIP_CENTROID_MISSING,
+)
+from ..utils.resilience import DeadlineExceededError, deadline_scope
+from ..utils.single_flight import SingleFlight
+from ..utils.tracing import span
+from ..utils.upstream_limiter import UpstreamBusyError
+from ..validation.schemas import (
+    BatchItemError,
+    BatchItemResult,
+    BatchSearchRequest,
+    BatchSearchResponse,
+    Citation,
+    ReasonDetails,
+    SearchRequest,
+    SearchResponse,
+    StatusInfo,
+    StoreDetails,
+    StoreItem,
+)
 from .gemini_service import GeminiService, GeminiServiceError
 from .places_service import PlacesService, PlacesServiceError
-from ..validation.schemas import Request_Object_Validator
+from .pricing import DEFAULT_RANKING, parse_price, rank_stores
+from ..validation.schemas import Request_Object_Validator, validate_search_criteria
 
 logger = get_logger(__name__)
 
+def _normalize(value: Optional[str]) -> str:
+    return " ".join(str(value).split()).lower() if value else ""
+
+def _format_miles(distance: float) -> str:
+    return f"{distance:.1f} mi"
+
+def _match_product(raw_name: str, products: Dict[str, Any]) -> Optional[str]:
+    """Pick the requested product a Gemini item belongs to (longest name contained either way)."""
+    name = _normalize(raw_name)
+    if not name:
+        return None
+    if name in products:
+        return name
+    matches = [p for p in products if p in name or name in p]
+    return max(matches, key=len) if matches else None
+
 class SearchService:
-    def __init__(self) -> None:
-        self.gemini = GeminiService()
+    def __init__(
+        self,
+        http_pool: Optional[HttpClientPool] = None,
+        gemini: Optional[GeminiService] = None,
+        places: Optional[PlacesService] = None,
+        cache: Optional[SearchCache] = None,
+        place_cache: Optional[PlaceCache] = None,
+        store_index: Optional[NearbyStoreIndex] = None,
+    ) -> None:
+        self.http_pool = http_pool or HttpClientPool()
+        self.gemini = gemini or GeminiService(self.http_pool)
+        self.places = places or PlacesService(self.http_pool)
+        self.cache = cache or SearchCache()
+        self.place_cache = place_cache or PlaceCache()
+        self.store_index = store_index or NearbyStoreIndex()
+        self.zip_centroids = get_zip_centroids()
+        # Identical in-flight searches share one Gemini call and one enrichment pass
+        self._inflight: SingleFlight[SearchResponse] = SingleFlight()
+        self._place_flight: SingleFlight[Optional[PlaceRecord]] = SingleFlight()
+        self._read_settings()
+
+    def reload_settings(self, snapshot: Optional[Settings] = None) -> None:
+        """Config reload listener: refresh this service and the upstream clients it owns."""
+        for client in (self.gemini, self.places):
+            refresh = getattr(client, "reload_settings", None)
+            if refresh is not None:
+                refresh()
+        self._read_settings()
+
+    def _read_settings(self) -> None:
         self.places_enabled: bool = bool(get_setting("places.enable_enrichment", True))
         self.enrich_mode: str = get_setting("places.enrich_mode", "missing_only")
         self.max_enrich: int = int(get_setting("places.max_enrich_per_request", 15))
+        # Total time budget per search, split across the Gemini call and Places lookups
+        self.request_timeout: float = float(get_setting("app.request_timeout_seconds", 30))
+        self.batch_max_items: int = int(get_setting("batch.max_items", 50))
+        self.batch_max_concurrency: int = int(get_setting("batch.max_concurrency", 4))
+        self.batch_max_products_per_prompt: int = int(get_setting("batch.max_products_per_prompt", 5))
+        # Real distances from Places coordinates and ZIP centroids
+        self.geo_enabled: bool = bool(get_setting("geo.enabled", True))
+        self.filter_out_of_radius: bool = bool(get_setting("geo.filter_out_of_radius", True))
+        self.ranking_keys: Tuple[str, ...] = tuple(get_setting("ranking.keys", DEFAULT_RANKING) or DEFAULT_RANKING)
+        self._config_errors = self._check_configuration()
 
     def _build_prompt(self, req: SearchRequest) -> str:
         min_results = int(str(req.min_store_results).strip())
@@ -35,60 +123,18 @@ class SearchService:
         # )
         return prompt_core # + schema_hint
 
-    def _validate_search_request(self, req: SearchRequest) -> Optional[str]:
+    def _validate_search_request(self, req: SearchRequest) -> Optional[List[Request_Object_Validator]]:
         """Validate the search request and return error message if invalid."""
-        # Early validation patterns for better performance
-        PRODUCT_NAME_PATTERN = re.compile(r"^[a-zA-Z0-9\s]+$")
-        ZIP_CODE_PATTERN = re.compile(r"^\d{5}(-\d{4})?$")
+        # Patterns are compiled once into the SearchCriteria model
+        return validate_search_criteria(req)
 
-        errors = []
-
-        # Validate product name
-        product_name = req.product_name.strip() if req.product_name else ""
-        if not product_name:
-            errors.append(Request_Object_Validator(
-                field="product_name",
-                message="Product name is required"
-            ))
-        elif not PRODUCT_NAME_PATTERN.match(product_name):
-            errors.append(Request_Object_Validator(
-                field="product_name",
-                message="Product name contains invalid characters; only letters, numbers, and spaces are allowed"
-            ))
-
-        # Validate zip code
-        zip_code = req.zip_code.strip() if req.zip_code else ""
-        if not zip_code:
-            errors.append(Request_Object_Validator(
-                field="location",
-                message="Zip code is required"
-            ))
-        elif not ZIP_CODE_PATTERN.match(zip_code):
-            errors.append(Request_Object_Validator(
-                field="zip_code",
-                message="Zip code must be in format 12345 or 12345-6789"
-            ))
-
-        # Validate minimum store results setting        
-        min_store_results = req.min_store_results.strip() if req.min_store_results else ""
-        if not min_store_results or not str(min_store_results).isdigit():
-            errors.append(Request_Object_Validator(
-                field="min_store_results",
-                message="Minimum store results must be a valid number"
-            ))
-
-        # Validate radius miles setting
-        radius_miles = req.radius_miles.strip() if req.radius_miles else ""
-        if not radius_miles or not str(radius_miles).isdigit():
-            errors.append(Request_Object_Validator(
-                field="radius_miles",
-                message="Radius miles must be a valid number"
-            ))
-
-        return errors if errors else None
+    def _validate_configuration(self) -> Optional[List[Request_Object_Validator]]:
+        """Configuration errors reported on every request (computed when settings are loaded)."""
+        return self._config_errors
 
     # Also, create a validation method to check for key fields and their values from default.yaml file
-    def _validate_configuration(self) -> Optional[List[Request_Object_Validator]]:
+    @staticmethod
+    def _check_configuration() -> Optional[List[Request_Object_Validator]]:
         """Validate required configuration values from default.yaml file."""
         errors = []
         
@@ -140,29 +186,299 @@ class SearchService:
             logger.error("Validation failed with %d errors", len(validation_errors))
             return self._create_error_response(400, "VALIDATION_ERROR", validation_errors)
 
-        # Build prompt and log search details
+        return await self._execute_search(req)
+
+    async def search_cached(self, req: SearchRequest) -> Tuple[SearchResponse, str]:
+        """
+        Same as ``search`` but served through the response cache; concurrent misses for the
+        same normalized request are coalesced into a single upstream search.
+
+        Returns:
+            Tuple of the SearchResponse and the cache status (HIT, STALE, MISS or BYPASS)
+        """
+        validation_errors = self._collect_validation_errors(req)
+        if validation_errors:
+            logger.error("Validation failed with %d errors", len(validation_errors))
+            return self._create_error_response(400, "VALIDATION_ERROR", validation_errors), CACHE_BYPASS
+        key = search_cache_key(req)
+        response, cache_status = await self.cache.get_or_load(
+            req, lambda: self._inflight.do(key, lambda: self._execute_search(req))
+        )
+        CACHE_REQUESTS.labels("search", cache_status.lower()).inc()
+        return response, cache_status
+
+    async def search_stream(self, req: SearchRequest) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Streaming variant of ``search``.
+
+        Yields events as plain dicts:
+            {"event": "store", "index": i, "store": {...}} as soon as Gemini emits a store,
+            {"event": "enrichment", "index": i, "store_details": {...}} when Places fills it in,
+            {"event": "status", "status_info": {...}, ...} once, as the final event.
+        Stores are emitted in model order; clients rank them as they arrive.
+        """
+        validation_errors = self._collect_validation_errors(req)
+        if validation_errors:
+            logger.error("Validation failed with %d errors", len(validation_errors))
+            yield self._status_event(self._create_error_response(400, "VALIDATION_ERROR", validation_errors))
+            return
+
         prompt = self._build_prompt(req)
+        logger.info("Streaming search for product='%s' location='%s'",
+                    req.product_name, self._format_location(req))
+        self._count_centroid_lookup(req)
+        enrich = self.places_enabled and self._places_ready()
+        sem = asyncio.Semaphore(5)
+        queue: asyncio.Queue = asyncio.Queue()
+        stores: List[StoreItem] = []
+        enrich_tasks: List[asyncio.Task] = []
+
+        async def enrich_and_report(idx: int, store: StoreItem) -> None:
+            if await self._enrich_one(store, req, sem):
+                await queue.put({"event": "enrichment", "index": idx, "store_details": store.store_details.model_dump()})
+
+        async def produce() -> None:
+            try:
+                with deadline_scope(self.request_timeout):
+                    await stream_stores()
+            except (GeminiServiceError, UpstreamBusyError, DeadlineExceededError) as exc:
+                logger.error("Gemini streaming search failed: %s", exc)
+                await queue.put(self._status_event(self._upstream_error_response(exc)))
+            finally:
+                await queue.put(None)
+
+        async def stream_stores() -> None:
+            raw_items: List[Dict[str, Any]] = []
+            async for item in self.gemini.stream_store_items(prompt):
+                try:
+                    store = self._map_raw_item(item)
+                except ValidationError as exc:
+                    logger.warning("Skipping malformed store item from Gemini: %s", exc)
+                    continue
+                idx = len(stores)
+                stores.append(store)
+                raw_items.append(item)
+                await queue.put({"event": "store", "index": idx, "store": store.model_dump()})
+                if enrich and idx < self.max_enrich:
+                    enrich_tasks.append(asyncio.create_task(enrich_and_report(idx, store)))
+            # Grounding metadata arrives with the last chunks, so citations are attached to the raw
+            # items only once the stream ends; report them like enrichment updates.
+            for idx, (store, item) in enumerate(zip(stores, raw_items)):
+                citations = self._item_citations(item)
+                if citations:
+                    store.citations = citations
+                    await queue.put({"event": "citations", "index": idx, "citations": [c.model_dump() for c in citations]})
+            if enrich_tasks:
+                await asyncio.gather(*enrich_tasks, return_exceptions=True)
+            await queue.put(self._status_event(self._create_success_response(stores, prompt, req)))
+
+        producer = asyncio.create_task(produce())
+        try:
+            while True:
+                event = await queue.get()
+                if event is None:
+                    break
+                yield event
+        finally:
+            # Client went away (or we finished): stop upstream work that nobody will read.
+            for task in (producer, *enrich_tasks):
+                if not task.done():
+                    task.cancel()
+
+    async def search_batch(self, batch: BatchSearchRequest) -> BatchSearchResponse:
+        """
+        Run many searches in one call.
+
+        Valid requests that share a location (zip or city/state plus radius) are grouped so up
+        to ``batch.max_products_per_prompt`` products share one Gemini prompt. Groups run
+        concurrently within ``batch.max_concurrency``, Places enrichment is deduplicated across
+        the whole batch, and failures are reported per item in ``errors``.
+        """
+        api_name = get_setting("app.api_name", "UFA - Budget Bite API")
+        requests = batch.requests
+        if len(requests) > self.batch_max_items:
+            detail = ReasonDetails(
+                reason_code="BATCH_TOO_LARGE",
+                reason_status="failure",
+                reason_details=[Request_Object_Validator(
+                    field="requests",
+                    message=f"A batch may contain at most {self.batch_max_items} searches; got {len(requests)}"
+                )]
+            )
+            return BatchSearchResponse(
+                status_info=StatusInfo(http_code=400, reason_details=[detail]), api_name=api_name
+            )
+
+        results: Dict[int, BatchItemResult] = {}
+        errors: List[BatchItemError] = []
+        pending: Dict[Tuple[str, ...], List[int]] = {}
+        for idx, req in enumerate(requests):
+            validation_errors = self._collect_validation_errors(req)
+            if validation_errors:
+                errors.append(BatchItemError(
+                    index=idx,
+                    status_info=self._create_error_response(400, "VALIDATION_ERROR", validation_errors).status_info,
+                ))
+                continue
+            cached = await self.cache.lookup(req)
+            CACHE_REQUESTS.labels("search", "miss" if cached is None else "hit").inc()
+            if cached is not None:
+                results[idx] = BatchItemResult(index=idx, cache="HIT", response=cached)
+                continue
+            pending.setdefault(self._location_key(req), []).append(idx)
+
+        sem = asyncio.Semaphore(max(1, self.batch_max_concurrency))
+        groups: List[List[int]] = []
+        for indexes in pending.values():
+            products: Dict[str, List[int]] = {}
+            for idx in indexes:
+                products.setdefault(_normalize(requests[idx].product_name), []).append(idx)
+            names = list(products)
+            for start in range(0, len(names), max(1, self.batch_max_products_per_prompt)):
+                groups.append([i for name in names[start:start + self.batch_max_products_per_prompt] for i in products[name]])
+
+        # One deadline covers the whole batch: Gemini groups first, then a single enrichment pass.
+        with deadline_scope(self.request_timeout):
+            outcomes = await asyncio.gather(*(self._run_batch_group(requests, group, sem) for group in groups))
+            for outcome in outcomes:
+                for idx, response in outcome.items():
+                    if response.status_info.http_code == 200:
+                        results[idx] = BatchItemResult(index=idx, cache="MISS", response=response)
+                    else:
+                        errors.append(BatchItemError(index=idx, status_info=response.status_info))
+
+            # Enrich every fresh store in the batch; identical lookups are coalesced.
+            if self.places_enabled and self._places_ready():
+                await self._enrich_batch(requests, results)
+        for item in results.values():
+            if item.cache == "MISS":
+                item.response.stores_list = self._apply_geo(item.response.stores_list, requests[item.index])
+        for item in results.values():
+            if item.cache == "MISS":
+                await self.cache.put(requests[item.index], item.response)
+
+        ordered = [results[i] for i in sorted(results)]
+        errors.sort(key=lambda e: e.index)
+        reason_code = "OK" if not errors else ("PARTIAL_SUCCESS" if ordered else "FAILED")
+        status = StatusInfo(
+            http_code=200 if ordered or not errors else 502,
+            reason_details=[ReasonDetails(
+                reason_code=reason_code,
+                reason_status="success" if ordered else "failure",
+                reason_details=[Request_Object_Validator(
+                    field="message",
+                    message=f"Batch completed: {len(ordered)} succeeded, {len(errors)} failed."
+                )]
+            )]
+        )
+        return BatchSearchResponse(results=ordered, errors=errors, status_info=status, api_name=api_name)
+
+    async def _enrich_batch(self, requests: List[SearchRequest], results: Dict[int, BatchItemResult]) -> None:
+        enrich_sem = asyncio.Semaphore(5)
+        tasks = []
+        for item in results.values():
+            if item.cache != "MISS":
+                continue
+            req = requests[item.index]
+            for store in item.response.stores_list[: self.max_enrich]:
+                tasks.append(asyncio.create_task(self._enrich_one(store, req, enrich_sem)))
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _run_batch_group(
+        self, requests: List[SearchRequest], indexes: List[int], sem: asyncio.Semaphore
+    ) -> Dict[int, SearchResponse]:
+        """Search several products at one location with a single Gemini prompt (no enrichment)."""
+        first = requests[indexes[0]]
+        product_names: List[str] = []
+        for idx in indexes:
+            name = requests[idx].product_name or ""
+            if _normalize(name) not in map(_normalize, product_names):
+                product_names.append(name)
+        group_req = first.model_copy(update={"product_name": ", ".join(product_names)})
+        prompt = self._build_prompt(group_req)
+        self._count_centroid_lookup(group_req)
+        try:
+            async with sem:
+                raw_list = await self.gemini.generate_store_list(prompt)
+        except (GeminiServiceError, UpstreamBusyError, DeadlineExceededError) as exc:
+            logger.error("Gemini batch group search failed: %s", exc)
+            failure = self._upstream_error_response(exc)
+            return {idx: failure for idx in indexes}
+
+        by_product: Dict[str, List[Dict[str, Any]]] = {_normalize(n): [] for n in product_names}
+        for item in raw_list if isinstance(raw_list, list) else []:
+            if not isinstance(item, dict):
+                continue
+            target = _match_product(item.get("product_name") or item.get("Product") or "", by_product)
+            if target is None and len(by_product) == 1:
+                target = next(iter(by_product))
+            if target is not None:
+                by_product[target].append(item)
+
+        responses: Dict[int, SearchResponse] = {}
+        for idx in indexes:
+            req = requests[idx]
+            try:
+                stores = self._process_raw_results(by_product[_normalize(req.product_name)], req)
+            except ValidationError as exc:
+                logger.warning("Malformed store items for batch item %d: %s", idx, exc)
+                stores = []
+            responses[idx] = self._create_success_response(stores, prompt, req)
+        return responses
+
+    @staticmethod
+    def _location_key(req: SearchRequest) -> Tuple[str, ...]:
+        return (
+            _normalize(req.zip_code),
+            _normalize(req.city_name),
+            _normalize(req.state_name),
+            _normalize(req.radius_miles),
+        )
+
+    @staticmethod
+    def _status_event(response: SearchResponse) -> Dict[str, Any]:
+        return {
+            "event": "status",
+            "status_info": response.status_info.model_dump(),
+            "prompt_used": response.prompt_used,
+            "api_name": response.api_name,
+        }
+
+    async def _execute_search(self, req: SearchRequest) -> SearchResponse:
+        """Run the Gemini search and Places enrichment for an already validated request."""
+        with deadline_scope(self.request_timeout), span("SearchService.search", product=req.product_name or ""):
+            return await self._execute_search_within_deadline(req)
+
+    async def _execute_search_within_deadline(self, req: SearchRequest) -> SearchResponse:
+        # Build prompt and log search details
+        with STAGE_BUILD_PROMPT.time(), span("SearchService._build_prompt"):
+            prompt = self._build_prompt(req)
         logger.info("Searching for product='%s' location='%s'", 
                     req.product_name, self._format_location(req))
+        self._count_centroid_lookup(req)
+
+        # Stores already known near this location can answer without going upstream
+        reused = self._reuse_nearby(req, prompt)
+        if reused is not None:
+            return reused
 
         # Execute Gemini search
         try:
             raw_list = await self.gemini.generate_store_list(prompt)
-        except GeminiServiceError as exc:
+        except (GeminiServiceError, UpstreamBusyError, DeadlineExceededError) as exc:
             logger.error("Gemini search failed: %s", exc)
-            error_detail = ReasonDetails(
-                reason_code="GEMINI_ERROR",
-                reason_status="failure",
-                reason_details=[Request_Object_Validator(field="message", message=str(exc))]
-            )
-            return self._create_error_response(502, "GEMINI_ERROR", [error_detail])
+            return self._upstream_error_response(exc)
 
         # Process and map results
-        stores = self._process_raw_results(raw_list, req)
+        with STAGE_PROCESS_RESULTS.time():
+            stores = self._process_raw_results(raw_list, req)
 
         # Enrich with Places API if enabled and we have stores
         if self.places_enabled and stores:
-            await self._enrich_with_places(stores, req)
+            with STAGE_ENRICHMENT.time():
+                await self._enrich_with_places(stores, req)
+        stores = self._apply_geo(stores, req)
 
         # Return successful response
         return self._create_success_response(stores, prompt, req)
@@ -170,24 +486,24 @@ class SearchService:
     def _collect_validation_errors(self, req: SearchRequest) -> List[ReasonDetails]:
         """Collect all validation errors from request and configuration."""
         validation_errors = []
-
-        # Validate search request
-        request_errors = self._validate_search_request(req)
-        if request_errors:
-            validation_errors.append(ReasonDetails(
-                reason_code="REQUEST_VALIDATION_ERROR",
-                reason_status="failure",
-                reason_details=request_errors
-            ))
-
-        # Validate configuration
-        config_errors = self._validate_configuration()
-        if config_errors:
-            validation_errors.append(ReasonDetails(
-                reason_code="API_CONFIG_VALIDATION_ERROR",
-                reason_status="failure",
-                reason_details=config_errors
-            ))
+        with STAGE_VALIDATE.time():
+            # Validate search request
+            request_errors = self._validate_search_request(req)
+            if request_errors:
+                validation_errors.append(ReasonDetails(
+                    reason_code="REQUEST_VALIDATION_ERROR",
+                    reason_status="failure",
+                    reason_details=request_errors
+                ))
+
+            # Validate configuration
+            config_errors = self._validate_configuration()
+            if config_errors:
+                validation_errors.append(ReasonDetails(
+                    reason_code="API_CONFIG_VALIDATION_ERROR",
+                    reason_status="failure",
+                    reason_details=config_errors
+                ))
 
         return validation_errors
 
@@ -197,32 +513,87 @@ class SearchService:
             return req.zip_code
         return f"{req.city_name}, {req.state_name}" if req.city_name and req.state_name else "unknown"
 
+    def _origin(self, req: SearchRequest) -> Optional[Tuple[float, float]]:
+        """Centroid of the request's ZIP code, or None (geo disabled, city/state search, unknown ZIP)."""
+        if not self.geo_enabled or not req.zip_code:
+            return None
+        return self.zip_centroids.get(req.zip_code)
+
+    def _count_centroid_lookup(self, req: SearchRequest) -> None:
+        """Count ZIP searches with and without a local centroid, so a seed-only file shows up in /metrics."""
+        if not self.geo_enabled or not req.zip_code:
+            return
+        (ZIP_CENTROID_HIT if self.zip_centroids.get(req.zip_code) is not None else ZIP_CENTROID_MISSING).inc()
+
+    @staticmethod
+    def _radius(req: SearchRequest) -> float:
+        try:
+            return float(str(req.radius_miles).strip())
+        except (TypeError, ValueError):
+            return 0.0
+
+    def _apply_geo(self, stores: List[StoreItem], req: SearchRequest) -> List[StoreItem]:
+        """Drop stores whose Places coordinates are outside the radius, re-rank, and index the rest."""
+        origin = self._origin(req)
+        if origin is None or not stores:
+            return stores
+        located = [s for s in stores if s.store_details.latitude is not None and s.store_details.longitude is not None]
+        if not located:
+            return stores
+        radius = self._radius(req)
+        distances = haversine_many(
+            origin[0], origin[1],
+            [s.store_details.latitude for s in located], [s.store_details.longitude for s in located],
+        )
+        outside = set()
+        for store, distance in zip(located, distances):
+            store.store_details.distance_from_zipcode = _format_miles(distance)
+            if self.filter_out_of_radius and radius and distance > radius:
+                outside.add(id(store))
+        if outside:
+            logger.info("Dropped %d stores outside %s mi of %s", len(outside), radius, req.zip_code)
+            stores = [s for s in stores if id(s) not in outside]
+        self.store_index.add(_normalize(req.product_name), stores)
+        # Distances changed, so the ranking may have too
+        return rank_stores(stores, self.ranking_keys)
+
+    def _reuse_nearby(self, req: SearchRequest, prompt: str) -> Optional[SearchResponse]:
+        """Answer from stores indexed by earlier searches when enough are known within the radius."""
+        origin = self._origin(req)
+        if origin is None or not self.store_index.enabled:
+            return None
+        wanted = int(str(req.min_store_results).strip() or 0)
+        found = self.store_index.nearby(_normalize(req.product_name), origin[0], origin[1], self._radius(req))
+        if not found or len(found) < max(1, wanted):
+            CACHE_REQUESTS.labels("nearby_stores", "miss").inc()
+            return None
+        CACHE_REQUESTS.labels("nearby_stores", "hit").inc()
+        stores = []
+        for store, distance in found:
+            store.store_details.distance_from_zipcode = _format_miles(distance)
+            stores.append(store)
+        stores = rank_stores(stores, self.ranking_keys)
+        if wanted:
+            stores = stores[:wanted]
+        logger.info("Served %d known stores near %s without an upstream call", len(stores), req.zip_code)
+        return self._create_success_response(stores, prompt, req)
+
     def _process_raw_results(self, raw_list: Any, req: SearchRequest) -> List[StoreItem]:
-        """Process raw Gemini results into StoreItem objects."""
+        """Process raw Gemini results into StoreItem objects, ranked by ``ranking.keys``."""
         stores = []
         if isinstance(raw_list, list) and raw_list:
             for item in raw_list:
-                stores.append(self._map_raw_item(item))
+                try:
+                    stores.append(self._map_raw_item(item))
+                except (ValidationError, AttributeError) as exc:
+                    logger.warning("Skipping malformed store item from Gemini: %s", exc)
             if not stores:
                 logger.warning("No valid store items found in Gemini response")
-            if stores:
-                for s in stores:
-                    # Attempt to extract numeric price for sorting
-                    price_str = s.product_price.replace("$", "").replace(",", "").strip()
-                    try:
-                        s._sortable_price = float(price_str)
-                    except (ValueError, AttributeError):
-                        s._sortable_price = float("inf")
-                # Sort stores by numeric price if available
-                stores.sort(key=lambda s: getattr(s, "_sortable_price", float("inf")))
-                # Clean up temporary sortable attribute
-                for s in stores:
-                    if hasattr(s, "_sortable_price"):
-                        delattr(s, "_sortable_price")
-                # Limit to top N results as per request (min_store_results)
-                limit = int(str(req.min_store_results).strip())
-                if limit and len(stores) > limit:
-                    stores = stores[:limit]
+            stores = rank_stores(stores, self.ranking_keys)
+            # Limit to top N results as per request (min_store_results)
+            limit = int(str(req.min_store_results).strip())
+            if limit and len(stores) > limit:
+                stores = stores[:limit]
 
         return stores
 
@@ -237,6 +608,21 @@ class SearchService:
         )
         return SearchResponse(stores_list=[], status_info=status)
 
+    def _upstream_error_response(self, exc: Exception) -> SearchResponse:
+        """Map a Gemini failure to 502, 503 when the upstream limiter shed the call, or 504 on deadline."""
+        if isinstance(exc, UpstreamBusyError):
+            http_code, reason_code = 503, "UPSTREAM_BUSY"
+        elif isinstance(exc, DeadlineExceededError):
+            http_code, reason_code = 504, "DEADLINE_EXCEEDED"
+        else:
+            http_code, reason_code = 502, "GEMINI_ERROR"
+        error_detail = ReasonDetails(
+            reason_code=reason_code,
+            reason_status="failure",
+            reason_details=[Request_Object_Validator(field="message", message=str(exc))]
+        )
+        return self._create_error_response(http_code, reason_code, [error_detail])
+
     def _create_success_response(self, stores: List[StoreItem], prompt: str, req: SearchRequest) -> SearchResponse:
         """Create successful search response."""
         requested_min = int(str(req.min_store_results).strip()) if req and req.min_store_results else 0
@@ -270,44 +656,116 @@ class SearchService:
         unit_q = item.get("unit/quantity") or item.get("unit_quantity") or item.get("Unit-quantity") or ""
         website = item.get("website_link") or item.get("website") or None
         details = StoreDetails(store_name=store_name, store_address=address, distance_from_zipcode=distance_from_zipcode, website=website)
-        return StoreItem(product_name=product_name, product_image=product_image, product_price=price, unit_quantity=unit_q, store_details=details)
-    async def _enrich_with_places(self, stores: List[StoreItem], req: SearchRequest) -> None:
-        places = PlacesService()
-        sem = asyncio.Semaphore(5)
+        citations = self._item_citations(item)
+        quote = parse_price(str(price), str(unit_q))
+        price_as_of = item.get("price_as_of") or item.get("price_date") or item.get("last_updated") or None
+        return StoreItem(
+            product_name=product_name, product_image=product_image, product_price=price, unit_quantity=unit_q,
+            store_details=details, citations=citations,
+            unit_price=round(quote.unit_price, 4) if quote.unit_price is not None else None,
+            unit_price_basis=quote.basis, price_as_of=str(price_as_of) if price_as_of else None,
+        )
 
-        async def enrich_one(idx: int, store: StoreItem):
-            need_address = not store.store_details.store_address or self.enrich_mode == "always"
-            need_site = not store.store_details.website or self.enrich_mode == "always"
-            if not (need_address or need_site):
-                return
-            suffix_parts = []
-            if req.city_name:
-                suffix_parts.append(req.city_name)
-            if req.state_name:
-                suffix_parts.append(req.state_name)
-            if req.zip_code:
-                suffix_parts.append(req.zip_code)
-            suffix = ", ".join(p for p in suffix_parts if p)
-            query = f"{store.store_details.store_name} {suffix}" if suffix else store.store_details.store_name
-            async with sem:
-                try:
-                    found = await places.search_place(query)
-                    if not found:
-                        return
-                    place_id = found.get("place_id")
-                    details = await places.get_details(place_id) if place_id else None
-                    if details:
-                        if need_address and details.get("formatted_address"):
-                            store.store_details.store_address = details.get("formatted_address")
-                        if need_site and details.get("website"):
-                            store.store_details.website = details.get("website")
-                except PlacesServiceError as exc:
-                    logger.warning("Places enrichment failed for %s: %s", store.store_details.store_name, exc)
-                except Exception as exc:  # pylint: disable=broad-except
-                    logger.warning("Unexpected enrichment error for %s: %s", store.store_details.store_name, exc)
+    @staticmethod
+    def _item_citations(item: Dict[str, Any]) -> List[Citation]:
+        raw_citations = item.get("citations")
+        if not isinstance(raw_citations, list):
+            return []
+        return [Citation.model_validate(c) for c in raw_citations if isinstance(c, dict)]
 
+    async def _enrich_with_places(self, stores: List[StoreItem], req: SearchRequest) -> None:
+        if not self._places_ready():
+            return
+        sem = asyncio.Semaphore(5)
         tasks = []
-        for idx, s in enumerate(stores[: self.max_enrich]):
-            tasks.append(asyncio.create_task(enrich_one(idx, s)))
+        for s in stores[: self.max_enrich]:
+            tasks.append(asyncio.create_task(self._enrich_one(s, req, sem)))
         if tasks:
-            await asyncio.gather(*tasks, return_exceptions=True)
\ No newline at end of file
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    def _places_ready(self) -> bool:
+        if not self.places.api_key:
+            logger.warning("Skipping Places enrichment; Google Places API key missing")
+            return False
+        if self.places.breaker.is_open:
+            logger.warning("Skipping Places enrichment; Places circuit breaker is open")
+            return False
+        return True
+
+    async def _enrich_one(self, store: StoreItem, req: SearchRequest, sem: asyncio.Semaphore) -> bool:
+        """Fill in a store's missing address/website from Places; returns True if anything changed."""
+        need_address = not store.store_details.store_address or self.enrich_mode == "always"
+        need_site = not store.store_details.website or self.enrich_mode == "always"
+        origin = self._origin(req)
+        need_coords = origin is not None and store.store_details.latitude is None
+        if not (need_address or need_site or need_coords):
+            return False
+        suffix_parts = []
+        if req.city_name:
+            suffix_parts.append(req.city_name)
+        if req.state_name:
+            suffix_parts.append(req.state_name)
+        if req.zip_code:
+            suffix_parts.append(req.zip_code)
+        suffix = ", ".join(p for p in suffix_parts if p)
+        query = f"{store.store_details.store_name} {suffix}" if suffix else store.store_details.store_name
+        changed = False
+        try:
+            with span("SearchService.enrich_one", store=store.store_details.store_name) as trace_span:
+                hit, record = await self.place_cache.get(query)
+                CACHE_REQUESTS.labels("places", "hit" if hit else "miss").inc()
+                trace_span.set_attribute("cache_hit", hit)
+                if not hit:
+                    # Concurrent lookups for the same store (e.g. across a batch) share one round-trip
+                    record = await self._place_flight.do(
+                        normalize_place_query(query), lambda: self._fetch_place(query, sem)
+                    )
+                if record:
+                    if need_address and record.formatted_address:
+                        store.store_details.store_address = record.formatted_address
+                        changed = True
+                    if need_site and record.website:
+                        store.store_details.website = record.website
+                        changed = True
+                    if need_coords and record.latitude is not None and record.longitude is not None:
+                        store.store_details.latitude = record.latitude
+                        store.store_details.longitude = record.longitude
+                        distance = haversine_many(origin[0], origin[1], [record.latitude], [record.longitude])[0]
+                        store.store_details.distance_from_zipcode = _format_miles(distance)
+                        changed = True
+        except PlacesServiceError as exc:
+            logger.warning("Places enrichment failed for %s: %s", store.store_details.store_name, exc)
+        except UpstreamBusyError as exc:
+            # Places budget exhausted: keep Gemini's data rather than failing the search
+            logger.warning("Skipping Places enrichment for %s: %s", store.store_details.store_name, exc)
+        except Exception as exc:  # pylint: disable=broad-except
+            logger.warning("Unexpected enrichment error for %s: %s", store.store_details.store_name, exc)
+        return changed
+
+    async def _fetch_place(self, query: str, sem: asyncio.Semaphore) -> Optional[PlaceRecord]:
+        async with sem:
+            record = await self._lookup_place(self.places, query)
+        await self.place_cache.set(query, record)
+        return record
+
+    @staticmethod
+    async def _lookup_place(places: PlacesService, query: str) -> Optional[PlaceRecord]:
+        """Resolve a store query via Text Search + Details; None means Places has no match."""
+        with STAGE_PLACES_TEXT_SEARCH.time():
+            found = await places.search_place(query)
+        if not found:
+            return None
+        place_id = found.get("place_id")
+        details = None
+        if place_id:
+            with STAGE_PLACES_DETAILS.time():
+                details = await places.get_details(place_id)
+        details = details or {}
+        location = (details.get("geometry") or found.get("geometry") or {}).get("location") or {}
+        return PlaceRecord(
+            place_id=place_id,
+            formatted_address=details.get("formatted_address") or found.get("formatted_address"),
+            website=details.get("website"),
+            latitude=location.get("lat"),
+            longitude=location.get("lng"),
+        )
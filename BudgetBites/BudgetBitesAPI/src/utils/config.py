@@ -1,49 +1,233 @@
 import os
+from collections.abc import Mapping
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
 import yaml
 
-_CONFIG_CACHE: Dict[str, Any] | None = None
+CONFIG_PATH = Path(__file__).resolve().parents[2] / "config" / "default.yaml"
+
+# (dotted path, environment variable) overrides; the environment wins over the file
+_ENV_OVERRIDES = (
+    ("providers.google.generative_ai.api_key", "GOOGLE_GEMINI_API_KEY"),
+    ("providers.google.generative_ai.model", "GOOGLE_GEMINI_MODEL"),
+    ("providers.google.places.api_key", "GOOGLE_PLACES_API_KEY"),
+)
 
 class ConfigError(Exception):
     pass
 
-def load_config() -> Dict[str, Any]:
-    global _CONFIG_CACHE
-    if _CONFIG_CACHE is not None:
-        return _CONFIG_CACHE
-    config_path = Path(__file__).resolve().parents[2] / "config" / "default.yaml"
-    if not config_path.exists():
-        raise ConfigError(f"Config file not found at {config_path}")
-    with open(config_path, "r", encoding="utf-8") as f:
-        data = yaml.safe_load(f) or {}
-    # Override with env variables if present
-    providers = data.get("providers", {})
-    google = providers.get("google", {})
-
-    # Generic override helper
-    def override(path: str, env_var: str):
-        parts = path.split('.')
-        ref = data
-        for p in parts[:-1]:
-            ref = ref.setdefault(p, {})
-        if env_var in os.environ and os.environ[env_var]:
-            ref[parts[-1]] = os.environ[env_var]
+class Section(Mapping):
+    """Read-only view of one mapping in the config, with attribute access (``settings.app.port``)."""
+
+    __slots__ = ("_data",)
+
+    def __init__(self, data: Dict[str, Any]) -> None:
+        object.__setattr__(self, "_data", data)
+
+    def __getattr__(self, name: str) -> Any:
+        try:
+            return self._data[name]
+        except KeyError:
+            raise AttributeError(name) from None
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError("config snapshots are read-only")
+
+    def __getitem__(self, key: str) -> Any:
+        return self._data[key]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._data)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __repr__(self) -> str:
+        return f"Section({self._data!r})"
+
+class Settings(Section):
+    """Immutable snapshot of ``default.yaml`` plus environment overrides.
+
+    Every dotted path (``"cache.search.ttl_seconds"``, and each enclosing section) is
+    precomputed into one flat dict, so ``get`` is a single dict lookup. Lists become tuples and
+    mappings become ``Section`` views; a reload builds a new snapshot instead of mutating this one.
+    """
+
+    __slots__ = ("_flat", "version")
+
+    def __init__(self, data: Dict[str, Any], version: int = 1) -> None:
+        flat: Dict[str, Any] = {}
+        super().__init__(_freeze(data, "", flat)._data)
+        object.__setattr__(self, "_flat", flat)
+        object.__setattr__(self, "version", version)
+
+    def get(self, path: str, default: Any = None) -> Any:  # type: ignore[override]
+        return self._flat.get(path, default)
 
-    override("providers.google.generative_ai.api_key", "GOOGLE_GEMINI_API_KEY")
-    override("providers.google.generative_ai.model", "GOOGLE_GEMINI_MODEL")
-    override("providers.google.places.api_key", "GOOGLE_PLACES_API_KEY")
+    def to_dict(self) -> Dict[str, Any]:
+        """Plain, mutable deep copy of the snapshot."""
+        return _thaw(self)
 
-    _CONFIG_CACHE = data
+def _freeze(value: Any, prefix: str, flat: Dict[str, Any]) -> Any:
+    if isinstance(value, dict):
+        frozen = {}
+        for key, item in value.items():
+            path = f"{prefix}{key}"
+            frozen[key] = flat[path] = _freeze(item, path + ".", flat)
+        return Section(frozen)
+    if isinstance(value, list):
+        return tuple(_freeze(item, prefix, {}) for item in value)
+    return value
+
+def _thaw(value: Any) -> Any:
+    if isinstance(value, Section):
+        return {key: _thaw(item) for key, item in value.items()}
+    if isinstance(value, tuple):
+        return [_thaw(item) for item in value]
+    return value
+
+def _read_config(path: Path = CONFIG_PATH) -> Dict[str, Any]:
+    if not path.exists():
+        raise ConfigError(f"Config file not found at {path}")
+    with open(path, "r", encoding="utf-8") as f:
+        try:
+            data = yaml.safe_load(f) or {}
+        except yaml.YAMLError as exc:
+            raise ConfigError(f"Config file {path} is not valid YAML: {exc}") from exc
+    if not isinstance(data, dict):
+        raise ConfigError(f"Config file {path} must contain a mapping")
+    for dotted, env_var in _ENV_OVERRIDES:
+        if os.environ.get(env_var):
+            parts = dotted.split(".")
+            ref = data
+            for p in parts[:-1]:
+                ref = ref.setdefault(p, {})
+            ref[parts[-1]] = os.environ[env_var]
     return data
 
+# The published snapshot. Readers take the reference without locking; a reload replaces it
+# with a single assignment, so a reader sees either the old or the new snapshot, never a mix.
+_SETTINGS: Optional[Settings] = None
+_RELOAD_LISTENERS: List[Callable[[Settings], None]] = []
+
+def settings() -> Settings:
+    global _SETTINGS
+    snapshot = _SETTINGS
+    if snapshot is None:
+        snapshot = _SETTINGS = Settings(_read_config())
+    return snapshot
+
+def load_config() -> Dict[str, Any]:
+    """Load the config (once) and return it as a plain dict copy."""
+    return settings().to_dict()
+
 def get_setting(path: str, default: Any | None = None) -> Any:
-    cfg = load_config()
-    parts = path.split('.')
-    ref: Any = cfg
-    for p in parts:
-        if isinstance(ref, dict) and p in ref:
-            ref = ref[p]
-        else:
-            return default
-    return ref
+    snapshot = _SETTINGS if _SETTINGS is not None else settings()
+    return snapshot._flat.get(path, default)  # pylint: disable=protected-access
+
+def add_reload_listener(callback: Callable[[Settings], None]) -> None:
+    """Call ``callback(new_settings)`` after each successful reload."""
+    _RELOAD_LISTENERS.append(callback)
+
+def remove_reload_listener(callback: Callable[[Settings], None]) -> None:
+    if callback in _RELOAD_LISTENERS:
+        _RELOAD_LISTENERS.remove(callback)
+
+def reload_config(path: Path = CONFIG_PATH) -> Tuple[Optional[Settings], List[str]]:
+    """Re-read YAML and environment, validate, and publish the new snapshot.
+
+    Returns ``(snapshot, [])`` on success. On a read or validation failure the current snapshot
+    stays published and ``(None, problems)`` is returned. Exceptions raised by listeners are
+    returned as problems too; the new snapshot is already live by then.
+    """
+    global _SETTINGS
+    try:
+        candidate = Settings(_read_config(path), version=settings().version + 1)
+    except ConfigError as exc:
+        return None, [str(exc)]
+    problems = validate_config(candidate)
+    if problems:
+        return None, problems
+    _SETTINGS = candidate
+    failures = []
+    for callback in list(_RELOAD_LISTENERS):
+        try:
+            callback(candidate)
+        except Exception as exc:  # pylint: disable=broad-except
+            failures.append(f"reload listener {callback!r} failed: {exc}")
+    return candidate, failures
+
+def set_settings(snapshot: Optional[Settings]) -> None:
+    """Publish ``snapshot`` directly (None re-reads the file on next use); meant for tests."""
+    global _SETTINGS
+    _SETTINGS = snapshot
+
+# (path, minimum) for numeric settings that must parse and not fall below the minimum
+_NUMERIC_RULES: Tuple[Tuple[str, float], ...] = (
+    ("app.request_timeout_seconds", 0.001),
+    ("app.http_client_timeout_seconds", 0.001),
+    ("app.max_retries", 0),
+    ("places.max_enrich_per_request", 0),
+    ("batch.max_items", 1),
+    ("batch.max_concurrency", 1),
+    ("batch.max_products_per_prompt", 1),
+    ("cache.search.ttl_seconds", 0),
+    ("cache.search.max_entries", 1),
+    ("resilience.gemini_deadline_share", 0.001),
+    ("config_reload.poll_interval_seconds", 0.1),
+    ("geo.grid_cell_degrees", 0.001),
+    ("geo.reuse_ttl_seconds", 0),
+    ("geo.max_products", 1),
+    ("geo.max_stores_per_product", 1),
+)
+_TEMPLATE_FIELDS = {
+    "queries.zip_template": dict(item_name="x", zipcode="00000", min_results=1, radius_miles=1),
+    "queries.city_state_template": dict(item_name="x", city_name="x", state_name="x", min_results=1, radius_miles=1),
+}
+# Mirrors src.services.pricing.RANKING_KEYS (config must not import the service layer)
+_RANKING_KEYS = ("unit_price", "price", "distance", "freshness")
+_CHOICES = {
+    "places.enrich_mode": ("missing_only", "always"),
+    "logging.overflow": ("drop_new", "drop_oldest", "block"),
+}
+
+def validate_config(snapshot: Optional[Settings] = None) -> List[str]:
+    """Return structural problems with a config snapshot (the published one by default).
+
+    Missing API keys are not structural: they can arrive via environment variables and are
+    reported per request instead, so the app (and its health check) can still start.
+    """
+    lookup = (snapshot or settings()).get
+    problems: List[str] = []
+    for path, minimum in _NUMERIC_RULES:
+        value = lookup(path)
+        if value is None:
+            continue
+        try:
+            if float(value) < minimum:
+                problems.append(f"{path} must be >= {minimum:g} (got {value!r})")
+        except (TypeError, ValueError):
+            problems.append(f"{path} must be a number (got {value!r})")
+    for path, fields in _TEMPLATE_FIELDS.items():
+        template = lookup(path)
+        if template is None:
+            continue
+        try:
+            str(template).format(**fields)
+        except (KeyError, IndexError, ValueError) as exc:
+            problems.append(f"{path} is not a valid template: {exc!r}")
+    if not lookup("queries.zip_template"):
+        problems.append("queries.zip_template is required")
+    for path, allowed in _CHOICES.items():
+        value = lookup(path)
+        if value is not None and value not in allowed:
+            problems.append(f"{path} must be one of {', '.join(allowed)} (got {value!r})")
+    keys = lookup("ranking.keys")
+    if keys is not None:
+        unknown = [k for k in (keys if isinstance(keys, tuple) else (keys,)) if k not in _RANKING_KEYS]
+        if unknown:
+            problems.append(f"ranking.keys must be a list drawn from {', '.join(_RANKING_KEYS)} (got {list(unknown)!r})")
+    ratio = lookup("tracing.sample_ratio")
+    if ratio is not None and not (isinstance(ratio, (int, float)) and 0 <= ratio <= 1):
+        problems.append(f"tracing.sample_ratio must be between 0 and 1 (got {ratio!r})")
+    return problems
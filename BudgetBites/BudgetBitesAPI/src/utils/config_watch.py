@@ -0,0 +1,72 @@
+"""Hot reload of ``config/default.yaml``.
+
+The file is polled for a changed mtime/size (no extra dependency, works on every platform) and,
+on POSIX, ``SIGHUP`` forces a reload. Either way the new snapshot is validated first and only
+published when it is usable; a bad edit is logged and the running config is kept.
+
+Settings read per call (``get_setting``) and services that register a reload listener pick up
+changes immediately. Connection pools, limiters, logging and tracing are built once and still
+need a restart.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import signal
+from pathlib import Path
+from typing import Optional, Tuple
+
+from .config import CONFIG_PATH, reload_config
+from .logger import get_logger
+
+logger = get_logger(__name__)
+
+
+def _fingerprint(path: Path) -> Optional[Tuple[int, int]]:
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+def reload_and_log(path: Path = CONFIG_PATH) -> bool:
+    """Reload the config, logging the outcome; returns True when a new snapshot was published."""
+    snapshot, problems = reload_config(path)
+    if snapshot is None:
+        for problem in problems:
+            logger.error("Config reload rejected: %s", problem)
+        return False
+    for problem in problems:
+        logger.error("Config reload: %s", problem)
+    logger.info("Config reloaded from %s (version %d)", path, snapshot.version)
+    return True
+
+
+async def watch_config(interval: float = 2.0, path: Path = CONFIG_PATH) -> None:
+    """Poll ``path`` every ``interval`` seconds and reload when it changes."""
+    last = _fingerprint(path)
+    while True:
+        await asyncio.sleep(interval)
+        current = _fingerprint(path)
+        if current is not None and current != last:
+            last = current
+            reload_and_log(path)
+
+
+def install_sighup_handler(loop: Optional[asyncio.AbstractEventLoop] = None) -> bool:
+    """Reload on SIGHUP (POSIX only); returns False where the signal is unavailable."""
+    if not hasattr(signal, "SIGHUP"):
+        return False
+    loop = loop or asyncio.get_running_loop()
+    try:
+        loop.add_signal_handler(signal.SIGHUP, reload_and_log)
+    except (NotImplementedError, RuntimeError, ValueError):
+        # Not the main thread (e.g. some test runners) or a loop without signal support
+        return False
+    return True
+
+
+def remove_sighup_handler(loop: Optional[asyncio.AbstractEventLoop] = None) -> None:
+    if hasattr(signal, "SIGHUP"):
+        (loop or asyncio.get_running_loop()).remove_signal_handler(signal.SIGHUP)
@@ -0,0 +1,204 @@
+"""Great-circle distances, ZIP centroids and a grid index for "what is near this point" queries.
+
+``haversine_many`` uses numpy when it is installed (optional; not in requirements.txt) and a
+plain loop otherwise. ``GeoGrid`` buckets points into fixed lat/lng cells, so a radius query
+only measures the points in the cells overlapping the search circle's bounding box.
+"""
+
+from __future__ import annotations
+
+import csv
+import math
+from pathlib import Path
+from typing import Dict, Generic, Hashable, Iterable, List, Optional, Sequence, Set, Tuple, TypeVar
+
+from .config import get_setting
+from .logger import get_logger
+
+try:  # Optional: vectorized distances for large candidate sets
+    import numpy as np
+except ImportError:  # pragma: no cover - depends on the environment
+    np = None  # type: ignore[assignment]
+
+logger = get_logger(__name__)
+
+_PROJECT_ROOT = Path(__file__).resolve().parents[2]
+
+EARTH_RADIUS_MILES = 3958.7613
+MILES_PER_DEGREE_LAT = 69.0
+# Below this many points the numpy call overhead outweighs the loop
+_VECTORIZE_MIN = 32
+# The Census ZCTA Gazetteer has about 33,800 ZIPs; a file much smaller than that is only a seed
+FULL_COVERAGE_MIN_ZIPS = 30000
+
+K = TypeVar("K", bound=Hashable)
+
+
+def haversine_miles(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    dphi = phi2 - phi1
+    dlmb = math.radians(lng2 - lng1)
+    a = math.sin(dphi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(dlmb / 2) ** 2
+    return 2 * EARTH_RADIUS_MILES * math.asin(min(1.0, math.sqrt(a)))
+
+
+def haversine_many(lat: float, lng: float, lats: Sequence[float], lngs: Sequence[float]) -> List[float]:
+    """Distances in miles from one point to many."""
+    if np is not None and len(lats) >= _VECTORIZE_MIN:
+        phi1 = math.radians(lat)
+        phi2 = np.radians(np.asarray(lats, dtype=float))
+        dlmb = np.radians(np.asarray(lngs, dtype=float) - lng)
+        a = np.sin((phi2 - phi1) / 2) ** 2 + math.cos(phi1) * np.cos(phi2) * np.sin(dlmb / 2) ** 2
+        return (2 * EARTH_RADIUS_MILES * np.arcsin(np.minimum(1.0, np.sqrt(a)))).tolist()
+    phi1 = math.radians(lat)
+    cos_phi1 = math.cos(phi1)
+    out = []
+    for other_lat, other_lng in zip(lats, lngs):
+        phi2 = math.radians(other_lat)
+        a = math.sin((phi2 - phi1) / 2) ** 2 + cos_phi1 * math.cos(phi2) * math.sin(math.radians(other_lng - lng) / 2) ** 2
+        out.append(2 * EARTH_RADIUS_MILES * math.asin(min(1.0, math.sqrt(a))))
+    return out
+
+
+class GeoGrid(Generic[K]):
+    """Points bucketed into ``cell_degrees`` x ``cell_degrees`` cells."""
+
+    def __init__(self, cell_degrees: float = 0.25) -> None:
+        self.cell = float(cell_degrees)
+        self._cells: Dict[Tuple[int, int], Set[K]] = {}
+        self._points: Dict[K, Tuple[float, float]] = {}
+
+    def _cell_of(self, lat: float, lng: float) -> Tuple[int, int]:
+        return math.floor(lat / self.cell), math.floor(lng / self.cell)
+
+    def __len__(self) -> int:
+        return len(self._points)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._points
+
+    def add(self, key: K, lat: float, lng: float) -> None:
+        self.remove(key)
+        self._points[key] = (lat, lng)
+        self._cells.setdefault(self._cell_of(lat, lng), set()).add(key)
+
+    def remove(self, key: K) -> None:
+        point = self._points.pop(key, None)
+        if point is None:
+            return
+        cell = self._cell_of(*point)
+        members = self._cells.get(cell)
+        if members is not None:
+            members.discard(key)
+            if not members:
+                del self._cells[cell]
+
+    def _candidates(self, lat: float, lng: float, radius_miles: float) -> Iterable[K]:
+        dlat = radius_miles / MILES_PER_DEGREE_LAT
+        # Longitude degrees shrink towards the poles; clamp so the box stays finite
+        dlng = radius_miles / (MILES_PER_DEGREE_LAT * max(0.01, math.cos(math.radians(lat))))
+        lat_lo, lng_lo = self._cell_of(lat - dlat, lng - dlng)
+        lat_hi, lng_hi = self._cell_of(lat + dlat, lng + dlng)
+        if (lat_hi - lat_lo + 1) * (lng_hi - lng_lo + 1) > len(self._cells):
+            # Box covers more cells than exist: scanning the occupied ones is cheaper
+            for (cell_lat, cell_lng), members in self._cells.items():
+                if lat_lo <= cell_lat <= lat_hi and lng_lo <= cell_lng <= lng_hi:
+                    yield from members
+            return
+        for cell_lat in range(lat_lo, lat_hi + 1):
+            for cell_lng in range(lng_lo, lng_hi + 1):
+                members = self._cells.get((cell_lat, cell_lng))
+                if members:
+                    yield from members
+
+    def within(self, lat: float, lng: float, radius_miles: float) -> List[Tuple[K, float]]:
+        """``(key, distance_miles)`` for points within the radius, nearest first."""
+        keys = list(self._candidates(lat, lng, radius_miles))
+        if not keys:
+            return []
+        points = [self._points[k] for k in keys]
+        distances = haversine_many(lat, lng, [p[0] for p in points], [p[1] for p in points])
+        hits = [(k, d) for k, d in zip(keys, distances) if d <= radius_miles]
+        hits.sort(key=lambda hit: hit[1])
+        return hits
+
+
+def normalize_zip(zip_code: Optional[str]) -> Optional[str]:
+    """``" 98101-1234 "`` -> ``"98101"``; None unless it starts with five digits."""
+    if not zip_code:
+        return None
+    head = str(zip_code).strip()[:5]
+    return head if len(head) == 5 and head.isdigit() else None
+
+
+class ZipCentroids:
+    """ZIP code -> (lat, lng) lookup, loaded lazily from a local file.
+
+    Accepts a CSV with ``zip,lat,lng`` columns (``#`` comment lines allowed) or the Census
+    ZCTA Gazetteer file as downloaded (tab separated, ``GEOID``/``INTPTLAT``/``INTPTLONG``).
+    """
+
+    def __init__(self, path: Optional[str] = None) -> None:
+        file_path = Path(path or get_setting("geo.zip_centroids_path", "data/zip_centroids.csv"))
+        self.path = file_path if file_path.is_absolute() else _PROJECT_ROOT / file_path
+        self._centroids: Optional[Dict[str, Tuple[float, float]]] = None
+
+    def _load(self) -> Dict[str, Tuple[float, float]]:
+        centroids: Dict[str, Tuple[float, float]] = {}
+        try:
+            with open(self.path, encoding="utf-8", newline="") as fh:
+                lines = (line for line in fh if line.strip() and not line.startswith("#"))
+                first = next(lines, "")
+                delimiter = "\t" if "\t" in first else ","
+                header = [h.strip().lower() for h in first.split(delimiter)]
+                zip_col = _column(header, ("zip", "zip_code", "zipcode", "geoid", "zcta5"))
+                lat_col = _column(header, ("lat", "latitude", "intptlat"))
+                lng_col = _column(header, ("lng", "lon", "long", "longitude", "intptlong"))
+                for row in csv.reader(lines, delimiter=delimiter):
+                    try:
+                        zip_code = normalize_zip(row[zip_col].zfill(5))
+                        if zip_code:
+                            centroids[zip_code] = (float(row[lat_col]), float(row[lng_col]))
+                    except (IndexError, ValueError):
+                        continue
+        except (OSError, ValueError) as exc:
+            logger.warning("ZIP centroids unavailable (%s): %s; distances stay as reported by Gemini", self.path, exc)
+        else:
+            if len(centroids) < FULL_COVERAGE_MIN_ZIPS:
+                logger.warning(
+                    "Loaded only %d ZIP centroids from %s; searches for other ZIPs get no local distances, "
+                    "radius filtering or nearby-store reuse. Point geo.zip_centroids_path at the Census ZCTA "
+                    "Gazetteer file for full coverage",
+                    len(centroids), self.path,
+                )
+            else:
+                logger.info("Loaded %d ZIP centroids from %s", len(centroids), self.path)
+        return centroids
+
+    def get(self, zip_code: Optional[str]) -> Optional[Tuple[float, float]]:
+        if self._centroids is None:
+            self._centroids = self._load()
+        key = normalize_zip(zip_code)
+        return self._centroids.get(key) if key else None
+
+    def __len__(self) -> int:
+        if self._centroids is None:
+            self._centroids = self._load()
+        return len(self._centroids)
+
+
+def _column(header: List[str], names: Tuple[str, ...]) -> int:
+    for name in names:
+        if name in header:
+            return header.index(name)
+    raise ValueError(f"missing one of the columns {', '.join(names)}")
+
+
+_ZIP_CENTROIDS: Optional[ZipCentroids] = None
+
+
+def get_zip_centroids() -> ZipCentroids:
+    global _ZIP_CENTROIDS
+    if _ZIP_CENTROIDS is None:
+        _ZIP_CENTROIDS = ZipCentroids()
+    return _ZIP_CENTROIDS
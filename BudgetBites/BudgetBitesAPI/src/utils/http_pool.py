@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+from typing import Dict, Optional
+
+import httpx
+from google import genai
+from google.genai import types
+
+from .config import get_setting
+from .logger import get_logger
+
+logger = get_logger(__name__)
+
+
+def _http2_available() -> bool:
+    try:
+        import h2  # noqa: F401  # pylint: disable=import-outside-toplevel,unused-import
+    except ImportError:
+        return False
+    return True
+
+
+class HttpClientPool:
+    """Process-wide outbound HTTP clients shared by the Places and Gemini services.
+
+    A single keep-alive ``httpx.AsyncClient`` (HTTP/2 when ``h2`` is installed) is created
+    lazily on first use, and ``genai.Client`` instances are cached per API key on top of it,
+    so repeated calls reuse warm TCP/TLS connections. The owning FastAPI app closes the pool
+    from its lifespan handler on shutdown.
+    """
+
+    def __init__(self) -> None:
+        self.timeout = float(get_setting("app.http_client_timeout_seconds", 15))
+        self.http2 = bool(get_setting("http_pool.http2", True))
+        if self.http2 and not _http2_available():
+            logger.warning("HTTP/2 requested for the shared client pool but 'h2' is not installed; using HTTP/1.1.")
+            self.http2 = False
+        self.limits = httpx.Limits(
+            max_connections=int(get_setting("http_pool.max_connections", 100)),
+            max_keepalive_connections=int(get_setting("http_pool.max_keepalive_connections", 20)),
+            keepalive_expiry=float(get_setting("http_pool.keepalive_expiry_seconds", 30)),
+        )
+        self._client: Optional[httpx.AsyncClient] = None
+        self._genai_clients: Dict[str, genai.Client] = {}
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(timeout=self.timeout, limits=self.limits, http2=self.http2)
+        return self._client
+
+    def genai_client(self, api_key: str) -> genai.Client:
+        """Return a cached Gemini client for ``api_key`` that rides on the shared httpx client."""
+        client = self._genai_clients.get(api_key)
+        if client is None:
+            client = genai.Client(
+                api_key=api_key,
+                http_options=types.HttpOptions(httpx_async_client=self.client),
+            )
+            self._genai_clients[api_key] = client
+        return client
+
+    async def aclose(self) -> None:
+        """Close every pooled connection; safe to call more than once."""
+        genai_clients = list(self._genai_clients.values())
+        self._genai_clients.clear()
+        for client in genai_clients:
+            try:
+                await client.aio.aclose()
+                client.close()
+            except Exception as exc:  # pylint: disable=broad-except
+                logger.warning("Error closing Gemini client: %s", exc)
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
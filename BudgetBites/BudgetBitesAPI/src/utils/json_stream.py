@@ -0,0 +1,414 @@
+from __future__ import annotations
+
+import json
+import re
+from typing import Any, Dict, List, Tuple
+
+# Markdown citation links that grounding inserts into model text, e.g. "[1](https://...), [2](...)"
+_CITATION_RE = re.compile(r"\[\d+\]\([^)\s]*\)(?:\s*,\s*\[\d+\]\([^)\s]*\))*")
+_WS_RE = re.compile(r"[ \t\n\r]*")
+_START_RE = re.compile(r"[\[{]")
+_STRUCTURAL_RE = re.compile(r'["\\{}\[\]]')
+_BARE_KEY_RE = re.compile(r"[A-Za-z_$][\w$\-/.]*")
+_NUMBER_RE = re.compile(r"-?(?:0|[1-9]\d*)(?:\.\d+)?(?:[eE][-+]?\d+)?")
+_LITERALS = (("true", True), ("false", False), ("null", None), ("True", True), ("False", False), ("None", None))
+_DECODER = json.JSONDecoder()
+_scanstring = json.decoder.scanstring  # type: ignore[attr-defined]
+
+
+class JsonExtractionError(ValueError):
+    """No JSON array or object could be recovered from the text."""
+
+
+class _ParseFailure(Exception):
+    pass
+
+
+class _Truncated(_ParseFailure):
+    pass
+
+
+class _RepairingParser:
+    """Recursive-descent JSON reader that tolerates common LLM mistakes in the same pass.
+
+    Repairs: trailing commas, missing commas between members, unquoted or single-quoted keys,
+    single-quoted strings, Python literals (True/False/None), raw control characters inside
+    strings and citation links between tokens. A top-level array cut off mid-stream yields the
+    elements that were complete.
+    """
+
+    __slots__ = ("text", "n", "repairs")
+
+    def __init__(self, text: str) -> None:
+        self.text = text
+        self.n = len(text)
+        self.repairs = 0
+
+    def parse(self, start: int) -> Tuple[Any, int]:
+        if self.text[start] == "[":
+            return self._array(start + 1, top=True)
+        return self._value(start)
+
+    def _skip(self, i: int) -> int:
+        text = self.text
+        while True:
+            i = _WS_RE.match(text, i).end()
+            if i < self.n and text[i] == "[":
+                link = _CITATION_RE.match(text, i)
+                if link:
+                    i = link.end()
+                    continue
+            return i
+
+    def _value(self, i: int) -> Tuple[Any, int]:
+        i = self._skip(i)
+        if i >= self.n:
+            raise _Truncated("unexpected end of text")
+        text = self.text
+        ch = text[i]
+        if ch == "{":
+            return self._object(i + 1)
+        if ch == "[":
+            return self._array(i + 1)
+        if ch == '"':
+            return self._string(i + 1)
+        if ch == "'":
+            return self._single_quoted(i + 1)
+        number = _NUMBER_RE.match(text, i)
+        if number:
+            token = number.group()
+            return (float(token) if any(c in token for c in ".eE") else int(token)), number.end()
+        for literal, value in _LITERALS:
+            if text.startswith(literal, i):
+                return value, i + len(literal)
+        raise _ParseFailure(f"unexpected character {ch!r} at {i}")
+
+    def _string(self, i: int) -> Tuple[str, int]:
+        try:
+            return _scanstring(self.text, i, False)
+        except json.JSONDecodeError as exc:
+            raise _Truncated(str(exc)) from exc
+
+    def _single_quoted(self, i: int) -> Tuple[str, int]:
+        self.repairs += 1
+        text = self.text
+        end = i
+        while True:
+            end = text.find("'", end)
+            if end < 0:
+                raise _Truncated("unterminated single-quoted string")
+            backslashes = 0
+            while text[end - 1 - backslashes] == "\\":
+                backslashes += 1
+            if backslashes % 2 == 0:
+                break
+            end += 1
+        raw = text[i:end].replace("\\'", "'").replace('"', '\\"')
+        value, _ = _scanstring(raw + '"', 0, False)
+        return value, end + 1
+
+    def _key(self, i: int) -> Tuple[str, int]:
+        ch = self.text[i]
+        if ch == '"':
+            return self._string(i + 1)
+        if ch == "'":
+            return self._single_quoted(i + 1)
+        bare = _BARE_KEY_RE.match(self.text, i)
+        if not bare:
+            raise _ParseFailure(f"expected an object key at {i}")
+        self.repairs += 1
+        return bare.group(), bare.end()
+
+    def _object(self, i: int) -> Tuple[Dict[str, Any], int]:
+        text = self.text
+        obj: Dict[str, Any] = {}
+        i = self._skip(i)
+        if i < self.n and text[i] == "}":
+            return obj, i + 1
+        while True:
+            i = self._skip(i)
+            if i >= self.n:
+                raise _Truncated("unterminated object")
+            key, i = self._key(i)
+            i = self._skip(i)
+            if i >= self.n:
+                raise _Truncated("unterminated object")
+            if text[i] != ":":
+                raise _ParseFailure(f"expected ':' at {i}")
+            obj[key], i = self._value(i + 1)
+            i = self._skip(i)
+            if i >= self.n:
+                raise _Truncated("unterminated object")
+            ch = text[i]
+            if ch == "}":
+                return obj, i + 1
+            if ch == ",":
+                i = self._skip(i + 1)
+                if i < self.n and text[i] == "}":
+                    self.repairs += 1  # trailing comma
+                    return obj, i + 1
+            elif ch in "\"'":
+                self.repairs += 1  # missing comma between members
+            else:
+                raise _ParseFailure(f"expected ',' or '}}' at {i}")
+
+    def _array(self, i: int, top: bool = False) -> Tuple[List[Any], int]:
+        text = self.text
+        items: List[Any] = []
+        try:
+            i = self._skip(i)
+            if i < self.n and text[i] == "]":
+                return items, i + 1
+            while True:
+                value, i = self._value(i)
+                items.append(value)
+                i = self._skip(i)
+                if i >= self.n:
+                    raise _Truncated("unterminated array")
+                ch = text[i]
+                if ch == "]":
+                    return items, i + 1
+                if ch == ",":
+                    i = self._skip(i + 1)
+                    if i < self.n and text[i] == "]":
+                        self.repairs += 1  # trailing comma
+                        return items, i + 1
+                elif ch in "{[\"'":
+                    self.repairs += 1  # missing comma between elements
+                else:
+                    raise _ParseFailure(f"expected ',' or ']' at {i}")
+        except _Truncated:
+            if top and items:
+                # Output cut off (e.g. token limit): keep the elements that were complete.
+                self.repairs += 1
+                return items, self.n
+            raise
+
+
+def array_element_spans(text: str) -> List[Tuple[int, int]]:
+    """Character spans ``(start, end)`` of the top-level objects in the first JSON array of ``text``.
+
+    Jumps between structural characters with a regex, so it is linear and cheap even on long
+    answers. Used to attribute grounding segments to the store objects they fall in.
+    """
+    spans: List[Tuple[int, int]] = []
+    depth = 0
+    in_string = False
+    skip_at = -1
+    obj_start = -1
+    started = False
+    for match in _STRUCTURAL_RE.finditer(text):
+        i = match.start()
+        if i == skip_at:
+            continue
+        ch = match.group()
+        if in_string:
+            if ch == "\\":
+                skip_at = i + 1
+            elif ch == '"':
+                in_string = False
+            continue
+        if not started:
+            # The array must open before any object does; prose brackets like "[1]" are fine.
+            if ch == "[":
+                first = _WS_RE.match(text, i + 1).end()
+                started = text.startswith("{", first)
+            continue
+        if ch == '"':
+            in_string = True
+        elif ch in "{[":
+            if depth == 0 and ch == "{":
+                obj_start = i
+            depth += 1
+        elif depth == 0:
+            break  # "]" closing the array
+        else:
+            depth -= 1
+            if depth == 0 and ch == "}" and obj_start >= 0:
+                spans.append((obj_start, i + 1))
+                obj_start = -1
+    return spans
+
+
+def _span_end(text: str, start: int) -> int:
+    """Index just past the bracket matching ``text[start]``, or -1 when it never closes."""
+    depth = 0
+    in_string = False
+    skip_at = -1
+    for match in _STRUCTURAL_RE.finditer(text, start):
+        i = match.start()
+        if i == skip_at:
+            continue
+        ch = match.group()
+        if in_string:
+            if ch == "\\":
+                skip_at = i + 1
+            elif ch == '"':
+                in_string = False
+        elif ch == '"':
+            in_string = True
+        elif ch in "{[":
+            depth += 1
+        elif ch in "}]":
+            depth -= 1
+            if depth == 0:
+                return i + 1
+    return -1
+
+
+def _decode_candidate(text: str, i: int) -> Tuple[Any, int]:
+    try:
+        return _DECODER.raw_decode(text, i)
+    except ValueError:
+        return _RepairingParser(text).parse(i)
+
+
+def _salvage_elements(text: str, i: int) -> List[Dict[str, Any]]:
+    """Objects of the array at ``i`` that closed and decode on their own (one linear pass)."""
+    items: List[Dict[str, Any]] = []
+    for start, end in array_element_spans(text[i:]):
+        try:
+            value, _ = _decode_candidate(text[i + start : i + end], 0)
+        except _ParseFailure:
+            continue
+        if isinstance(value, dict):
+            items.append(value)
+    return items
+
+
+def extract_json(text: str) -> Any:
+    """Return the first JSON array or object embedded in LLM output.
+
+    Scans once for the first ``[``/``{`` that starts a value, so code fences and prose before
+    the JSON cost nothing extra. Each candidate is decoded with the C decoder first and only
+    falls back to the repairing parser when that fails. Markdown citation links (``[1](url)``)
+    are never mistaken for the payload.
+
+    A candidate that still fails is never rescanned from inside: an array of objects returns
+    the elements that closed and decode on their own, and otherwise the search resumes after
+    the candidate's closing bracket (or gives up when it has none), so the cost stays linear.
+    """
+    if not text:
+        raise JsonExtractionError("Empty text")
+    pos = 0
+    while True:
+        start = _START_RE.search(text, pos)
+        if start is None:
+            raise JsonExtractionError("No JSON array or object found")
+        i = start.start()
+        try:
+            value, end = _decode_candidate(text, i)
+        except _ParseFailure:
+            is_object_array = text[i] == "[" and text.startswith("{", _WS_RE.match(text, i + 1).end())
+            if text[i] == "{" or is_object_array:
+                if is_object_array:
+                    items = _salvage_elements(text, i)
+                    if items:
+                        return items
+                end = _span_end(text, i)
+                if end < 0:
+                    raise JsonExtractionError("JSON value at %d is malformed or truncated" % i) from None
+                pos = end
+            else:
+                pos = i + 1  # prose bracket such as "[note]"
+            continue
+        if isinstance(value, list) and text.startswith("(", end):
+            pos = i + 1  # "[1](https://...)" is a citation, not the payload
+            continue
+        return value
+
+
+class JsonArrayStreamParser:
+    """Incrementally pull objects out of a JSON array while the text is still arriving.
+
+    Feed LLM output chunk by chunk; every time a top-level ``{...}`` element of the first
+    JSON array closes, it is decoded and returned from ``feed``. Prose and markdown fences
+    before the array are skipped. Each character is examined once, so the total cost is
+    linear in the length of the stream.
+    """
+
+    def __init__(self) -> None:
+        self._text = ""
+        self._pos = 0
+        self._in_array = False
+        self._done = False
+        self._depth = 0  # object/array depth inside the top-level array
+        self._in_string = False
+        self._escape = False
+        self._obj_start = -1
+        self._candidate = -1  # index of a '[' that may open the array
+
+    @property
+    def done(self) -> bool:
+        return self._done
+
+    def feed(self, chunk: str) -> List[Dict[str, Any]]:
+        if self._done or not chunk:
+            return []
+        self._text += chunk
+        items: List[Dict[str, Any]] = []
+        text = self._text
+        i = self._pos
+        n = len(text)
+        while i < n:
+            ch = text[i]
+            if not self._in_array:
+                if self._candidate >= 0:
+                    if ch.isspace():
+                        i += 1
+                        continue
+                    if ch == "{":
+                        self._in_array = True
+                        continue  # re-process '{' in array mode
+                    self._candidate = -1
+                if ch == "[":
+                    self._candidate = i
+                i += 1
+                continue
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+            elif ch == '"':
+                self._in_string = True
+            elif ch in "{[":
+                if self._depth == 0 and ch == "{":
+                    self._obj_start = i
+                self._depth += 1
+            elif ch in "}]":
+                if self._depth == 0 and ch == "]":
+                    self._done = True
+                    i += 1
+                    break
+                self._depth -= 1
+                if self._depth == 0 and ch == "}" and self._obj_start >= 0:
+                    item = self._decode(text[self._obj_start : i + 1])
+                    if item is not None:
+                        items.append(item)
+                    self._obj_start = -1
+            i += 1
+        self._pos = i
+        # Drop consumed text we no longer need so long streams do not grow the buffer.
+        keep_from = self._obj_start if self._obj_start >= 0 else (self._candidate if not self._in_array and self._candidate >= 0 else i)
+        if keep_from > 0:
+            self._text = self._text[keep_from:]
+            self._pos -= keep_from
+            if self._obj_start >= 0:
+                self._obj_start -= keep_from
+            if self._candidate >= 0:
+                self._candidate -= keep_from
+        return items
+
+    @staticmethod
+    def _decode(fragment: str) -> Dict[str, Any] | None:
+        try:
+            value = json.loads(fragment)
+        except json.JSONDecodeError:
+            try:
+                value = extract_json(fragment)
+            except JsonExtractionError:
+                return None
+        return value if isinstance(value, dict) else None
@@ -1,11 +1,20 @@
+import atexit
+import copy
 import logging
 import json
+import queue
 import sys
+import threading
 from contextvars import ContextVar
+from logging.handlers import QueueHandler, QueueListener
 from typing import Any, Dict
 from .config import get_setting
 
-_LOGGER: logging.Logger | None = None
+ROOT_LOGGER_NAME = "BudgetBitesAPI"
+
+_LISTENER: QueueListener | None = None
+_CONFIGURED = False
+_CONFIG_LOCK = threading.Lock()
 request_id_var: ContextVar[str | None] = ContextVar("request_id", default=None)
 
 class RequestIDFilter(logging.Filter):
@@ -25,31 +34,109 @@ class JsonFormatter(logging.Formatter):
             base["request_id"] = record.request_id  # type: ignore[attr-defined]
         if record.exc_info:
             base["exc_info"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            base["exc_info"] = record.exc_text
         return json.dumps(base, ensure_ascii=False)
 
-def get_logger(name: str = "BudgetBitesAPI") -> logging.Logger:
-    global _LOGGER
-    if _LOGGER is not None:
-        return _LOGGER
-    level_name = get_setting("app.log_level", "INFO")
-    level = getattr(logging, level_name.upper(), logging.INFO)
-
-    logger = logging.getLogger(name)
-    logger.setLevel(level)
-
-    handler = logging.StreamHandler(sys.stdout)
-    fmt_choice = get_setting("app.log_format", "json")
-    if fmt_choice == "json":
-        formatter = JsonFormatter()
-    else:
-        formatter = logging.Formatter("%(asctime)s | %(levelname)s | %(name)s | %(request_id)s | %(message)s")
-    handler.setFormatter(formatter)
-    handler.addFilter(RequestIDFilter())
-    logger.addHandler(handler)
-    logger.propagate = False
-
-    _LOGGER = logger
-    return logger
+class BoundedQueueHandler(QueueHandler):
+    """Hands records to the background listener without ever blocking the event loop.
+
+    When the queue is full, ``overflow`` decides what gives: ``drop_new`` discards the incoming
+    record, ``drop_oldest`` evicts the oldest queued one, ``block`` waits (not recommended).
+    """
+
+    def __init__(self, log_queue: "queue.Queue[logging.LogRecord]", overflow: str = "drop_new") -> None:
+        super().__init__(log_queue)
+        self.overflow = overflow
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Merge args and render tracebacks here (the exc_info objects must not cross threads),
+        # but leave the JSON/text formatting to the listener thread.
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        if self.overflow == "block":
+            self.queue.put(record)
+            return
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            if self.overflow == "drop_oldest":
+                try:
+                    self.queue.get_nowait()
+                    self.queue.put_nowait(record)
+                except (queue.Empty, queue.Full):
+                    pass
+            self.dropped += 1
+
+def _configure() -> None:
+    """Attach one queue handler to the root app logger; a listener thread formats and writes."""
+    global _LISTENER, _CONFIGURED
+    with _CONFIG_LOCK:
+        if _CONFIGURED:
+            return
+        root = logging.getLogger(ROOT_LOGGER_NAME)
+        level_name = get_setting("app.log_level", "INFO")
+        root.setLevel(getattr(logging, str(level_name).upper(), logging.INFO))
+
+        stream_handler = logging.StreamHandler(sys.stdout)
+        fmt_choice = get_setting("app.log_format", "json")
+        if fmt_choice == "json":
+            formatter: logging.Formatter = JsonFormatter()
+        else:
+            formatter = logging.Formatter("%(asctime)s | %(levelname)s | %(name)s | %(request_id)s | %(message)s")
+        stream_handler.setFormatter(formatter)
+
+        log_queue: "queue.Queue[logging.LogRecord]" = queue.Queue(maxsize=int(get_setting("logging.queue_size", 10000)))
+        queue_handler = BoundedQueueHandler(log_queue, str(get_setting("logging.overflow", "drop_new")))
+        # Capture the request id on the calling thread, where the context var is set
+        queue_handler.addFilter(RequestIDFilter())
+        root.addHandler(queue_handler)
+        root.propagate = False
+
+        _LISTENER = QueueListener(log_queue, stream_handler, respect_handler_level=True)
+        _LISTENER.start()
+        atexit.register(shutdown_logging)
+
+        for name, level in (get_setting("logging.levels", {}) or {}).items():
+            logging.getLogger(_qualified(name)).setLevel(getattr(logging, str(level).upper(), logging.INFO))
+        _CONFIGURED = True
+
+def _qualified(name: str) -> str:
+    if name == ROOT_LOGGER_NAME or name.startswith(ROOT_LOGGER_NAME + "."):
+        return name
+    return f"{ROOT_LOGGER_NAME}.{name}"
+
+def get_logger(name: str = ROOT_LOGGER_NAME) -> logging.Logger:
+    """Return a logger under the app root, so each module can be given its own level.
+
+    ``get_logger(__name__)`` in ``src/services/places_service.py`` yields
+    ``BudgetBitesAPI.src.services.places_service``; set ``logging.levels`` in config (or call
+    ``setLevel``) on that name. Disabled levels are rejected by ``isEnabledFor`` before any
+    record is built.
+    """
+    if not _CONFIGURED:
+        _configure()
+    return logging.getLogger(_qualified(name))
+
+def dropped_records() -> int:
+    """Records discarded because the log queue was full."""
+    root = logging.getLogger(ROOT_LOGGER_NAME)
+    return sum(getattr(h, "dropped", 0) for h in root.handlers)
+
+def shutdown_logging() -> None:
+    """Flush queued records and stop the listener thread."""
+    global _LISTENER
+    if _LISTENER is not None:
+        _LISTENER.stop()
+        _LISTENER = None
 
 def set_request_id(rid: str | None) -> None:
     request_id_var.set(rid)
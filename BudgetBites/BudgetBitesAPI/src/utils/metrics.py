@@ -0,0 +1,333 @@
+"""Minimal Prometheus-style metrics with no locks on the hot path.
+
+All metrics are updated from the event loop thread only, so plain attribute and list updates
+are safe. Label sets resolve to cached child objects; bind frequently used children once at
+import time (``HISTOGRAM.labels("gemini")``) so recording is a bisect plus two additions.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from .logger import dropped_records, get_logger
+from .upstream_limiter import all_limiters
+
+logger = get_logger(__name__)
+
+DEFAULT_BUCKETS: Tuple[float, ...] = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 20.0, 30.0, 60.0)
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _label_str(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    parts = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _fmt(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class _Metric:
+    kind = "untyped"
+
+    def __init__(
+        self, name: str, documentation: str, labelnames: Sequence[str] = (), registry: Optional["Registry"] = None
+    ) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: Dict[Tuple[str, ...], object] = {}
+        (registry if registry is not None else REGISTRY).register(self)
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def labels(self, *values: str, **kwargs: str):
+        key = tuple(str(v) for v in values) if values else tuple(str(kwargs[n]) for n in self.labelnames)
+        child = self._children.get(key)
+        if child is None:
+            child = self._new_child()
+            self._children[key] = child
+        return child
+
+    def header(self) -> List[str]:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+
+    def render(self) -> List[str]:
+        raise NotImplementedError
+
+
+class _CounterChild:
+    __slots__ = ("value",)
+
+    def __init__(self) -> None:
+        self.value = 0.0
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.value += amount
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def _new_child(self) -> _CounterChild:
+        return _CounterChild()
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.labels().inc(amount)
+
+    def render(self) -> List[str]:
+        lines = self.header()
+        for key, child in list(self._children.items()):
+            lines.append(f"{self.name}{_label_str(self.labelnames, key)} {_fmt(child.value)}")
+        return lines
+
+
+class _GaugeChild:
+    __slots__ = ("value",)
+
+    def __init__(self) -> None:
+        self.value = 0.0
+
+    def set(self, value: float) -> None:
+        self.value = value
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.value += amount
+
+    def dec(self, amount: float = 1.0) -> None:
+        self.value -= amount
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        collect: Optional[Callable[[], Dict[Tuple[str, ...], float]]] = None,
+        registry: Optional["Registry"] = None,
+    ) -> None:
+        # ``collect`` computes values at scrape time instead of on every update.
+        self._collect = collect
+        super().__init__(name, documentation, labelnames, registry)
+
+    def _new_child(self) -> _GaugeChild:
+        return _GaugeChild()
+
+    def set(self, value: float) -> None:
+        self.labels().set(value)
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.labels().inc(amount)
+
+    def dec(self, amount: float = 1.0) -> None:
+        self.labels().dec(amount)
+
+    def render(self) -> List[str]:
+        lines = self.header()
+        if self._collect is not None:
+            try:
+                values = self._collect()
+            except Exception as exc:  # pylint: disable=broad-except
+                logger.warning("Metric collector for %s failed: %s", self.name, exc)
+                values = {}
+        else:
+            values = {key: child.value for key, child in list(self._children.items())}
+        for key, value in values.items():
+            lines.append(f"{self.name}{_label_str(self.labelnames, key)} {_fmt(value)}")
+        return lines
+
+
+class _HistogramChild:
+    __slots__ = ("bounds", "counts", "sum", "count")
+
+    def __init__(self, bounds: Tuple[float, ...]) -> None:
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    @contextmanager
+    def time(self) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started)
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+        registry: Optional["Registry"] = None,
+    ) -> None:
+        self.bounds = tuple(sorted(float(b) for b in buckets))
+        super().__init__(name, documentation, labelnames, registry)
+
+    def _new_child(self) -> _HistogramChild:
+        return _HistogramChild(self.bounds)
+
+    def observe(self, value: float) -> None:
+        self.labels().observe(value)
+
+    def render(self) -> List[str]:
+        lines = self.header()
+        for key, child in list(self._children.items()):
+            cumulative = 0
+            for bound, count in zip(self.bounds + (float("inf"),), child.counts):
+                cumulative += count
+                le = 'le="' + _fmt(bound) + '"'
+                lines.append(f"{self.name}_bucket{_label_str(self.labelnames, key, le)} {cumulative}")
+            labels = _label_str(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {_fmt(child.sum)}")
+            lines.append(f"{self.name}_count{labels} {child.count}")
+        return lines
+
+
+class Registry:
+    def __init__(self) -> None:
+        self._metrics: Dict[str, _Metric] = {}
+
+    def register(self, metric: _Metric) -> None:
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric {metric.name} already registered")
+        self._metrics[metric.name] = metric
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for metric in list(self._metrics.values()):
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+# --- Application metrics -------------------------------------------------------------------
+
+HTTP_REQUESTS = Counter("budgetbites_http_requests_total", "HTTP requests served.", ("method", "route", "status"))
+HTTP_LATENCY = Histogram("budgetbites_http_request_duration_seconds", "HTTP request latency.", ("route",))
+HTTP_IN_FLIGHT = Gauge("budgetbites_http_requests_in_flight", "HTTP requests currently being served.")
+
+SEARCH_STAGE_LATENCY = Histogram(
+    "budgetbites_search_stage_duration_seconds",
+    "Latency of each stage of the search pipeline.",
+    ("stage",),
+)
+UPSTREAM_REQUESTS = Counter(
+    "budgetbites_upstream_requests_total",
+    "Calls to upstream APIs by outcome (HTTP status, 'error' or 'timeout').",
+    ("upstream", "operation", "status"),
+)
+UPSTREAM_LATENCY = Histogram(
+    "budgetbites_upstream_request_duration_seconds",
+    "Latency of individual upstream API attempts.",
+    ("upstream", "operation"),
+)
+CACHE_REQUESTS = Counter("budgetbites_cache_requests_total", "Cache lookups by result.", ("cache", "result"))
+ZIP_CENTROID_LOOKUPS = Counter(
+    "budgetbites_zip_centroid_lookups_total",
+    "ZIP code searches by whether the ZIP had a local centroid ('hit' or 'missing').",
+    ("result",),
+)
+
+EVENT_LOOP_LAG = Gauge("budgetbites_event_loop_lag_seconds", "Most recent event loop scheduling lag.")
+EVENT_LOOP_LAG_HIST = Histogram(
+    "budgetbites_event_loop_lag_distribution_seconds",
+    "Distribution of event loop scheduling lag.",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0),
+)
+
+
+def _cache_hit_ratios() -> Dict[Tuple[str, ...], float]:
+    totals: Dict[str, List[float]] = {}
+    for (cache, result), child in list(CACHE_REQUESTS._children.items()):  # pylint: disable=protected-access
+        if result == "bypass":
+            continue
+        hits_total = totals.setdefault(cache, [0.0, 0.0])
+        if result in ("hit", "stale"):
+            hits_total[0] += child.value
+        hits_total[1] += child.value
+    return {(cache,): (hits / total if total else 0.0) for cache, (hits, total) in totals.items()}
+
+
+CACHE_HIT_RATIO = Gauge(
+    "budgetbites_cache_hit_ratio",
+    "Share of cache lookups served from cache (hit or stale) since start.",
+    ("cache",),
+    collect=_cache_hit_ratios,
+)
+
+UPSTREAM_IN_FLIGHT = Gauge(
+    "budgetbites_upstream_in_flight",
+    "Upstream calls currently holding a limiter slot.",
+    ("upstream",),
+    collect=lambda: {(name,): float(lim.in_flight) for name, lim in all_limiters().items()},
+)
+UPSTREAM_QUEUED = Gauge(
+    "budgetbites_upstream_queued",
+    "Callers waiting for an upstream limiter slot.",
+    ("upstream",),
+    collect=lambda: {(name,): float(lim.queued) for name, lim in all_limiters().items()},
+)
+UPSTREAM_LIMIT = Gauge(
+    "budgetbites_upstream_concurrency_limit",
+    "Current adaptive concurrency window per upstream.",
+    ("upstream",),
+    collect=lambda: {(name,): float(int(lim.limit)) for name, lim in all_limiters().items()},
+)
+
+LOG_RECORDS_DROPPED = Gauge(
+    "budgetbites_log_records_dropped",
+    "Log records discarded because the logging queue was full (since start).",
+    collect=lambda: {(): float(dropped_records())},
+)
+
+# Pre-bound children for the hot path
+STAGE_VALIDATE = SEARCH_STAGE_LATENCY.labels("validate")
+STAGE_BUILD_PROMPT = SEARCH_STAGE_LATENCY.labels("build_prompt")
+STAGE_GEMINI = SEARCH_STAGE_LATENCY.labels("gemini")
+STAGE_CITATIONS = SEARCH_STAGE_LATENCY.labels("citations")
+STAGE_JSON_PARSE = SEARCH_STAGE_LATENCY.labels("json_parse")
+STAGE_PROCESS_RESULTS = SEARCH_STAGE_LATENCY.labels("process_results")
+STAGE_ENRICHMENT = SEARCH_STAGE_LATENCY.labels("enrichment")
+STAGE_PLACES_TEXT_SEARCH = SEARCH_STAGE_LATENCY.labels("places_text_search")
+STAGE_PLACES_DETAILS = SEARCH_STAGE_LATENCY.labels("places_details")
+STAGE_SERIALIZATION = SEARCH_STAGE_LATENCY.labels("serialization")
+ZIP_CENTROID_HIT = ZIP_CENTROID_LOOKUPS.labels("hit")
+ZIP_CENTROID_MISSING = ZIP_CENTROID_LOOKUPS.labels("missing")
+
+
+async def monitor_event_loop_lag(interval: float = 0.5) -> None:
+    """Sleep ``interval`` repeatedly and record how late the loop woke us up."""
+    loop = asyncio.get_running_loop()
+    while True:
+        expected = loop.time() + interval
+        await asyncio.sleep(interval)
+        lag = max(0.0, loop.time() - expected)
+        EVENT_LOOP_LAG.set(lag)
+        EVENT_LOOP_LAG_HIST.observe(lag)
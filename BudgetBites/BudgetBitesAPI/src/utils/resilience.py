@@ -0,0 +1,215 @@
+from __future__ import annotations
+
+import asyncio
+import random
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Awaitable, Callable, Iterator, Optional, TypeVar
+
+from .config import get_setting
+from .logger import get_logger
+
+logger = get_logger(__name__)
+
+T = TypeVar("T")
+
+# Absolute (monotonic) deadline of the request currently being served, if any
+_deadline_var: ContextVar[Optional[float]] = ContextVar("request_deadline", default=None)
+# Absolute (monotonic) end of the current retry_async attempt's timeout, if any
+_attempt_deadline_var: ContextVar[Optional[float]] = ContextVar("attempt_deadline", default=None)
+
+
+class DeadlineExceededError(Exception):
+    """The request's total time budget ran out before an upstream call could finish."""
+
+
+@contextmanager
+def deadline_scope(seconds: Optional[float]) -> Iterator[None]:
+    """Bound every upstream call made inside this block by a shared total budget.
+
+    Nested scopes can only tighten the deadline, never extend it.
+    """
+    current = _deadline_var.get()
+    deadline = time.monotonic() + seconds if seconds and seconds > 0 else None
+    if current is not None and (deadline is None or current < deadline):
+        deadline = current
+    token = _deadline_var.set(deadline)
+    try:
+        yield
+    finally:
+        _deadline_var.reset(token)
+
+
+def remaining_time() -> Optional[float]:
+    deadline = _deadline_var.get()
+    return None if deadline is None else deadline - time.monotonic()
+
+
+def deadline_passed() -> bool:
+    """True once the request deadline or the running attempt's timeout has run out.
+
+    Lets code that sees a bare ``CancelledError`` tell a timeout apart from a client disconnect.
+    """
+    now = time.monotonic()
+    return any(d is not None and now >= d for d in (_deadline_var.get(), _attempt_deadline_var.get()))
+
+
+def call_timeout(cap: Optional[float] = None, share: float = 1.0) -> Optional[float]:
+    """Timeout for one sub-call: ``share`` of what is left of the deadline, capped at ``cap``."""
+    remaining = remaining_time()
+    if remaining is None:
+        return cap
+    if remaining <= 0:
+        raise DeadlineExceededError("Request deadline exceeded")
+    budget = remaining * share
+    return budget if cap is None else min(cap, budget)
+
+
+class RetryPolicy:
+    """Exponential backoff with full jitter: attempt ``n`` sleeps ``uniform(0, min(max, base * 2**n))``."""
+
+    def __init__(self, max_retries: int = 2, base_delay: float = 0.25, max_delay: float = 4.0) -> None:
+        self.max_retries = max(0, int(max_retries))
+        self.base_delay = float(base_delay)
+        self.max_delay = float(max_delay)
+
+    @classmethod
+    def from_config(cls) -> "RetryPolicy":
+        return cls(
+            max_retries=int(get_setting("app.max_retries", 2)),
+            base_delay=float(get_setting("resilience.backoff_base_seconds", 0.25)),
+            max_delay=float(get_setting("resilience.backoff_max_seconds", 4)),
+        )
+
+    def backoff(self, attempt: int) -> float:
+        return random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+
+
+async def retry_async(
+    fn: Callable[[], Awaitable[T]],
+    policy: RetryPolicy,
+    is_retryable: Callable[[BaseException], bool],
+    name: str = "upstream",
+    timeout_cap: Optional[float] = None,
+    timeout_share: float = 1.0,
+) -> T:
+    """Call ``fn`` with per-attempt timeouts carved from the request deadline, retrying transient errors.
+
+    Timeouts count as retryable. A retry is skipped when its backoff would not fit in the time
+    left, in which case the last error is raised.
+    """
+    attempt = 0
+    while True:
+        timeout = call_timeout(timeout_cap, timeout_share)
+        try:
+            if timeout is None:
+                return await fn()
+            token = _attempt_deadline_var.set(time.monotonic() + timeout)
+            try:
+                return await asyncio.wait_for(fn(), timeout=timeout)
+            finally:
+                _attempt_deadline_var.reset(token)
+        except asyncio.TimeoutError as exc:
+            error: BaseException = exc
+            retryable = True
+        except Exception as exc:  # pylint: disable=broad-except
+            error = exc
+            retryable = is_retryable(exc)
+        if not retryable or attempt >= policy.max_retries:
+            raise error
+        delay = policy.backoff(attempt)
+        remaining = remaining_time()
+        if remaining is not None and delay >= remaining:
+            raise error
+        attempt += 1
+        logger.warning("Retrying %s call (attempt %d/%d) in %.2fs after: %r", name, attempt, policy.max_retries, delay, error)
+        await asyncio.sleep(delay)
+
+
+async def hedged(fn: Callable[[], Awaitable[T]], delay: float) -> T:
+    """Run ``fn``; if it has not finished after ``delay`` seconds, race a second identical call.
+
+    The first successful result wins and the loser is cancelled. Only use for idempotent reads.
+    """
+    if delay <= 0:
+        return await fn()
+    pending = {asyncio.ensure_future(fn())}
+    error: Optional[BaseException] = None
+    try:
+        done, pending = await asyncio.wait(pending, timeout=delay)
+        if not done:
+            pending.add(asyncio.ensure_future(fn()))
+        while True:
+            for task in done:
+                if task.exception() is None:
+                    return task.result()
+                error = task.exception()
+            if not pending:
+                assert error is not None
+                raise error
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        for task in pending:
+            task.cancel()
+
+
+class CircuitBreaker:
+    """Closed -> open after ``failure_threshold`` consecutive failures; half-open after ``recovery_seconds``.
+
+    While open, ``allow()`` returns False so callers can skip the dependency entirely. In the
+    half-open state a single trial call is let through; its outcome closes or re-opens the breaker.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, name: str, failure_threshold: int = 5, recovery_seconds: float = 30.0) -> None:
+        self.name = name
+        self.failure_threshold = max(1, int(failure_threshold))
+        self.recovery_seconds = float(recovery_seconds)
+        self.failures = 0
+        self._opened_at: Optional[float] = None
+
+    @classmethod
+    def from_config(cls, name: str) -> "CircuitBreaker":
+        prefix = f"resilience.{name}_breaker."
+        return cls(
+            name,
+            failure_threshold=int(get_setting(prefix + "failure_threshold", 5)),
+            recovery_seconds=float(get_setting(prefix + "recovery_seconds", 30)),
+        )
+
+    @property
+    def state(self) -> str:
+        if self._opened_at is None:
+            return self.CLOSED
+        if time.monotonic() - self._opened_at >= self.recovery_seconds:
+            return self.HALF_OPEN
+        return self.OPEN
+
+    @property
+    def is_open(self) -> bool:
+        return self.state == self.OPEN
+
+    def allow(self) -> bool:
+        state = self.state
+        if state == self.HALF_OPEN:
+            # Let this caller through as the trial and hold everyone else off for another window.
+            self._opened_at = time.monotonic()
+            return True
+        return state == self.CLOSED
+
+    def record_success(self) -> None:
+        if self._opened_at is not None:
+            logger.info("Circuit %s closed", self.name)
+        self.failures = 0
+        self._opened_at = None
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        if self._opened_at is not None or self.failures >= self.failure_threshold:
+            if self._opened_at is None:
+                logger.warning("Circuit %s opened after %d failures", self.name, self.failures)
+            self._opened_at = time.monotonic()
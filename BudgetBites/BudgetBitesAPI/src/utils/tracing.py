@@ -0,0 +1,348 @@
+"""Lightweight, OpenTelemetry-compatible tracing.
+
+Spans carry W3C trace context (``traceparent``), nest through a context var and are handed to a
+pluggable exporter when they end. Unsampled requests (and code running outside any request) get
+a shared no-op span, so instrumentation costs a context-var lookup when tracing is off.
+
+Exported spans use OTLP/JSON field names, one span per line for the file exporter. To view a
+trace as a waterfall::
+
+    python -m src.utils.tracing .cache/traces.jsonl [trace_id]
+"""
+
+from __future__ import annotations
+
+import importlib
+import json
+import random
+import re
+import sys
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Any, Deque, Dict, Iterator, List, NamedTuple, Optional
+
+from .config import get_setting
+from .logger import get_logger
+
+logger = get_logger(__name__)
+
+_TRACEPARENT_RE = re.compile(r"^([0-9a-f]{2})-([0-9a-f]{32})-([0-9a-f]{16})-([0-9a-f]{2})$")
+_HEX32_RE = re.compile(r"^[0-9a-f]{32}$")
+_INVALID_TRACE_ID = "0" * 32
+_INVALID_SPAN_ID = "0" * 16
+
+_current_span: ContextVar[Optional["Span"]] = ContextVar("current_span", default=None)
+
+
+class SpanContext(NamedTuple):
+    trace_id: str
+    span_id: str
+    sampled: bool
+
+
+def parse_traceparent(header: Optional[str]) -> Optional[SpanContext]:
+    """Parse a W3C ``traceparent`` header; returns None when absent or malformed."""
+    if not header:
+        return None
+    match = _TRACEPARENT_RE.match(header.strip().lower())
+    if not match:
+        return None
+    version, trace_id, span_id, flags = match.groups()
+    if version == "ff" or trace_id == _INVALID_TRACE_ID or span_id == _INVALID_SPAN_ID:
+        return None
+    return SpanContext(trace_id, span_id, bool(int(flags, 16) & 0x01))
+
+
+def trace_id_from_request_id(request_id: Optional[str]) -> Optional[str]:
+    """Reuse a UUID-style request id (with or without dashes) as the trace id."""
+    if not request_id:
+        return None
+    candidate = request_id.replace("-", "").lower()
+    if _HEX32_RE.match(candidate) and candidate != _INVALID_TRACE_ID:
+        return candidate
+    return None
+
+
+def _new_trace_id() -> str:
+    return f"{random.getrandbits(128):032x}"
+
+
+def _new_span_id() -> str:
+    return f"{random.getrandbits(64) or 1:016x}"
+
+
+class Span:
+    __slots__ = ("name", "trace_id", "span_id", "parent_id", "sampled", "start_ns", "end_ns", "attributes", "status", "status_message")
+
+    def __init__(self, name: str, trace_id: str, parent_id: Optional[str], sampled: bool, attributes: Optional[Dict[str, Any]] = None) -> None:
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = _new_span_id()
+        self.parent_id = parent_id
+        self.sampled = sampled
+        self.start_ns = time.time_ns()
+        self.end_ns: Optional[int] = None
+        self.attributes: Dict[str, Any] = dict(attributes or {})
+        self.status = "UNSET"
+        self.status_message = ""
+
+    @property
+    def traceparent(self) -> str:
+        return f"00-{self.trace_id}-{self.span_id}-{'01' if self.sampled else '00'}"
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    def record_exception(self, exc: BaseException) -> None:
+        self.status = "ERROR"
+        self.status_message = f"{type(exc).__name__}: {exc}"
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "parentSpanId": self.parent_id or "",
+            "name": self.name,
+            "startTimeUnixNano": self.start_ns,
+            "endTimeUnixNano": self.end_ns,
+            "attributes": self.attributes,
+            "status": {"code": self.status, "message": self.status_message},
+        }
+
+
+class _NoopSpan:
+    """Stand-in for spans that will never be exported."""
+
+    sampled = False
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        pass
+
+    def record_exception(self, exc: BaseException) -> None:
+        pass
+
+
+NOOP_SPAN = _NoopSpan()
+
+
+class SpanExporter(ABC):
+    @abstractmethod
+    def export(self, spans: List[Span]) -> None:
+        """Receive finished, sampled spans."""
+
+    def shutdown(self) -> None:
+        pass
+
+
+class NoopSpanExporter(SpanExporter):
+    def export(self, spans: List[Span]) -> None:
+        pass
+
+
+class InMemorySpanExporter(SpanExporter):
+    """Keeps the most recent ``max_spans`` finished spans in process (tests, ad-hoc profiling)."""
+
+    def __init__(self, max_spans: int = 10000) -> None:
+        self._spans: Deque[Span] = deque(maxlen=max_spans)
+
+    def export(self, spans: List[Span]) -> None:
+        self._spans.extend(spans)
+
+    def get_finished_spans(self) -> List[Span]:
+        return list(self._spans)
+
+    def clear(self) -> None:
+        self._spans.clear()
+
+
+class FileSpanExporter(SpanExporter):
+    """Appends spans as JSON lines; writes are buffered and flushed on shutdown."""
+
+    def __init__(self, path: str) -> None:
+        file_path = Path(path)
+        if not file_path.is_absolute():
+            file_path = Path(__file__).resolve().parents[2] / file_path
+        file_path.parent.mkdir(parents=True, exist_ok=True)
+        self.path = file_path
+        self._lock = threading.Lock()
+        self._fh = open(file_path, "a", encoding="utf-8", buffering=64 * 1024)  # pylint: disable=consider-using-with
+
+    def export(self, spans: List[Span]) -> None:
+        lines = "".join(json.dumps(s.to_dict(), ensure_ascii=False, default=str) + "\n" for s in spans)
+        with self._lock:
+            if not self._fh.closed:
+                self._fh.write(lines)
+
+    def shutdown(self) -> None:
+        with self._lock:
+            if not self._fh.closed:
+                self._fh.close()
+
+
+class Tracer:
+    """Creates spans; root sampling is ratio-based on the trace id, children follow their parent."""
+
+    def __init__(self, exporter: Optional[SpanExporter] = None, sample_ratio: float = 1.0, enabled: bool = True) -> None:
+        self.exporter = exporter or NoopSpanExporter()
+        self.sample_ratio = min(1.0, max(0.0, float(sample_ratio)))
+        self.enabled = enabled
+        self._bound = int(self.sample_ratio * (1 << 64))
+
+    @classmethod
+    def from_config(cls) -> "Tracer":
+        return cls(
+            exporter=_exporter_from_config(),
+            sample_ratio=float(get_setting("tracing.sample_ratio", 0.0)),
+            enabled=bool(get_setting("tracing.enabled", True)),
+        )
+
+    def should_sample(self, trace_id: str) -> bool:
+        # Same decision as OpenTelemetry's TraceIdRatioBased sampler (lower 64 bits of the id)
+        return int(trace_id[-16:], 16) < self._bound
+
+    @contextmanager
+    def start_trace(
+        self, name: str, traceparent: Optional[str] = None, trace_id: Optional[str] = None, **attributes: Any
+    ) -> Iterator[Span]:
+        """Open the root span of a request, continuing an incoming ``traceparent`` if there is one."""
+        parent = parse_traceparent(traceparent)
+        if parent is not None:
+            span = Span(name, parent.trace_id, parent.span_id, self.enabled and parent.sampled, attributes)
+        else:
+            trace_id = trace_id or _new_trace_id()
+            span = Span(name, trace_id, None, self.enabled and self.should_sample(trace_id), attributes)
+        with self._activate(span):
+            yield span
+
+    @contextmanager
+    def span(self, name: str, **attributes: Any) -> Iterator[Any]:
+        """Child of the current span; a no-op when there is no sampled trace in progress."""
+        parent = _current_span.get()
+        if parent is None or not parent.sampled:
+            yield NOOP_SPAN
+            return
+        span = Span(name, parent.trace_id, parent.span_id, True, attributes)
+        with self._activate(span):
+            yield span
+
+    @contextmanager
+    def _activate(self, span: Span) -> Iterator[None]:
+        token = _current_span.set(span)
+        try:
+            yield
+        except BaseException as exc:
+            span.record_exception(exc)
+            raise
+        finally:
+            _current_span.reset(token)
+            span.end_ns = time.time_ns()
+            if span.sampled:
+                try:
+                    self.exporter.export([span])
+                except Exception as exc:  # pylint: disable=broad-except
+                    logger.warning("Span export failed: %s", exc)
+
+    def shutdown(self) -> None:
+        self.exporter.shutdown()
+
+
+def _exporter_from_config() -> SpanExporter:
+    kind = str(get_setting("tracing.exporter", "none") or "none")
+    if kind == "none":
+        return NoopSpanExporter()
+    if kind == "memory":
+        return InMemorySpanExporter(int(get_setting("tracing.memory_max_spans", 10000)))
+    if kind == "file":
+        return FileSpanExporter(get_setting("tracing.file_path", ".cache/traces.jsonl"))
+    # Custom exporter given as "package.module:ClassName" (constructed without arguments)
+    module_name, _, class_name = kind.partition(":")
+    try:
+        return getattr(importlib.import_module(module_name), class_name)()
+    except Exception as exc:  # pylint: disable=broad-except
+        logger.error("Could not load span exporter %r: %s; tracing export disabled", kind, exc)
+        return NoopSpanExporter()
+
+
+_TRACER: Optional[Tracer] = None
+
+
+def get_tracer() -> Tracer:
+    global _TRACER
+    if _TRACER is None:
+        _TRACER = Tracer.from_config()
+    return _TRACER
+
+
+def set_tracer(tracer: Optional[Tracer]) -> None:
+    """Replace the process-wide tracer (None re-reads config on next use)."""
+    global _TRACER
+    _TRACER = tracer
+
+
+def current_span() -> Optional[Span]:
+    return _current_span.get()
+
+
+def span(name: str, **attributes: Any):
+    """Shortcut for ``get_tracer().span(...)``."""
+    return get_tracer().span(name, **attributes)
+
+
+def render_waterfall(spans: List[Dict[str, Any]], width: int = 60) -> str:
+    """Render exported span dicts of one trace as an indented text waterfall."""
+    if not spans:
+        return ""
+    start = min(s["startTimeUnixNano"] for s in spans)
+    end = max(s["endTimeUnixNano"] or s["startTimeUnixNano"] for s in spans)
+    total = max(end - start, 1)
+    children: Dict[str, List[Dict[str, Any]]] = {}
+    ids = {s["spanId"] for s in spans}
+    roots = []
+    for s in sorted(spans, key=lambda s: s["startTimeUnixNano"]):
+        if s["parentSpanId"] in ids:
+            children.setdefault(s["parentSpanId"], []).append(s)
+        else:
+            roots.append(s)
+
+    lines: List[str] = []
+
+    def walk(s: Dict[str, Any], depth: int) -> None:
+        s_end = s["endTimeUnixNano"] or s["startTimeUnixNano"]
+        offset = int((s["startTimeUnixNano"] - start) / total * width)
+        length = max(1, int((s_end - s["startTimeUnixNano"]) / total * width))
+        bar = " " * offset + "#" * length
+        label = ("  " * depth + s["name"])[:40]
+        lines.append(f"{label:<40} {bar:<{width}} {(s_end - s['startTimeUnixNano']) / 1e6:9.1f} ms")
+        for child in children.get(s["spanId"], []):
+            walk(child, depth + 1)
+
+    for root in roots:
+        walk(root, 0)
+    return "\n".join(lines)
+
+
+def _main(argv: List[str]) -> int:
+    if not argv:
+        print("usage: python -m src.utils.tracing <traces.jsonl> [trace_id]")
+        return 2
+    traces: Dict[str, List[Dict[str, Any]]] = {}
+    with open(argv[0], encoding="utf-8") as fh:
+        for line in fh:
+            if line.strip():
+                record = json.loads(line)
+                traces.setdefault(record["traceId"], []).append(record)
+    wanted = argv[1:] or list(traces)[-1:]
+    for trace_id in wanted:
+        print(f"trace {trace_id}")
+        print(render_waterfall(traces.get(trace_id, [])))
+        print()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(_main(sys.argv[1:]))
@@ -0,0 +1,214 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Deque, Dict, Optional
+
+import httpx
+
+from .config import get_setting
+from .logger import get_logger
+from .resilience import DeadlineExceededError, deadline_passed
+
+logger = get_logger(__name__)
+
+_LIMITERS: Dict[str, "AdaptiveLimiter"] = {}
+
+
+class UpstreamBusyError(Exception):
+    """Raised when an upstream API's queue is full (or the wait timed out); maps to HTTP 503."""
+
+    def __init__(self, upstream: str, message: str) -> None:
+        super().__init__(message)
+        self.upstream = upstream
+
+
+class TokenBucket:
+    """Classic token bucket: ``rate`` tokens per second, holding at most ``burst`` tokens."""
+
+    def __init__(self, rate: float, burst: float) -> None:
+        self.rate = float(rate)
+        self.capacity = max(1.0, float(burst))
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def reserve(self) -> float:
+        """Take a token and return how long the caller must wait before using it (0 if none)."""
+        if self.rate <= 0:
+            return 0.0
+        self._refill()
+        self._tokens -= 1.0
+        return 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+
+    async def acquire(self) -> None:
+        delay = self.reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+class Permit:
+    """Handed to the caller while it holds a slot; report throttling so the limiter backs off."""
+
+    __slots__ = ("overloaded",)
+
+    def __init__(self) -> None:
+        self.overloaded = False
+
+    def mark_overloaded(self) -> None:
+        self.overloaded = True
+
+
+class AdaptiveLimiter:
+    """Process-wide concurrency window + QPS budget for one upstream API.
+
+    The window follows AIMD: it grows by roughly one slot per window of calls that finish under
+    ``latency_target`` and is multiplied by ``backoff_factor`` when a call is throttled (429) or
+    too slow. Callers beyond the window wait in a FIFO queue; once ``max_queue`` callers are
+    already waiting, new callers fail fast with ``UpstreamBusyError``. All state is touched only
+    from the event loop thread, so no locks are needed.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        qps: float = 0,
+        burst: float = 1,
+        initial_concurrency: int = 8,
+        min_concurrency: int = 1,
+        max_concurrency: int = 64,
+        latency_target: float = 5.0,
+        max_queue: int = 100,
+        queue_timeout: float = 10.0,
+        backoff_factor: float = 0.7,
+    ) -> None:
+        self.name = name
+        self.bucket = TokenBucket(qps, burst)
+        self.min_limit = max(1, int(min_concurrency))
+        self.max_limit = max(self.min_limit, int(max_concurrency))
+        self.limit = float(min(max(initial_concurrency, self.min_limit), self.max_limit))
+        self.latency_target = float(latency_target)
+        self.max_queue = int(max_queue)
+        self.queue_timeout = float(queue_timeout)
+        self.backoff_factor = float(backoff_factor)
+        self.in_flight = 0
+        self._waiters: Deque[asyncio.Future] = deque()
+
+    @classmethod
+    def from_config(cls, name: str) -> "AdaptiveLimiter":
+        prefix = f"upstream_limits.{name}."
+        return cls(
+            name,
+            qps=float(get_setting(prefix + "qps", 0)),
+            burst=float(get_setting(prefix + "burst", 1)),
+            initial_concurrency=int(get_setting(prefix + "initial_concurrency", 8)),
+            min_concurrency=int(get_setting(prefix + "min_concurrency", 1)),
+            max_concurrency=int(get_setting(prefix + "max_concurrency", 64)),
+            latency_target=float(get_setting(prefix + "latency_target_ms", 5000)) / 1000.0,
+            max_queue=int(get_setting(prefix + "max_queue", 100)),
+            queue_timeout=float(get_setting(prefix + "queue_timeout_seconds", 10)),
+            backoff_factor=float(get_setting(prefix + "backoff_factor", 0.7)),
+        )
+
+    @property
+    def queued(self) -> int:
+        return len(self._waiters)
+
+    async def _acquire_slot(self) -> None:
+        if self.in_flight < int(self.limit) and not self._waiters:
+            self.in_flight += 1
+            return
+        if len(self._waiters) >= self.max_queue:
+            raise UpstreamBusyError(self.name, f"{self.name} upstream queue is full ({self.max_queue} waiting)")
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await asyncio.wait_for(waiter, timeout=self.queue_timeout if self.queue_timeout > 0 else None)
+        except asyncio.TimeoutError as exc:
+            raise UpstreamBusyError(self.name, f"Timed out waiting for a {self.name} upstream slot") from exc
+        except BaseException:
+            if waiter.done() and not waiter.cancelled():
+                # We were granted a slot just as we were cancelled; hand it on.
+                self._release_slot()
+            raise
+        finally:
+            try:
+                self._waiters.remove(waiter)
+            except ValueError:
+                pass
+
+    def _release_slot(self) -> None:
+        self.in_flight -= 1
+        self._wake()
+
+    def _wake(self) -> None:
+        while self._waiters and self.in_flight < int(self.limit):
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                self.in_flight += 1
+                waiter.set_result(None)
+
+    def _record(self, latency: float, overloaded: bool) -> None:
+        if overloaded or latency > self.latency_target:
+            new_limit = max(float(self.min_limit), self.limit * self.backoff_factor)
+            if int(new_limit) < int(self.limit):
+                logger.info("Upstream %s window shrunk to %d (latency=%.2fs overloaded=%s)", self.name, int(new_limit), latency, overloaded)
+            self.limit = new_limit
+        else:
+            self.limit = min(float(self.max_limit), self.limit + 1.0 / max(self.limit, 1.0))
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[Permit]:
+        await self._acquire_slot()
+        permit = Permit()
+        started = time.monotonic()
+        ok = False
+        try:
+            await self.bucket.acquire()
+            started = time.monotonic()
+            yield permit
+            ok = True
+        except BaseException as exc:
+            if _is_timeout(exc):
+                # A slow upstream is the strongest overload signal there is
+                permit.mark_overloaded()
+            raise
+        finally:
+            # Failed calls only count as a signal when throttled or timed out.
+            if ok or permit.overloaded:
+                self._record(time.monotonic() - started, permit.overloaded)
+            self._release_slot()
+
+
+def _is_timeout(exc: BaseException) -> bool:
+    """Per-call timeouts, request deadline expiry, or a cancellation caused by either."""
+    if isinstance(exc, (asyncio.TimeoutError, httpx.TimeoutException, DeadlineExceededError)):
+        return True
+    return isinstance(exc, asyncio.CancelledError) and deadline_passed()
+
+
+def get_limiter(name: str) -> AdaptiveLimiter:
+    """Return the process-wide limiter for an upstream (``gemini`` or ``places``)."""
+    limiter = _LIMITERS.get(name)
+    if limiter is None:
+        limiter = AdaptiveLimiter.from_config(name)
+        _LIMITERS[name] = limiter
+    return limiter
+
+
+def all_limiters() -> Dict[str, AdaptiveLimiter]:
+    return dict(_LIMITERS)
+
+
+def reset_limiters() -> None:
+    _LIMITERS.clear()
+
+
+def is_overload_status(status_code: Optional[int]) -> bool:
+    return status_code in (429, 503)
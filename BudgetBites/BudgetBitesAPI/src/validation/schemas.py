@@ -5,8 +5,26 @@ mixing-mode warnings. It supports flexible input for SearchRequest including
 camelCase and common synonyms (city, state, zip, zipcode, postalCode, etc.).
 """
 
-from typing import List, Optional
-from pydantic import BaseModel, Field, field_validator, model_validator
+from typing import Annotated, List, Optional
+from pydantic import BaseModel, ConfigDict, Field, StringConstraints, ValidationError, field_validator, model_validator
+
+# Built once at import; SearchRequest's before-validator only walks these.
+_REQUEST_SYNONYMS = (
+    ("productName", "product_name"),
+    ("cityName", "city_name"),
+    ("stateName", "state_name"),
+    ("zipCode", "zip_code"),
+    ("city", "city_name"),
+    ("state", "state_name"),
+    ("zipcode", "zip_code"),
+    ("zip", "zip_code"),
+    ("postalCode", "zip_code"),
+    ("postal_code", "zip_code"),
+    ("minStoreResults", "min_store_results"),
+    ("radiusMiles", "radius_miles"),
+)
+_REQUEST_FIELDS = ("product_name", "city_name", "state_name", "zip_code", "min_store_results", "radius_miles")
+_NUMERIC_REQUEST_FIELDS = frozenset(("zip_code", "min_store_results", "radius_miles"))
 
 
 class SearchRequest(BaseModel):
@@ -22,27 +40,13 @@ class SearchRequest(BaseModel):
     def normalize_and_validate_location(cls, data):  # type: ignore[override]
         if not isinstance(data, dict):
             return data
-        synonyms = {
-            "productName": "product_name",
-            "cityName": "city_name",
-            "stateName": "state_name",
-            "zipCode": "zip_code",
-            "city": "city_name",
-            "state": "state_name",
-            "zipcode": "zip_code",
-            "zip": "zip_code",
-            "postalCode": "zip_code",
-            "postal_code": "zip_code",
-            "minStoreResults": "min_store_results",
-            "radiusMiles": "radius_miles",
-        }
-        for src, dst in synonyms.items():
+        for src, dst in _REQUEST_SYNONYMS:
             if src in data and dst not in data:
                 data[dst] = data[src]
-        for k in ("product_name", "city_name", "state_name", "zip_code", "min_store_results", "radius_miles"):
+        for k in _REQUEST_FIELDS:
             if k in data:
                 val = data[k]
-                if isinstance(val, (int, float)) and (k == "zip_code" or k == "min_store_results" or k == "radius_miles"):
+                if isinstance(val, (int, float)) and k in _NUMERIC_REQUEST_FIELDS:
                     val = str(int(val))
                 if isinstance(val, str):
                     val = val.strip()
@@ -85,7 +89,10 @@ class StoreDetails(BaseModel):
     store_name: str
     store_address: str
     distance_from_zipcode: str
-    website: str
+    website: Optional[str] = None
+    # From Places enrichment; used to compute distance_from_zipcode locally
+    latitude: Optional[float] = None
+    longitude: Optional[float] = None
 
     @field_validator("store_name", "store_address", "distance_from_zipcode", "website", mode="before")
     def coerce_details_strings(cls, v):  # noqa: N805
@@ -96,12 +103,25 @@ class StoreDetails(BaseModel):
         return v
 
 
+class Citation(BaseModel):
+    """A grounding source Gemini cited for a store item."""
+    index: int  # 1-based grounding chunk number, as in the "[n](uri)" links
+    uri: str
+    title: Optional[str] = None
+
+
 class StoreItem(BaseModel):
     product_name: str
     product_image: Optional[str] = None
     product_price: str
     unit_quantity: str
     store_details: StoreDetails
+    citations: List[Citation] = Field(default_factory=list)
+    # Normalized from product_price/unit_quantity: price per oz, fl oz or each
+    unit_price: Optional[float] = None
+    unit_price_basis: Optional[str] = None
+    # Date the price was observed, when Gemini reports one (used by the "freshness" ranking key)
+    price_as_of: Optional[str] = None
 
     @field_validator("product_price", mode="before")
     def coerce_price_to_string(cls, v):  # noqa: N805
@@ -122,6 +142,60 @@ class Request_Object_Validator(BaseModel):
     message: str
 
 
+class SearchCriteria(BaseModel):
+    """Strict view of a parsed SearchRequest used for business validation.
+
+    pydantic-core compiles the patterns once when the class is created, so validating a request
+    is a single native call. Field order matches the order errors are reported in.
+    """
+
+    model_config = ConfigDict(str_strip_whitespace=True)
+
+    product_name: Annotated[str, StringConstraints(min_length=1, pattern=r"^[a-zA-Z0-9\s]+$")]
+    zip_code: Annotated[str, StringConstraints(min_length=1, pattern=r"^\d{5}(-\d{4})?$")]
+    min_store_results: Annotated[str, StringConstraints(pattern=r"^\d+$")]
+    radius_miles: Annotated[str, StringConstraints(pattern=r"^\d+$")]
+
+
+_CRITERIA_VALIDATOR = SearchCriteria.__pydantic_validator__
+
+# (field reported, message) per SearchCriteria field: [0] when missing/empty, [1] when malformed
+_CRITERIA_MESSAGES = {
+    "product_name": (
+        ("product_name", "Product name is required"),
+        ("product_name", "Product name contains invalid characters; only letters, numbers, and spaces are allowed"),
+    ),
+    "zip_code": (
+        ("location", "Zip code is required"),
+        ("zip_code", "Zip code must be in format 12345 or 12345-6789"),
+    ),
+    "min_store_results": (
+        ("min_store_results", "Minimum store results must be a valid number"),
+        ("min_store_results", "Minimum store results must be a valid number"),
+    ),
+    "radius_miles": (
+        ("radius_miles", "Radius miles must be a valid number"),
+        ("radius_miles", "Radius miles must be a valid number"),
+    ),
+}
+
+
+def validate_search_criteria(req: "SearchRequest") -> Optional[List[Request_Object_Validator]]:
+    """Validate a parsed SearchRequest; returns the field errors or None when valid."""
+    try:
+        # The field dict skips from_attributes lookups; it is not copied or mutated.
+        _CRITERIA_VALIDATOR.validate_python(req.__dict__)
+    except ValidationError as exc:
+        errors = []
+        for error in exc.errors(include_url=False, include_context=False, include_input=False):
+            field = str(error["loc"][0])
+            malformed = error["type"] == "string_pattern_mismatch"
+            name, message = _CRITERIA_MESSAGES[field][1 if malformed else 0]
+            errors.append(Request_Object_Validator(field=name, message=message))
+        return errors
+    return None
+
+
 class ReasonDetails(BaseModel):
     reason_code: str
     reason_status: str
@@ -135,4 +209,33 @@ class SearchResponse(BaseModel):
     stores_list: List[StoreItem]
     status_info: StatusInfo
     prompt_used: Optional[str] = None
-    api_name: Optional[str] = None
\ No newline at end of file
+    api_name: Optional[str] = None
+
+
+class BatchSearchRequest(BaseModel):
+    requests: List[SearchRequest]
+
+    @model_validator(mode="before")
+    def accept_bare_list(cls, data):  # type: ignore[override]
+        # Allow posting a plain JSON array of search requests as well as {"requests": [...]}
+        if isinstance(data, list):
+            return {"requests": data}
+        return data
+
+
+class BatchItemResult(BaseModel):
+    index: int
+    cache: str
+    response: SearchResponse
+
+
+class BatchItemError(BaseModel):
+    index: int
+    status_info: StatusInfo
+
+
+class BatchSearchResponse(BaseModel):
+    results: List[BatchItemResult] = Field(default_factory=list)
+    errors: List[BatchItemError] = Field(default_factory=list)
+    status_info: StatusInfo
+    api_name: Optional[str] = None
@@ -0,0 +1,72 @@
+import asyncio
+
+import pytest
+import yaml
+
+from src.utils import config
+from src.utils.config_watch import watch_config
+
+
+@pytest.fixture
+def config_file(tmp_path):
+    original = config.settings()
+    path = tmp_path / "default.yaml"
+    data = original.to_dict()
+    path.write_text(yaml.safe_dump(data), encoding="utf-8")
+    yield path, data
+    config.set_settings(original)
+
+
+def test_snapshot_is_flat_and_read_only():
+    snapshot = config.Settings({"app": {"port": 8080, "tags": ["a"]}})
+    assert snapshot.get("app.port") == 8080
+    assert snapshot.app.port == 8080
+    assert snapshot.get("app.tags") == ("a",)
+    assert snapshot.get("app.missing", "x") == "x"
+    with pytest.raises(AttributeError):
+        snapshot.app.port = 1
+    with pytest.raises(TypeError):
+        snapshot.app["port"] = 1  # type: ignore[index]
+
+
+def test_reload_publishes_new_snapshot_and_notifies(config_file):
+    path, data = config_file
+    seen = []
+    config.add_reload_listener(seen.append)
+    try:
+        data["app"]["api_name"] = "Reloaded"
+        path.write_text(yaml.safe_dump(data), encoding="utf-8")
+        snapshot, problems = config.reload_config(path)
+    finally:
+        config.remove_reload_listener(seen.append)
+    assert problems == []
+    assert seen == [snapshot]
+    assert config.get_setting("app.api_name") == "Reloaded"
+
+
+def test_invalid_reload_keeps_current_snapshot(config_file):
+    path, data = config_file
+    before = config.settings()
+    data["batch"]["max_items"] = 0
+    path.write_text(yaml.safe_dump(data), encoding="utf-8")
+    snapshot, problems = config.reload_config(path)
+    assert snapshot is None
+    assert problems and problems[0].startswith("batch.max_items")
+    assert config.settings() is before
+
+
+@pytest.mark.asyncio
+async def test_watcher_reloads_on_file_change(config_file):
+    path, data = config_file
+    watcher = asyncio.create_task(watch_config(0.01, path))
+    try:
+        await asyncio.sleep(0.03)
+        data["app"]["api_name"] = "Watched"
+        path.write_text(yaml.safe_dump(data) + "\n", encoding="utf-8")
+        for _ in range(100):
+            if config.get_setting("app.api_name") == "Watched":
+                break
+            await asyncio.sleep(0.01)
+    finally:
+        watcher.cancel()
+    assert config.get_setting("app.api_name") == "Watched"
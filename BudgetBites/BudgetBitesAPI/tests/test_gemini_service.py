@@ -0,0 +1,100 @@
+import asyncio
+import time
+from types import SimpleNamespace
+
+import pytest
+from src.services import gemini_service
+from src.services.gemini_service import GeminiService
+
+CALL_SECONDS = 0.2
+
+
+class _FakeAsyncModels:
+    async def generate_content(self, model, contents, config):
+        await asyncio.sleep(CALL_SECONDS)
+        return SimpleNamespace(text='```json\n[{"store_name": "Test Mart"}]\n```', candidates=[])
+
+
+class _FakeClient:
+    def __init__(self, *args, **kwargs):
+        self.aio = SimpleNamespace(models=_FakeAsyncModels())
+
+
+@pytest.mark.asyncio
+async def test_concurrent_calls_do_not_block_event_loop(monkeypatch):
+    monkeypatch.setattr(gemini_service.genai, "Client", _FakeClient)
+    service = GeminiService()
+    service.api_key = "test-key"
+
+    started = time.perf_counter()
+    results = await asyncio.gather(*(service.generate_store_list("milk") for _ in range(5)))
+    elapsed = time.perf_counter() - started
+
+    assert all(r == [{"store_name": "Test Mart"}] for r in results)
+    # Five overlapping calls should take roughly as long as one, not five.
+    assert elapsed < CALL_SECONDS * 3
+
+
+def _grounded_response(text, supports):
+    chunks = [SimpleNamespace(web=SimpleNamespace(uri=f"https://src/{i}", title=f"src{i}")) for i in range(3)]
+    metadata = SimpleNamespace(
+        grounding_supports=[
+            SimpleNamespace(segment=SimpleNamespace(end_index=end), grounding_chunk_indices=indices)
+            for end, indices in supports
+        ],
+        grounding_chunks=chunks,
+    )
+    return SimpleNamespace(text=text, candidates=[SimpleNamespace(grounding_metadata=metadata)])
+
+
+def test_attach_citations_uses_utf8_byte_offsets():
+    # 20 two-byte characters: read as character offsets, the segment would land in the second store
+    text = '[{"store_name": "C' + "é" * 20 + '", "price": "$1"}, {"store_name": "B", "price": "$2"}]'
+    first_price_end = len(text[: text.index('"$1"') + 4].encode("utf-8"))
+    resp = _grounded_response(text, [(first_price_end, [0])])
+    service = GeminiService.__new__(GeminiService)
+    items = service._parse_important_nodes(text)
+    service._attach_citations(resp, items)
+    assert items[0]["citations"] == [{"index": 1, "uri": "https://src/0", "title": "src0"}]
+    assert "citations" not in items[1]
+
+
+def test_citations_are_attached_to_the_store_they_ground():
+    text = '```json\n[{"store_name": "Crème Mart", "price": "$1"}, {"store_name": "B", "price": "$2"}]\n```'
+    second_price_end = len(text[: text.index('"$2"') + 4].encode("utf-8"))
+    resp = _grounded_response(text, [(second_price_end, [1]), (3, [0])])
+    service = GeminiService.__new__(GeminiService)
+    items = service._parse_important_nodes(text)
+    service._attach_citations(resp, items)
+    assert "citations" not in items[0]
+    assert items[1]["citations"] == [{"index": 2, "uri": "https://src/1", "title": "src1"}]
+
+
+class _FakeStreamingModels:
+    def __init__(self, chunks):
+        self.chunks = chunks
+
+    async def generate_content_stream(self, model, contents, config):
+        async def stream():
+            for chunk in self.chunks:
+                yield chunk
+        return stream()
+
+
+@pytest.mark.asyncio
+async def test_stream_store_items_attaches_citations_after_the_stream(monkeypatch):
+    text = '[{"store_name": "Crème Mart", "price": "$1"}, {"store_name": "B", "price": "$2"}]'
+    second_price_end = len(text[: text.index('"$2"') + 4].encode("utf-8"))
+    split = text.index("}, {") + 2
+    grounded = _grounded_response("", [(second_price_end, [1])])
+    chunks = [SimpleNamespace(text=text[:split], candidates=[]), SimpleNamespace(text=text[split:], candidates=grounded.candidates)]
+    monkeypatch.setattr(
+        gemini_service.genai, "Client", lambda *a, **k: SimpleNamespace(aio=SimpleNamespace(models=_FakeStreamingModels(chunks)))
+    )
+    service = GeminiService()
+    service.api_key = "test-key"
+
+    items = [item async for item in service.stream_store_items("milk")]
+
+    assert "citations" not in items[0]
+    assert items[1]["citations"] == [{"index": 2, "uri": "https://src/1", "title": "src1"}]
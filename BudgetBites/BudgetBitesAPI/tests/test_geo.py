@@ -0,0 +1,92 @@
+import pytest
+
+from src.cache.search_cache import SearchCache
+from src.cache.store_index import NearbyStoreIndex
+from src.services.search_service import SearchService
+from src.utils import geo
+from src.utils.geo import GeoGrid, ZipCentroids, haversine_many, haversine_miles
+from src.utils.metrics import REGISTRY, ZIP_CENTROID_HIT, ZIP_CENTROID_MISSING
+from src.validation.schemas import SearchRequest, StoreDetails, StoreItem
+
+SEATTLE = (47.6101, -122.3344)
+PORTLAND = (45.5075, -122.6900)
+
+
+def test_haversine_scalar_and_batch_agree():
+    assert haversine_miles(*SEATTLE, *PORTLAND) == pytest.approx(146.3, abs=0.5)
+    lats, lngs = [SEATTLE[0], PORTLAND[0]] * 20, [SEATTLE[1], PORTLAND[1]] * 20
+    distances = haversine_many(*SEATTLE, lats, lngs)
+    assert distances[0] == pytest.approx(0.0, abs=1e-9)
+    assert distances[1] == pytest.approx(haversine_miles(*SEATTLE, *PORTLAND))
+
+
+def test_grid_returns_points_within_radius_nearest_first():
+    grid = GeoGrid(0.1)
+    grid.add("downtown", 47.6062, -122.3321)
+    grid.add("bellevue", 47.6101, -122.2015)
+    grid.add("portland", *PORTLAND)
+    hits = grid.within(*SEATTLE, 10)
+    assert [key for key, _ in hits] == ["downtown", "bellevue"]
+    grid.remove("downtown")
+    assert [key for key, _ in grid.within(*SEATTLE, 10)] == ["bellevue"]
+
+
+def test_zip_centroids_read_census_gazetteer_format(tmp_path):
+    path = tmp_path / "gaz.txt"
+    path.write_text("GEOID\tALAND\tAWATER\tINTPTLAT\tINTPTLONG   \n02108\t1\t0\t42.357603\t-71.067432\n", encoding="utf-8")
+    centroids = ZipCentroids(str(path))
+    assert centroids.get("02108-1234") == (42.357603, -71.067432)
+    assert centroids.get("99999") is None
+
+
+class CountingGemini:
+    def __init__(self):
+        self.calls = 0
+
+    async def generate_store_list(self, prompt):
+        self.calls += 1
+        return []
+
+
+def _located_store(name, lat, lng):
+    details = StoreDetails(store_name=name, store_address=f"{name} St", distance_from_zipcode="", latitude=lat, longitude=lng)
+    return StoreItem(product_name="milk", product_price="$3.00", unit_quantity="1 gal", store_details=details)
+
+
+@pytest.mark.asyncio
+async def test_nearby_known_stores_answer_without_gemini(monkeypatch):
+    service = SearchService(gemini=CountingGemini(), cache=SearchCache(), store_index=NearbyStoreIndex())
+    monkeypatch.setattr(service, "_validate_configuration", lambda: None)
+    req = SearchRequest.model_validate({"product_name": "milk", "zip_code": "98101", "min_store_results": "2", "radius_miles": "5"})
+    stores = [_located_store("Near", 47.6150, -122.3400), _located_store("Also Near", 47.6300, -122.3200), _located_store("Far", *PORTLAND)]
+
+    kept = service._apply_geo(stores, req)
+    assert [s.store_details.store_name for s in kept] == ["Near", "Also Near"]
+    assert kept[0].store_details.distance_from_zipcode.endswith(" mi")
+
+    # 98109 is about a mile away: the two indexed stores are within its 5 mile radius
+    neighbor = req.model_copy(update={"zip_code": "98109"})
+    response = await service.search(neighbor)
+    assert service.gemini.calls == 0
+    assert {s.store_details.store_name for s in response.stores_list} == {"Near", "Also Near"}
+
+
+def test_seed_sized_centroid_file_logs_a_warning(tmp_path, monkeypatch):
+    path = tmp_path / "seed.csv"
+    path.write_text("zip,lat,lng\n98101,47.6101,-122.3344\n", encoding="utf-8")
+    warnings = []
+    monkeypatch.setattr(geo.logger, "warning", lambda msg, *args: warnings.append(msg % args))
+    assert len(ZipCentroids(str(path))) == 1
+    assert len(warnings) == 1 and "Loaded only 1 ZIP centroids" in warnings[0]
+
+
+@pytest.mark.asyncio
+async def test_searches_for_zips_without_a_centroid_are_counted(monkeypatch):
+    service = SearchService(gemini=CountingGemini(), cache=SearchCache(), store_index=NearbyStoreIndex())
+    monkeypatch.setattr(service, "_validate_configuration", lambda: None)
+    hits, missing = ZIP_CENTROID_HIT.value, ZIP_CENTROID_MISSING.value
+    req = SearchRequest.model_validate({"product_name": "milk", "zip_code": "98101", "min_store_results": "2", "radius_miles": "5"})
+    await service.search(req)
+    await service.search(req.model_copy(update={"zip_code": "99999"}))
+    assert (ZIP_CENTROID_HIT.value - hits, ZIP_CENTROID_MISSING.value - missing) == (1, 1)
+    assert 'budgetbites_zip_centroid_lookups_total{result="missing"}' in REGISTRY.render()
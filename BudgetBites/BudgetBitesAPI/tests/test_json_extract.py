@@ -0,0 +1,38 @@
+import time
+
+import pytest
+from src.utils.json_stream import JsonExtractionError, extract_json
+
+CITE = "[1](https://vertexaisearch.cloud.google.com/a), [2](https://vertexaisearch.cloud.google.com/b)"
+
+
+def test_fenced_json_after_prose_with_citations():
+    text = f"Here are stores near you {CITE}.\n```json\n[{{\"store_name\": \"A\", \"price\": \"$3.99\"{CITE}}}]\n```"
+    assert extract_json(text) == [{"store_name": "A", "price": "$3.99"}]
+
+
+def test_repairs_trailing_commas_and_loose_keys():
+    text = "[{store_name: 'Trader Joe\\'s', 'price': \"$2\", \"open\": True,}, {\"store_name\": \"B\",},]"
+    assert extract_json(text) == [{"store_name": "Trader Joe's", "price": "$2", "open": True}, {"store_name": "B"}]
+
+
+def test_truncated_array_keeps_complete_items():
+    assert extract_json('```json\n[{"store_name": "A"}, {"store_name": "B", "pri') == [{"store_name": "A"}]
+
+
+def test_no_json_raises():
+    with pytest.raises(JsonExtractionError):
+        extract_json("Sorry, I could not find any stores [1](https://x).")
+
+
+def test_malformed_element_keeps_the_other_elements():
+    assert extract_json('[{"a":1},{"b": tru e},{"c":3}]') == [{"a": 1}, {"c": 3}]
+
+
+def test_truncated_unrepairable_array_fails_in_linear_time():
+    text = "[" + '{"a":1,' * 20000
+    start = time.perf_counter()
+    with pytest.raises(JsonExtractionError):
+        extract_json(text)
+    # Restarting at every "{" inside the array took seconds at this size
+    assert time.perf_counter() - start < 0.5
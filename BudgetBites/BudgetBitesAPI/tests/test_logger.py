@@ -0,0 +1,44 @@
+import logging
+import queue
+import sys
+
+from src.utils.logger import BoundedQueueHandler, JsonFormatter, get_logger
+
+
+def _record(msg, *args, exc_info=None):
+    return logging.LogRecord("test", logging.INFO, __file__, 1, msg, args, exc_info)
+
+
+def test_get_logger_respects_name_and_level():
+    places = get_logger("src.services.places_service")
+    search = get_logger("src.services.search_service")
+    assert places is not search
+    assert places.name.endswith("src.services.places_service")
+    places.setLevel(logging.DEBUG)
+    try:
+        assert places.isEnabledFor(logging.DEBUG)
+        assert not search.isEnabledFor(logging.DEBUG)
+    finally:
+        places.setLevel(logging.NOTSET)
+
+
+def test_queue_handler_drops_instead_of_blocking():
+    handler = BoundedQueueHandler(queue.Queue(maxsize=2), overflow="drop_new")
+    for i in range(4):
+        handler.emit(_record("msg %d", i))
+    assert handler.dropped == 2
+    assert [handler.queue.get_nowait().msg for _ in range(2)] == ["msg 0", "msg 1"]
+
+    handler = BoundedQueueHandler(queue.Queue(maxsize=2), overflow="drop_oldest")
+    for i in range(4):
+        handler.emit(_record("msg %d", i))
+    assert [handler.queue.get_nowait().msg for _ in range(2)] == ["msg 2", "msg 3"]
+
+
+def test_prepared_record_keeps_traceback_for_json_output():
+    try:
+        raise ValueError("bad")
+    except ValueError:
+        prepared = BoundedQueueHandler(queue.Queue()).prepare(_record("failed", exc_info=sys.exc_info()))
+    assert prepared.exc_info is None
+    assert "ValueError: bad" in JsonFormatter().format(prepared)
@@ -0,0 +1,32 @@
+import pytest
+import httpx
+from httpx import ASGITransport
+from src.server.app import app
+from src.utils.metrics import Counter, Histogram, Registry
+
+
+def test_histogram_renders_cumulative_buckets():
+    registry = Registry()
+    hist = Histogram("test_latency_seconds", "Test latency.", ("stage",), buckets=(0.1, 1.0), registry=registry)
+    counter = Counter("test_calls_total", "Test calls.", ("status",), registry=registry)
+    child = hist.labels("gemini")
+    for value in (0.05, 0.5, 5.0):
+        child.observe(value)
+    counter.labels("429").inc()
+    text = registry.render()
+    assert 'test_latency_seconds_bucket{stage="gemini",le="0.1"} 1' in text
+    assert 'test_latency_seconds_bucket{stage="gemini",le="1"} 2' in text
+    assert 'test_latency_seconds_bucket{stage="gemini",le="+Inf"} 3' in text
+    assert 'test_latency_seconds_count{stage="gemini"} 3' in text
+    assert 'test_calls_total{status="429"} 1' in text
+
+
+@pytest.mark.asyncio
+async def test_metrics_endpoint_exposes_request_metrics():
+    async with httpx.AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        await client.get("/health")
+        r = await client.get("/metrics")
+    assert r.status_code == 200
+    assert r.headers["content-type"].startswith("text/plain")
+    assert 'budgetbites_http_requests_total{method="GET",route="/health",status="200"}' in r.text
+    assert "# TYPE budgetbites_search_stage_duration_seconds histogram" in r.text
@@ -0,0 +1,44 @@
+import pytest
+import httpx
+from fastapi import FastAPI
+from fastapi.responses import StreamingResponse
+from httpx import ASGITransport
+from src.middleware.error_handler import ErrorHandlingMiddleware
+from src.middleware.request_id import RequestIDMiddleware
+
+
+def _app():
+    app = FastAPI()
+    app.add_middleware(RequestIDMiddleware)
+    app.add_middleware(ErrorHandlingMiddleware)
+
+    @app.get("/boom")
+    async def boom():
+        raise RuntimeError("boom")
+
+    @app.get("/stream")
+    async def stream():
+        async def chunks():
+            for i in range(3):
+                yield f"{i}\n"
+        return StreamingResponse(chunks(), media_type="text/plain")
+
+    return app
+
+
+@pytest.mark.asyncio
+async def test_unhandled_error_returns_structured_500():
+    async with httpx.AsyncClient(transport=ASGITransport(app=_app(), raise_app_exceptions=False), base_url="http://test") as client:
+        r = await client.get("/boom")
+    assert r.status_code == 500
+    body = r.json()
+    assert body["stores_list"] == []
+    assert body["status_info"]["reason_details"][0]["reason_code"] == "INTERNAL_ERROR"
+
+
+@pytest.mark.asyncio
+async def test_request_id_header_is_added_to_streamed_responses():
+    async with httpx.AsyncClient(transport=ASGITransport(app=_app()), base_url="http://test") as client:
+        r = await client.get("/stream", headers={"X-Request-ID": "abc"})
+    assert r.text == "0\n1\n2\n"
+    assert r.headers["X-Request-ID"] == "abc"
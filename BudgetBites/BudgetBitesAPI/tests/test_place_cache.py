@@ -0,0 +1,28 @@
+import pytest
+from src.cache.place_cache import PlaceCache, PlaceRecord
+
+
+@pytest.mark.asyncio
+async def test_round_trip_persists_across_instances(tmp_path):
+    path = str(tmp_path / "places.sqlite3")
+    cache = PlaceCache(path)
+    record = PlaceRecord("abc", "1 Main St, Dallas, TX 75001", "https://walmart.example")
+    await cache.set("Walmart  75001", record)
+    cache.close()
+
+    reopened = PlaceCache(path)
+    assert await reopened.get("walmart 75001") == (True, record)
+    reopened.close()
+
+
+@pytest.mark.asyncio
+async def test_negative_results_and_expiry(tmp_path):
+    cache = PlaceCache(str(tmp_path / "places.sqlite3"))
+    await cache.set("Unknown Store 75001", None)
+    assert await cache.get("Unknown Store 75001") == (True, None)
+
+    cache.negative_ttl = -1
+    await cache.set("Unknown Store 75001", None)
+    assert await cache.get("Unknown Store 75001") == (False, None)
+    assert await cache.get("never seen") == (False, None)
+    cache.close()
@@ -0,0 +1,69 @@
+import pytest
+
+from src.services.pricing import parse_distance, parse_price, rank_stores
+from src.validation.schemas import StoreDetails, StoreItem
+
+
+@pytest.mark.parametrize(
+    "price, unit, expected",
+    [
+        ("$3.99/lb", "", (3.99, 3.99 / 16, "oz")),
+        ("2 for $5", "16 oz", (2.5, 2.5 / 16, "oz")),
+        ("$0.12/oz", None, (0.12, 0.12, "oz")),
+        ("$2.99", "12 ct", (2.99, 2.99 / 12, "each")),
+        ("99¢", "each", (0.99, 0.99, "each")),
+        ("$5.99", "6 x 12 fl oz", (5.99, 5.99 / 72, "fl oz")),
+        ("$3.49", "half gallon", (3.49, 3.49 / 64, "fl oz")),
+        ("$1,299.00", "", (1299.0, None, None)),
+        ("N/A", "1 lb", (None, None, None)),
+    ],
+)
+def test_parse_price(price, unit, expected):
+    quote = parse_price(price, unit)
+    assert quote.price == pytest.approx(expected[0]) if expected[0] is not None else quote.price is None
+    assert quote.unit_price == pytest.approx(expected[1]) if expected[1] is not None else quote.unit_price is None
+    assert quote.basis == expected[2]
+
+
+def test_parse_distance_converts_to_miles():
+    assert parse_distance("1.2 mi") == pytest.approx(1.2)
+    assert parse_distance("800 m") == pytest.approx(0.497, abs=1e-3)
+    assert parse_distance("nearby") is None
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        ("2.3 miles", 2.3),
+        ("3", 3.0),
+        ("5 min", None),
+        ("10 minutes away", None),
+        ("about 1 hr", None),
+        ("5 min drive (2.3 mi)", 2.3),
+    ],
+)
+def test_parse_distance_ignores_drive_times(text, expected):
+    result = parse_distance(text)
+    assert result == pytest.approx(expected) if expected is not None else result is None
+
+
+def _store(name, price, unit, distance="", as_of=None):
+    details = StoreDetails(store_name=name, store_address="", distance_from_zipcode=distance)
+    return StoreItem(product_name="x", product_price=price, unit_quantity=unit, store_details=details, price_as_of=as_of)
+
+
+def test_rank_by_unit_price_then_distance():
+    stores = [
+        _store("bulk", "$9.99", "5 lb", "4 mi"),
+        _store("per-lb", "$3.99/lb", "", "1 mi"),
+        _store("deal", "2 for $5", "16 oz", "2 mi"),
+        _store("unknown", "call store", "", "0.5 mi"),
+        _store("near-bulk", "$9.99", "5 lb", "2 mi"),
+    ]
+    ranked = [s.store_details.store_name for s in rank_stores(stores, ("unit_price", "distance"))]
+    assert ranked == ["near-bulk", "bulk", "deal", "per-lb", "unknown"]
+
+
+def test_rank_by_freshness():
+    stores = [_store("old", "$1", "1 ea", as_of="2025-01-01"), _store("new", "$1", "1 ea", as_of="2025-06-01"), _store("none", "$1", "1 ea")]
+    assert [s.store_details.store_name for s in rank_stores(stores, ("freshness",))] == ["new", "old", "none"]
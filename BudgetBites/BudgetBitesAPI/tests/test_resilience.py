@@ -0,0 +1,74 @@
+import asyncio
+
+import pytest
+from src.utils.resilience import (
+    CircuitBreaker,
+    DeadlineExceededError,
+    RetryPolicy,
+    deadline_scope,
+    hedged,
+    retry_async,
+)
+
+
+class Flaky:
+    def __init__(self, failures, delay=0.0):
+        self.failures = failures
+        self.delay = delay
+        self.calls = 0
+
+    async def __call__(self):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        if self.calls <= self.failures:
+            raise ConnectionError("transient")
+        return self.calls
+
+
+@pytest.mark.asyncio
+async def test_retry_recovers_from_transient_errors():
+    call = Flaky(failures=2)
+    policy = RetryPolicy(max_retries=2, base_delay=0.001, max_delay=0.002)
+    assert await retry_async(call, policy, lambda e: isinstance(e, ConnectionError)) == 3
+
+
+@pytest.mark.asyncio
+async def test_non_retryable_error_is_raised_immediately():
+    call = Flaky(failures=5)
+    with pytest.raises(ConnectionError):
+        await retry_async(call, RetryPolicy(max_retries=3, base_delay=0.001), lambda e: False)
+    assert call.calls == 1
+
+
+@pytest.mark.asyncio
+async def test_deadline_bounds_attempts():
+    call = Flaky(failures=0, delay=1.0)
+    with deadline_scope(0.05):
+        with pytest.raises((asyncio.TimeoutError, DeadlineExceededError)):
+            await retry_async(call, RetryPolicy(max_retries=5, base_delay=0.001), lambda e: True)
+
+
+@pytest.mark.asyncio
+async def test_hedged_call_wins_the_tail():
+    delays = iter([1.0, 0.01])
+
+    async def call():
+        delay = next(delays)
+        await asyncio.sleep(delay)
+        return delay
+
+    assert await asyncio.wait_for(hedged(call, 0.02), timeout=0.5) == 0.01
+
+
+def test_circuit_breaker_opens_and_half_opens():
+    breaker = CircuitBreaker("test", failure_threshold=2, recovery_seconds=0)
+    breaker.recovery_seconds = 60
+    breaker.record_failure()
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.is_open and not breaker.allow()
+
+    breaker.recovery_seconds = 0
+    assert breaker.allow()  # half-open trial
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
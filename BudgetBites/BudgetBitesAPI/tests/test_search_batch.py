@@ -0,0 +1,54 @@
+import pytest
+from src.cache.search_cache import SearchCache
+from src.services.search_service import SearchService
+from src.validation.schemas import BatchSearchRequest
+
+
+class FakeGemini:
+    def __init__(self):
+        self.prompts = []
+
+    async def generate_store_list(self, prompt):
+        self.prompts.append(prompt)
+        return [
+            {"product_name": "Whole Milk", "store_name": "Mart A", "price": "$3.00", "unit_quantity": "1 gal", "website_link": "https://a.example"},
+            {"product_name": "Large Eggs", "store_name": "Mart B", "price": "$2.50", "unit_quantity": "12 ct", "website_link": "https://b.example"},
+            {"product_name": "Milk", "store_name": "Mart C", "price": "$2.00", "unit_quantity": "1 gal", "website_link": "https://c.example"},
+        ]
+
+
+@pytest.fixture
+def service(monkeypatch):
+    svc = SearchService(gemini=FakeGemini(), cache=SearchCache())
+    svc.places_enabled = False
+    monkeypatch.setattr(svc, "_validate_configuration", lambda: None)
+    return svc
+
+
+def _item(product, zip_code="98101"):
+    return {"product_name": product, "zip_code": zip_code, "min_store_results": "5", "radius_miles": "10"}
+
+
+@pytest.mark.asyncio
+async def test_products_at_same_zip_share_one_prompt(service):
+    batch = BatchSearchRequest.model_validate({"requests": [_item("milk"), _item("eggs"), _item("bad!")]})
+    result = await service.search_batch(batch)
+
+    assert len(service.gemini.prompts) == 1
+    assert "milk, eggs" in service.gemini.prompts[0]
+    by_index = {r.index: r.response for r in result.results}
+    assert [s.store_details.store_name for s in by_index[0].stores_list] == ["Mart C", "Mart A"]
+    assert [s.store_details.store_name for s in by_index[1].stores_list] == ["Mart B"]
+    assert [e.index for e in result.errors] == [2]
+    assert result.status_info.reason_details[0].reason_code == "PARTIAL_SUCCESS"
+
+
+@pytest.mark.asyncio
+async def test_batch_results_feed_the_search_cache(service):
+    batch = BatchSearchRequest.model_validate([_item("milk", "98101"), _item("milk", "10001")])
+    first = await service.search_batch(batch)
+    second = await service.search_batch(batch)
+
+    assert len(service.gemini.prompts) == 2
+    assert [r.cache for r in first.results] == ["MISS", "MISS"]
+    assert [r.cache for r in second.results] == ["HIT", "HIT"]
@@ -0,0 +1,81 @@
+import asyncio
+
+import pytest
+from src.cache.backends import InMemoryCacheBackend
+from src.cache.search_cache import CACHE_HIT, CACHE_MISS, CACHE_STALE, SearchCache, search_cache_key
+from src.validation.schemas import SearchRequest, SearchResponse, StatusInfo, StoreDetails, StoreItem
+
+
+def _request(**overrides):
+    data = {"product_name": "milk", "zip_code": "98101", "min_store_results": "5", "radius_miles": "10"}
+    data.update(overrides)
+    return SearchRequest.model_validate(data)
+
+
+def _response(name="Test Mart"):
+    details = StoreDetails(store_name=name, store_address="1 Main St", distance_from_zipcode="1 mi", website="")
+    item = StoreItem(product_name="milk", product_price="$1.00", unit_quantity="1 gal", store_details=details)
+    return SearchResponse(stores_list=[item], status_info=StatusInfo(http_code=200, reason_details=[]))
+
+
+class CountingLoader:
+    def __init__(self, response=None):
+        self.calls = 0
+        self.response = response or _response()
+
+    async def __call__(self):
+        self.calls += 1
+        return self.response
+
+
+def test_key_is_normalized():
+    assert search_cache_key(_request(product_name="  Whole   MILK ")) == search_cache_key(_request(product_name="whole milk"))
+    assert search_cache_key(_request(radius_miles="5")) != search_cache_key(_request(radius_miles="10"))
+
+
+@pytest.mark.asyncio
+async def test_miss_then_hit():
+    cache = SearchCache()
+    loader = CountingLoader()
+    _, first = await cache.get_or_load(_request(), loader)
+    _, second = await cache.get_or_load(_request(product_name="MILK"), loader)
+    assert (first, second) == (CACHE_MISS, CACHE_HIT)
+    assert loader.calls == 1
+
+
+@pytest.mark.asyncio
+async def test_failed_responses_are_not_cached():
+    cache = SearchCache()
+    loader = CountingLoader(SearchResponse(stores_list=[], status_info=StatusInfo(http_code=502, reason_details=[])))
+    await cache.get_or_load(_request(), loader)
+    _, status = await cache.get_or_load(_request(), loader)
+    assert status == CACHE_MISS
+    assert loader.calls == 2
+
+
+@pytest.mark.asyncio
+async def test_lru_eviction():
+    cache = SearchCache(backend=InMemoryCacheBackend(max_entries=2))
+    loader = CountingLoader()
+    for product in ("milk", "eggs", "bread"):
+        await cache.get_or_load(_request(product_name=product), loader)
+    _, status = await cache.get_or_load(_request(product_name="milk"), loader)
+    assert status == CACHE_MISS
+    assert len(cache.backend) == 2
+
+
+@pytest.mark.asyncio
+async def test_stale_entry_served_while_refreshing():
+    cache = SearchCache()
+    cache.ttl = 0
+    loader = CountingLoader()
+    await cache.get_or_load(_request(), loader)
+    loader.response = _response("Fresh Mart")
+    stale, status = await cache.get_or_load(_request(), loader)
+    assert status == CACHE_STALE
+    assert stale.stores_list[0].store_details.store_name == "Test Mart"
+    await asyncio.sleep(0)
+    await asyncio.sleep(0)
+    assert loader.calls == 2
+    entry = await cache.backend.get(search_cache_key(_request()))
+    assert entry.value.stores_list[0].store_details.store_name == "Fresh Mart"
@@ -0,0 +1,42 @@
+import pytest
+import httpx
+from httpx import ASGITransport
+from src.server.app import app
+from src.routes.search_route import get_service
+from src.validation.schemas import SearchResponse, StatusInfo
+
+
+class StubSearchService:
+    def __init__(self):
+        self.calls = []
+
+    async def search(self, req):
+        self.calls.append(req)
+        return SearchResponse(stores_list=[], status_info=StatusInfo(http_code=200, reason_details=[]))
+
+    async def search_cached(self, req):
+        return await self.search(req), "MISS"
+
+
+@pytest.fixture
+def stub_service():
+    stub = StubSearchService()
+    app.dependency_overrides[get_service] = lambda: stub
+    yield stub
+    app.dependency_overrides.clear()
+
+
+@pytest.mark.asyncio
+async def test_search_uses_injected_service(stub_service):
+    async with httpx.AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        r = await client.post("/api/v1/search", json={"productName": "milk", "zip": 98101})
+        assert r.status_code == 200
+        assert r.headers["X-Cache"] == "MISS"
+        assert r.json()["status_info"]["http_code"] == 200
+    assert len(stub_service.calls) == 1
+    assert stub_service.calls[0].zip_code == "98101"
+
+
+def test_search_service_is_app_singleton():
+    assert app.state.search_service is app.state.search_service
+    assert app.state.search_service.http_pool is app.state.http_pool
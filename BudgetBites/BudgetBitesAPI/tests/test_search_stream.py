@@ -0,0 +1,79 @@
+import json
+
+import pytest
+import httpx
+from httpx import ASGITransport
+from src.server.app import app
+from src.routes.search_route import get_service
+from src.services.search_service import SearchService
+from src.utils.json_stream import JsonArrayStreamParser
+
+
+class FakeGemini:
+    async def stream_store_items(self, prompt):
+        yield {"store_name": "Mart A", "price": "$1.00", "unit_quantity": "1 gal", "website_link": "https://a.example"}
+        yield {"store_name": "Mart B", "price": "$2.00", "unit_quantity": "1 gal", "website_link": "https://b.example"}
+
+
+@pytest.fixture
+def streaming_service(monkeypatch):
+    service = SearchService(http_pool=app.state.http_pool, gemini=FakeGemini())
+    service.places_enabled = False
+    monkeypatch.setattr(service, "_validate_configuration", lambda: None)
+    app.dependency_overrides[get_service] = lambda: service
+    yield service
+    app.dependency_overrides.clear()
+
+
+def test_parser_emits_objects_across_chunk_boundaries():
+    text = 'Sure!\n```json\n[{"store_name": "A [1]"}, {"store_name": "B \\"x\\"", "n": {"k": [1]}}]\n```'
+    parser = JsonArrayStreamParser()
+    items = []
+    for i in range(0, len(text), 4):
+        items.extend(parser.feed(text[i:i + 4]))
+    assert [item["store_name"] for item in items] == ["A [1]", 'B "x"']
+    assert parser.done
+
+
+@pytest.mark.asyncio
+async def test_stream_ndjson_events(streaming_service):
+    body = {"product_name": "milk", "zip_code": "98101", "min_store_results": "5", "radius_miles": "10"}
+    async with httpx.AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        r = await client.post("/api/v1/search/stream", json=body)
+    assert r.headers["content-type"].startswith("application/x-ndjson")
+    events = [json.loads(line) for line in r.text.splitlines()]
+    assert [e["event"] for e in events] == ["store", "store", "status"]
+    assert events[0]["store"]["store_details"]["store_name"] == "Mart A"
+    assert events[-1]["status_info"]["http_code"] == 200
+
+
+@pytest.mark.asyncio
+async def test_stream_sse_validation_error(streaming_service):
+    async with httpx.AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        r = await client.post(
+            "/api/v1/search/stream",
+            json={"product_name": "milk!!"},
+            headers={"Accept": "text/event-stream"},
+        )
+    assert r.headers["content-type"].startswith("text/event-stream")
+    assert r.text.startswith("event: status\ndata: ")
+    assert json.loads(r.text.split("data: ", 1)[1])["status_info"]["http_code"] == 400
+
+
+class CitingGemini:
+    async def stream_store_items(self, prompt):
+        item = {"store_name": "Mart A", "price": "$1.00", "unit_quantity": "1 gal"}
+        yield item
+        # GeminiService attaches citations to the yielded dicts once the stream ends
+        item["citations"] = [{"index": 1, "uri": "https://src/0", "title": "src0"}]
+
+
+@pytest.mark.asyncio
+async def test_stream_reports_citations_after_the_stores(streaming_service):
+    streaming_service.gemini = CitingGemini()
+    body = {"product_name": "milk", "zip_code": "98101", "min_store_results": "5", "radius_miles": "10"}
+    async with httpx.AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        r = await client.post("/api/v1/search/stream", json=body)
+    events = [json.loads(line) for line in r.text.splitlines()]
+    assert [e["event"] for e in events] == ["store", "citations", "status"]
+    assert events[1] == {"event": "citations", "index": 0, "citations": [{"index": 1, "uri": "https://src/0", "title": "src0"}]}
@@ -0,0 +1,69 @@
+import asyncio
+
+import pytest
+from src.utils.single_flight import SingleFlight
+
+
+class SlowCall:
+    def __init__(self, result="ok", error=None):
+        self.calls = 0
+        self.cancelled = False
+        self.result = result
+        self.error = error
+
+    async def __call__(self):
+        self.calls += 1
+        try:
+            await asyncio.sleep(0.05)
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+        if self.error:
+            raise self.error
+        return self.result
+
+
+@pytest.mark.asyncio
+async def test_concurrent_callers_share_one_call():
+    flight = SingleFlight()
+    call = SlowCall()
+    results = await asyncio.gather(*(flight.do("k", call) for _ in range(10)))
+    assert results == ["ok"] * 10
+    assert call.calls == 1
+    assert len(flight) == 0
+
+
+@pytest.mark.asyncio
+async def test_errors_reach_every_waiter():
+    flight = SingleFlight()
+    call = SlowCall(error=ValueError("boom"))
+    results = await asyncio.gather(*(flight.do("k", call) for _ in range(3)), return_exceptions=True)
+    assert all(isinstance(r, ValueError) for r in results)
+    assert call.calls == 1
+
+
+@pytest.mark.asyncio
+async def test_cancelling_one_waiter_keeps_the_shared_call():
+    flight = SingleFlight()
+    call = SlowCall()
+    first = asyncio.create_task(flight.do("k", call))
+    second = asyncio.create_task(flight.do("k", call))
+    await asyncio.sleep(0.01)
+    first.cancel()
+    assert await second == "ok"
+    assert first.cancelled()
+    assert not call.cancelled
+
+
+@pytest.mark.asyncio
+async def test_last_waiter_cancelling_stops_the_call():
+    flight = SingleFlight()
+    call = SlowCall()
+    waiter = asyncio.create_task(flight.do("k", call))
+    await asyncio.sleep(0.01)
+    waiter.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await waiter
+    await asyncio.sleep(0)
+    assert call.cancelled
+    assert not flight.in_flight("k")
@@ -0,0 +1,57 @@
+import pytest
+import httpx
+from httpx import ASGITransport
+from src.server.app import app
+from src.utils.tracing import InMemorySpanExporter, Tracer, parse_traceparent, set_tracer, span
+
+
+@pytest.fixture
+def exporter():
+    exporter = InMemorySpanExporter()
+    set_tracer(Tracer(exporter=exporter, sample_ratio=1.0))
+    yield exporter
+    set_tracer(None)
+
+
+def test_child_spans_nest_under_root(exporter):
+    with Tracer(exporter=exporter).start_trace("request") as root:
+        with span("child") as child:
+            child.set_attribute("k", 1)
+    finished = {s.name: s for s in exporter.get_finished_spans()}
+    assert finished["child"].parent_id == root.span_id
+    assert finished["child"].trace_id == root.trace_id == finished["request"].trace_id
+    assert finished["child"].attributes == {"k": 1}
+
+
+def test_unsampled_trace_exports_nothing():
+    exporter = InMemorySpanExporter()
+    tracer = Tracer(exporter=exporter, sample_ratio=0.0)
+    set_tracer(tracer)
+    try:
+        with tracer.start_trace("request"):
+            with span("child"):
+                pass
+    finally:
+        set_tracer(None)
+    assert exporter.get_finished_spans() == []
+
+
+@pytest.mark.asyncio
+async def test_traceparent_is_continued_and_returned(exporter):
+    incoming = "00-4bf92f3577b34da6a3ce929d0e0e4736-00f067aa0ba902b7-01"
+    async with httpx.AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        r = await client.get("/health", headers={"traceparent": incoming})
+    returned = parse_traceparent(r.headers["traceparent"])
+    assert returned.trace_id == "4bf92f3577b34da6a3ce929d0e0e4736"
+    assert r.headers["X-Request-ID"] == returned.trace_id
+    root = exporter.get_finished_spans()[-1]
+    assert root.name == "GET /health"
+    assert root.parent_id == "00f067aa0ba902b7"
+
+
+@pytest.mark.asyncio
+async def test_request_id_is_reused_as_trace_id(exporter):
+    request_id = "3f2c6d1e-8a4b-4c7d-9e0f-1a2b3c4d5e6f"
+    async with httpx.AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        r = await client.get("/health", headers={"X-Request-ID": request_id})
+    assert parse_traceparent(r.headers["traceparent"]).trace_id == request_id.replace("-", "")
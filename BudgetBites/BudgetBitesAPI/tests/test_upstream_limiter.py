@@ -0,0 +1,83 @@
+import asyncio
+import time
+
+import pytest
+from src.utils.resilience import DeadlineExceededError, RetryPolicy, retry_async
+from src.utils.upstream_limiter import AdaptiveLimiter, TokenBucket, UpstreamBusyError
+
+
+async def _hold(limiter, seconds, overloaded=False):
+    async with limiter.slot() as permit:
+        await asyncio.sleep(seconds)
+        if overloaded:
+            permit.mark_overloaded()
+
+
+@pytest.mark.asyncio
+async def test_concurrency_window_and_fail_fast_queue():
+    limiter = AdaptiveLimiter("test", initial_concurrency=2, max_concurrency=2, max_queue=1)
+    holders = [asyncio.create_task(_hold(limiter, 0.05)) for _ in range(3)]
+    await asyncio.sleep(0.01)
+    assert limiter.in_flight == 2
+    assert limiter.queued == 1
+    with pytest.raises(UpstreamBusyError):
+        async with limiter.slot():
+            pass
+    await asyncio.gather(*holders)
+    assert limiter.in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_queue_timeout_raises_busy():
+    limiter = AdaptiveLimiter("test", initial_concurrency=1, max_concurrency=1, queue_timeout=0.01)
+    holder = asyncio.create_task(_hold(limiter, 0.1))
+    await asyncio.sleep(0)
+    with pytest.raises(UpstreamBusyError):
+        async with limiter.slot():
+            pass
+    await holder
+
+
+@pytest.mark.asyncio
+async def test_aimd_shrinks_on_overload_and_grows_on_success():
+    limiter = AdaptiveLimiter("test", initial_concurrency=8, min_concurrency=1, max_concurrency=16, backoff_factor=0.5)
+    await _hold(limiter, 0, overloaded=True)
+    assert limiter.limit == 4
+    for _ in range(8):
+        await _hold(limiter, 0)
+    assert 5 <= limiter.limit < 6
+
+
+@pytest.mark.asyncio
+async def test_timeouts_and_deadlines_shrink_the_window():
+    limiter = AdaptiveLimiter("test", initial_concurrency=8, max_concurrency=16, latency_target=10, backoff_factor=0.5)
+    # retry_async's per-attempt timeout cancels the call inside the slot
+    with pytest.raises(asyncio.TimeoutError):
+        await retry_async(lambda: _hold(limiter, 1), RetryPolicy(max_retries=0), lambda exc: False, timeout_cap=0.01)
+    assert limiter.limit == 4
+    with pytest.raises(DeadlineExceededError):
+        async with limiter.slot():
+            raise DeadlineExceededError("Request deadline exceeded")
+    assert limiter.limit == 2
+    assert limiter.in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_client_cancellation_is_not_an_overload_signal():
+    limiter = AdaptiveLimiter("test", initial_concurrency=8, max_concurrency=16, backoff_factor=0.5)
+    task = asyncio.create_task(_hold(limiter, 1))
+    await asyncio.sleep(0.01)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+    assert limiter.limit == 8
+    assert limiter.in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_token_bucket_paces_calls():
+    bucket = TokenBucket(rate=50, burst=1)
+    started = time.perf_counter()
+    for _ in range(3):
+        await bucket.acquire()
+    assert time.perf_counter() - started >= 0.035
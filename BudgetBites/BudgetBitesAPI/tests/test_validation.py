@@ -0,0 +1,35 @@
+from src.utils import config
+from src.validation.schemas import SearchRequest, validate_search_criteria
+
+
+def _errors(**body):
+    req = SearchRequest.model_validate({"min_store_results": "5", "radius_miles": "10", **body})
+    return [(e.field, e.message) for e in validate_search_criteria(req) or []]
+
+
+def test_search_criteria_accepts_valid_request():
+    assert _errors(product_name=" milk ", zip_code="98101-1234") == []
+
+
+def test_search_criteria_reports_original_messages_in_order():
+    assert _errors(product_name="milk!", zip_code="9810") == [
+        ("product_name", "Product name contains invalid characters; only letters, numbers, and spaces are allowed"),
+        ("zip_code", "Zip code must be in format 12345 or 12345-6789"),
+    ]
+    assert _errors(product_name="  ") == [
+        ("product_name", "Product name is required"),
+        ("location", "Zip code is required"),
+    ]
+
+
+def test_validate_config_flags_bad_values():
+    assert config.validate_config() == []
+    broken = config.load_config()
+    broken["batch"]["max_concurrency"] = 0
+    broken["queries"]["zip_template"] = "Stores near {zip}"
+    broken["places"]["enrich_mode"] = "sometimes"
+    problems = config.validate_config(config.Settings(broken))
+    assert len(problems) == 3
+    assert any(p.startswith("batch.max_concurrency") for p in problems)
+    assert any(p.startswith("queries.zip_template") for p in problems)
+    assert any(p.startswith("places.enrich_mode") for p in problems)
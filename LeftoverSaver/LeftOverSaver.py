@@ -1,19 +1,14 @@
 import src.all_ingredients 
+import src.recipes
 
 if __name__ == "__main__":
    prompt_text, other_details, result = src.all_ingredients.run()
 
-   # If result is already a dict, use it directly; otherwise, call .json()
-   if hasattr(result, "json"):
-       data = result.json()
-   else:
-       data = result
-
-   #if isinstance(data, dict) and "recipes" in data and isinstance(data["recipes"], list) and len(data["recipes"]) > 0:
-       for r in data:
-           name = r.get("name", "No name")
-           ingredients = r.get("ingredients", [])
-           steps = r.get("steps", [])
-           print(name)
-           print([i for i in ingredients])
-           print([s for s in steps])
\ No newline at end of file
+   # The model answers in JSON; parse it into Recipe objects (name, ingredients with quantities, steps)
+   recipes = src.recipes.parse_recipes(result)
+   if not recipes:
+       print(other_details or "No recipes returned.")
+   for r in recipes:
+       print(r.name or "No name")
+       print([str(i) for i in r.ingredients])
+       print([s for s in r.steps])
@@ -13,15 +13,27 @@ script_path = 'LeftOverSaver.py'
 datas = [
     (str(Path('data') / 'api_key.txt'), 'data'),
     (str(Path('data') / 'ingredients_data.json'), 'data'),
-    (str(Path('data') / 'settings.json'), 'data'),
+    (str(Path('data') / 'app_settings.json'), 'data'),
 ]
 print (datas)
 
 # Hidden imports (if needed)
+# openai is imported lazily (src/all_ingredients.get_ai_client), so list it explicitly.
+# Its CLI and numpy/pandas helpers are never used here.
 hiddenimports = []
 
 from PyInstaller.utils.hooks import collect_submodules
-hiddenimports += collect_submodules('openai')
+hiddenimports += collect_submodules(
+    'openai',
+    filter=lambda name: not name.startswith(('openai.cli', 'openai._extras', 'openai.lib._old_api')),
+)
+
+# Packages that are pulled in transitively (or by PyInstaller hooks) but never imported at runtime
+excludes = [
+    'tkinter', 'unittest', 'pydoc', 'doctest', 'test', 'lib2to3', 'xmlrpc', 'pdb',
+    'numpy', 'pandas', 'pandas_stubs', 'matplotlib', 'IPython', 'PIL', 'setuptools', 'pip',
+    'sounddevice', 'websockets',
+]
 
 # Build the executable
 from PyInstaller.building.build_main import Analysis, PYZ, EXE, COLLECT
@@ -34,23 +46,33 @@ a = Analysis(
     hiddenimports=hiddenimports,
     hookspath=[],
     runtime_hooks=[],
-    excludes=[],
+    excludes=excludes,
     win_no_prefer_redirects=False,
     win_private_assemblies=False,
     cipher=block_cipher,
 )
 pyz = PYZ(a.pure, a.zipped_data, cipher=block_cipher)
+# onedir build: the one-file bootloader unpacked every binary and data file into a temp
+# directory on each launch; a folder build starts straight from dist/LeftOverSaver/.
+# UPX is off because decompressing the binaries costs more at startup than it saves on disk.
 exe = EXE(
     pyz,
     a.scripts,
-    a.binaries,
-    a.zipfiles,
-    a.datas,
     [],
+    exclude_binaries=True,
     name='LeftOverSaver',
     debug=False,
     bootloader_ignore_signals=False,
     strip=False,
-    upx=True,
+    upx=False,
     console=True,
-)
\ No newline at end of file
+)
+coll = COLLECT(
+    exe,
+    a.binaries,
+    a.zipfiles,
+    a.datas,
+    strip=False,
+    upx=False,
+    name='LeftOverSaver',
+)
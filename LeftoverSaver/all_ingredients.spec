@@ -6,11 +6,17 @@ a = Analysis(
     pathex=[],
     binaries=[],
     datas=[],
-    hiddenimports=[],
+    # openai is imported lazily (get_ai_client), so the analysis would not see it
+    hiddenimports=['openai'],
     hookspath=[],
     hooksconfig={},
     runtime_hooks=[],
-    excludes=[],
+    # Never imported at runtime; keeps the onedir folder (and its import scan) small
+    excludes=[
+        'tkinter', 'unittest', 'pydoc', 'doctest', 'test', 'lib2to3', 'xmlrpc', 'pdb',
+        'numpy', 'pandas', 'matplotlib', 'IPython', 'PIL', 'setuptools', 'pip',
+        'sounddevice', 'websockets',
+    ],
     noarchive=False,
     optimize=0,
 )
@@ -25,7 +31,7 @@ exe = EXE(
     debug=False,
     bootloader_ignore_signals=False,
     strip=False,
-    upx=True,
+    upx=False,
     console=True,
     disable_windowed_traceback=False,
     argv_emulation=False,
@@ -38,7 +44,7 @@ coll = COLLECT(
     a.binaries,
     a.datas,
     strip=False,
-    upx=True,
+    upx=False,
     upx_exclude=[],
     name='all_ingredients',
 )
@@ -0,0 +1,118 @@
+"""Cold-start benchmark for the LeftoverSaver web app.
+
+Reports two numbers, each from fresh interpreter processes:
+
+- import time of web.app (``python -X importtime``), with the slowest modules listed;
+- wall-clock time from launching the server process to the first successful ``GET /``.
+
+    python benchmarks/bench_startup.py [--runs 5] [--top 15] [--json]
+
+With ``--json`` the medians are printed as one JSON line, so results can be appended to a file
+and compared between commits.
+"""
+
+import argparse
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SERVER_CODE = (
+    "import sys; sys.path.insert(0, {root!r}); "
+    "from werkzeug.serving import run_simple; "
+    "from web.app import app; "
+    "run_simple('127.0.0.1', {port}, app, use_reloader=False, use_debugger=False)"
+)
+
+
+def import_times(module):
+    """Return ({module: cumulative_us}, total_us) for importing module in a fresh interpreter."""
+    proc = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', 'import sys; sys.path.insert(0, %r); import %s' % (ROOT, module)],
+        cwd=ROOT, capture_output=True, text=True, check=True,
+    )
+    cumulative = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith('import time:') or '|' not in line:
+            continue
+        parts = line[len('import time:'):].split('|')
+        try:
+            us = int(parts[1].strip())
+        except ValueError:  # header line
+            continue
+        cumulative[parts[2].strip()] = us
+    return cumulative, cumulative.get(module, 0)
+
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def time_to_first_response(timeout=30.0):
+    """Seconds from spawning the server process until GET / returns 200."""
+    port = _free_port()
+    start = time.perf_counter()
+    proc = subprocess.Popen(
+        [sys.executable, '-c', SERVER_CODE.format(root=ROOT, port=port)],
+        cwd=ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        while time.perf_counter() - start < timeout:
+            if proc.poll() is not None:
+                raise RuntimeError('server exited with code %s' % proc.returncode)
+            try:
+                with urllib.request.urlopen('http://127.0.0.1:%d/' % port, timeout=1) as response:
+                    if response.status == 200:
+                        return time.perf_counter() - start
+            except (urllib.error.URLError, ConnectionError, socket.timeout):
+                time.sleep(0.005)
+        raise RuntimeError('no response within %.0f s' % timeout)
+    finally:
+        proc.terminate()
+        proc.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--top', type=int, default=15, help='slowest modules to list')
+    parser.add_argument('--module', default='web.app')
+    parser.add_argument('--json', action='store_true', help='print medians as one JSON line')
+    args = parser.parse_args()
+
+    totals, first_response, last = [], [], {}
+    for _ in range(args.runs):
+        last, total = import_times(args.module)
+        totals.append(total / 1000.0)
+        first_response.append(time_to_first_response() * 1000.0)
+
+    result = {
+        'module': args.module,
+        'runs': args.runs,
+        'import_ms': round(statistics.median(totals), 1),
+        'first_response_ms': round(statistics.median(first_response), 1),
+        'openai_imported': 'openai' in last,
+    }
+    if args.json:
+        print(json.dumps(result))
+        return
+    print('import %s: median %.1f ms (min %.1f, max %.1f)' % (args.module, result['import_ms'], min(totals), max(totals)))
+    print('first response: median %.1f ms (min %.1f, max %.1f)' % (
+        result['first_response_ms'], min(first_response), max(first_response)))
+    print('openai imported at startup: %s' % result['openai_imported'])
+    print('\nslowest imports (cumulative, last run):')
+    for name, us in sorted(last.items(), key=lambda item: item[1], reverse=True)[:args.top]:
+        print('  %8.1f ms  %s' % (us / 1000.0, name))
+
+
+if __name__ == '__main__':
+    main()
@@ -3,21 +3,34 @@ import os
 
 SETTINGS_PATH = os.path.join(os.path.dirname(__file__), 'app_settings.json')
 
+# Parsed app_settings.json, loaded on first use and re-read only when the file changes on disk
+# (every recipe request asks for several settings).
+_cache = {'mtime': None, 'data': None}
+
+def _load_settings():
+    """Return the parsed settings dict ({} if the file is missing or invalid)."""
+    try:
+        mtime = os.stat(SETTINGS_PATH).st_mtime_ns
+    except OSError:
+        return {}
+    if _cache['mtime'] != mtime:
+        try:
+            with open(SETTINGS_PATH, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            data = {}
+        _cache['mtime'], _cache['data'] = mtime, data if isinstance(data, dict) else {}
+    return _cache['data']
+
 def get_ai_models():
     """Return a list of AI models from app_settings.json."""
-    try:
-        with open(SETTINGS_PATH, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-            # Collect all keys that start with 'ai_model'
-            return [v for k, v in data.items() if k.startswith('ai_model')]
-    except (FileNotFoundError, json.JSONDecodeError):
-        return []
+    # Collect all keys that start with 'ai_model'
+    return [v for k, v in _load_settings().items() if k.startswith('ai_model')]
 
 def get_other_settings():
     """Return a list of remaining settings (not AI models) from app_settings.json."""
-    try:
-        with open(SETTINGS_PATH, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-            return [{"name": k, "value": v} for k, v in data.items() if not k.startswith('ai_model')]
-    except (FileNotFoundError, json.JSONDecodeError):
-        return []
\ No newline at end of file
+    return [{"name": k, "value": v} for k, v in _load_settings().items() if not k.startswith('ai_model')]
+
+def get_setting(name, default=None):
+    """Return a single setting from app_settings.json, or default if it is missing."""
+    return _load_settings().get(name, default)
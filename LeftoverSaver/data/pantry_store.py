@@ -0,0 +1,137 @@
+import json
+import os
+import sqlite3
+import threading
+
+DATA_DIR = os.path.dirname(os.path.abspath(__file__))
+DB_PATH = os.path.join(DATA_DIR, 'pantry.sqlite3')
+LEGACY_JSON_PATH = os.path.join(DATA_DIR, 'ingredients_data.json')
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS ingredients (
+    id INTEGER PRIMARY KEY,
+    ingredient_name TEXT NOT NULL,
+    quantity INTEGER NOT NULL DEFAULT 0
+);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_ingredients_name ON ingredients (ingredient_name);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+INSERT OR IGNORE INTO meta (key, value) VALUES ('version', 0);
+"""
+
+# One connection per thread (Flask serves requests on several threads).
+_local = threading.local()
+_init_lock = threading.Lock()
+_initialized_paths = set()
+
+# Cached result of read_ingredients(), tagged with the pantry version it was read at.
+_snapshot_lock = threading.Lock()
+_snapshot = {'path': None, 'version': None, 'items': ()}
+
+
+def _connect(db_path=None):
+    """Return this thread's connection, creating the schema (and importing the JSON file) once."""
+    db_path = db_path or DB_PATH
+    connections = getattr(_local, 'connections', None)
+    if connections is None:
+        connections = _local.connections = {}
+    conn = connections.get(db_path)
+    if conn is None:
+        # isolation_level=None: we issue BEGIN/COMMIT ourselves
+        conn = sqlite3.connect(db_path, timeout=10, isolation_level=None, check_same_thread=False)
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA synchronous=NORMAL')
+        with _init_lock:
+            if db_path not in _initialized_paths:
+                conn.executescript(_SCHEMA)
+                # Only the app's own pantry starts from the legacy file; other databases start empty
+                if db_path == DB_PATH:
+                    _import_legacy_json(conn, LEGACY_JSON_PATH)
+                _initialized_paths.add(db_path)
+        connections[db_path] = conn
+    return conn
+
+
+def _import_legacy_json(conn, json_path):
+    """Copy a legacy ingredients JSON file into the database the first time it is opened."""
+    conn.execute('BEGIN IMMEDIATE')
+    try:
+        if conn.execute("SELECT 1 FROM meta WHERE key = 'json_imported'").fetchone():
+            conn.execute('COMMIT')
+            return
+        try:
+            with open(json_path, 'r', encoding='utf-8') as f:
+                items = json.load(f).get('ingredients', [])
+        except (FileNotFoundError, json.JSONDecodeError, AttributeError):
+            items = []
+        for item in items:
+            name = item.get('ingredient_name') if isinstance(item, dict) else None
+            if name:
+                _upsert(conn, name, int(item.get('quantity', 0) or 0))
+        conn.execute("INSERT INTO meta (key, value) VALUES ('json_imported', 1)")
+        conn.execute("UPDATE meta SET value = value + 1 WHERE key = 'version'")
+        conn.execute('COMMIT')
+    except Exception:
+        conn.execute('ROLLBACK')
+        raise
+
+
+def _upsert(conn, name, quantity):
+    conn.execute(
+        'INSERT INTO ingredients (ingredient_name, quantity) VALUES (?, ?) '
+        'ON CONFLICT (ingredient_name) DO UPDATE SET quantity = quantity + excluded.quantity',
+        (name, quantity),
+    )
+
+
+def _version(conn):
+    return conn.execute("SELECT value FROM meta WHERE key = 'version'").fetchone()[0]
+
+
+# Add quantities to existing ingredients and insert new ones, all in one transaction.
+# Each ingredient is an indexed upsert, so the cost does not depend on the pantry size.
+# Example input: [{'ingredient_name': 'Tomato', 'quantity': 3}]
+def add_ingredients(new_ingredients, db_path=None):
+    """Atomically add each item's quantity to the pantry (inserting unknown ingredients)."""
+    conn = _connect(db_path)
+    conn.execute('BEGIN IMMEDIATE')
+    try:
+        for item in new_ingredients:
+            name = item.get('ingredient_name')
+            if name:
+                _upsert(conn, name, int(item.get('quantity', 0) or 0))
+        # Bumping the version invalidates every process's cached snapshot
+        conn.execute("UPDATE meta SET value = value + 1 WHERE key = 'version'")
+        conn.execute('COMMIT')
+    except Exception:
+        conn.execute('ROLLBACK')
+        raise
+
+
+# Return ingredients with quantity > 0 in the order they were first added.
+# Served from a cached snapshot until any worker writes to the pantry.
+# Example return: [{'ingredient_name': 'Tomato', 'quantity': 3}]
+def list_ingredients(db_path=None):
+    """Return the pantry as a list of dicts, excluding items with quantity = 0."""
+    db_path = db_path or DB_PATH
+    conn = _connect(db_path)
+    version = _version(conn)
+    with _snapshot_lock:
+        if _snapshot['path'] == db_path and _snapshot['version'] == version:
+            items = _snapshot['items']
+        else:
+            items = tuple(conn.execute(
+                'SELECT ingredient_name, quantity FROM ingredients WHERE quantity > 0 ORDER BY id'
+            ).fetchall())
+            _snapshot.update(path=db_path, version=version, items=items)
+    return [{'ingredient_name': name, 'quantity': quantity} for name, quantity in items]
+
+
+def close(db_path=None):
+    """Close this thread's connection (tests and shutdown)."""
+    connections = getattr(_local, 'connections', {})
+    conn = connections.pop(db_path or DB_PATH, None)
+    if conn is not None:
+        conn.close()
@@ -0,0 +1,122 @@
+import hashlib
+import json
+import os
+import threading
+import time
+
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'recipe_cache')
+# Bump when the cached entry format or the prompt template changes, so old entries are ignored
+CACHE_VERSION = 2
+
+# Default bounds; overridable with recipe_cache_max_entries / recipe_cache_max_mb in app_settings.json
+DEFAULT_MAX_ENTRIES = 200
+DEFAULT_MAX_MB = 20
+
+_lock = threading.Lock()
+
+
+# Build the cache key for one recipe request.
+# Ingredients are normalized (trimmed, lower-cased, duplicates summed, sorted) so the same pantry
+# always hashes the same regardless of the order items were added in.
+# Example return: '3f5a...' (64 hex characters)
+def make_key(ingredients, user_prompt, model_name, temperature, max_tokens, recipes_count=None):
+    """Return a SHA-256 hex digest identifying a recipe request."""
+    pantry = {}
+    for item in ingredients:
+        name = ' '.join(str(item.get('ingredient_name') or '').split()).lower()
+        if name:
+            pantry[name] = pantry.get(name, 0) + int(item.get('quantity') or 0)
+    payload = {
+        'v': CACHE_VERSION,
+        'ingredients': sorted(pantry.items()),
+        'prompt': ' '.join((user_prompt or '').split()),
+        'model': model_name,
+        'temperature': float(temperature),
+        'max_tokens': int(max_tokens),
+        # Only affects the default prompt, but that is part of what the model is asked
+        'recipes_count': recipes_count,
+    }
+    blob = json.dumps(payload, sort_keys=True, ensure_ascii=False, separators=(',', ':'))
+    return hashlib.sha256(blob.encode('utf-8')).hexdigest()
+
+
+def _entry_path(key, cache_dir=None):
+    return os.path.join(cache_dir or CACHE_DIR, key + '.json')
+
+
+# Return the cached value for key, or None on a miss.
+# A hit refreshes the entry's modification time, which is what eviction orders by (LRU).
+def get(key, cache_dir=None):
+    """Return the value stored under key, or None if it is not cached."""
+    path = _entry_path(key, cache_dir)
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            entry = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError, OSError):
+        return None
+    if not isinstance(entry, dict) or entry.get('v') != CACHE_VERSION:
+        return None
+    try:
+        os.utime(path, None)
+    except OSError:
+        pass
+    return entry.get('value')
+
+
+# Store value (anything JSON serializable) under key, then evict least recently used entries
+# until the cache is within max_entries and max_bytes.
+def put(key, value, max_entries=DEFAULT_MAX_ENTRIES, max_bytes=DEFAULT_MAX_MB * 1024 * 1024, cache_dir=None):
+    """Write value to the cache and trim the cache to its size limits."""
+    cache_dir = cache_dir or CACHE_DIR
+    os.makedirs(cache_dir, exist_ok=True)
+    path = _entry_path(key, cache_dir)
+    tmp_path = '%s.%d.%d.tmp' % (path, os.getpid(), threading.get_ident())
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump({'v': CACHE_VERSION, 'created': time.time(), 'value': value}, f, ensure_ascii=False)
+    # Atomic rename: readers in other workers never see a half-written entry
+    os.replace(tmp_path, path)
+    _evict(cache_dir, max_entries, max_bytes)
+
+
+def _evict(cache_dir, max_entries, max_bytes):
+    with _lock:
+        entries = []
+        total = 0
+        with os.scandir(cache_dir) as it:
+            for e in it:
+                if not e.name.endswith('.json'):
+                    continue
+                try:
+                    st = e.stat()
+                except OSError:
+                    continue
+                entries.append((st.st_mtime, st.st_size, e.path))
+                total += st.st_size
+        if len(entries) <= max_entries and total <= max_bytes:
+            return
+        entries.sort()
+        count = len(entries)
+        for _, size, path in entries:
+            if count <= max_entries and total <= max_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            count -= 1
+            total -= size
+
+
+# Remove every cached recipe.
+def clear(cache_dir=None):
+    """Delete all entries from the recipe cache."""
+    cache_dir = cache_dir or CACHE_DIR
+    if not os.path.isdir(cache_dir):
+        return
+    with _lock:
+        for name in os.listdir(cache_dir):
+            if name.endswith('.json'):
+                try:
+                    os.remove(os.path.join(cache_dir, name))
+                except OSError:
+                    pass
@@ -1,14 +1,30 @@
-import openai
 import json
 import os
+import threading
 import data.get_set_ing_data as ingredient_data
 #import data.get_set_ing_data as update_ingredients
 #import data.get_app_settings as get_ai_models
 import data.get_app_settings as app_settings
+import data.recipe_cache as recipe_cache
+import src.recipes as recipe_model
 
-ai_client = openai
 DATA_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "data"))
-print(f"Data directory set to: {DATA_DIR}")
+
+# The openai package takes far longer to import than the rest of the app, and most entry points
+# (the pantry pages, cached recipes) never call the model, so it is imported on first use.
+ai_client = None
+def get_ai_client():
+    global ai_client
+    if ai_client is None:
+        import openai
+        ai_client = openai
+    return ai_client
+
+# Import the OpenAI client on a background thread, e.g. while the user is still typing a prompt.
+def preload_ai_client():
+    if ai_client is None:
+        threading.Thread(target=get_ai_client, name="openai-preload", daemon=True).start()
+
 def read_file(filename):
     path = os.path.join(DATA_DIR, filename)
     try:
@@ -56,57 +72,141 @@ def get_other_settings():
     # Default values
     return (3, 500, 0.7)
 
-def get_recipes_from_ai(ingredients, user_prompt_text=None):
+# How each model is made to answer in the recipe JSON shape (src/recipes.RECIPES_SCHEMA):
+# "json_schema" = structured output, the schema is enforced by the API;
+# "json_object" = JSON mode, valid JSON is enforced and the shape is given in the prompt;
+# None = the model supports neither, so the shape is only given in the prompt.
+# Dated or suffixed variants use the longest matching prefix (gpt-4o-mini -> gpt-4o).
+RESPONSE_FORMATS = {
+    "gpt-5": "json_schema",
+    "gpt-4o": "json_schema",
+    "gpt-4-turbo": "json_object",
+    "gpt-4": None,
+    "gpt-3.5-turbo": "json_object",
+    "gpt-3.5-turbo-16k": None,
+}
+
+def get_response_format(model_name):
+    for prefix in sorted(RESPONSE_FORMATS, key=len, reverse=True):
+        if model_name == prefix or model_name.startswith(prefix + "-"):
+            return RESPONSE_FORMATS[prefix]
+    return None
+
+def build_prompts(ingredients, user_prompt_text, recipes_count, response_format):
+    """Return (instructions, user message, used default prompt). The JSON shape is spelled out
+    only when the API does not enforce it."""
+    is_default = not user_prompt_text
+    if is_default:
+        user_prompt_text = f"Suggest {recipes_count} recipes"
+    user_prompt_text = user_prompt_text.strip().rstrip(".")
+    prompt = f"{user_prompt_text}. Use only these ingredients and quantities: {ingredients}"
+    instructions = "You suggest recipes. Give ingredient quantities."
+    if response_format != "json_schema":
+        instructions += " Reply with " + recipe_model.RECIPES_SCHEMA_HINT
+    return instructions, prompt, is_default
+
+# on_token: optional callback; when given, the response is streamed and each text chunk is
+# passed to it as the model produces it. The full text is still returned at the end.
+def get_recipes_from_ai(ingredients, user_prompt_text=None, on_token=None):
     model_name = get_model_name()
     recipes_count, max_tokens, temperature = get_other_settings()
-    def_prompt_txt = ""
-    if not user_prompt_text:
-        user_prompt_text = (
-            f"Suggest {recipes_count} recipes I can make using only below listed ingredients. "
-            "List each recipe with its name, ingredients, and steps."
-        )
-        def_prompt_txt = f"\nUsing default prompt:\n"
+    response_format = get_response_format(model_name)
+    instructions, final_prompt, is_default = build_prompts(
+        ingredients, user_prompt_text, recipes_count, response_format
+    )
+    def_prompt_txt = f"\nUsing default prompt:\n" if is_default else ""
+    openai = get_ai_client()
     model_details = f"Fetching recipe suggestions from AI Model - {model_name.upper()}..."
     print(def_prompt_txt + model_details)
-    prompt_json_txt = "Your response should be a JSON format with a 'recipes' key containing a list of recipes. Each recipe should have 'name', 'ingredients', and 'steps' keys."
-
-    user_prompt_text += f". Suggest from these ingredients and based on their quantities only:\n {ingredients}"
-    final_prompt = user_prompt_text + ". " + prompt_json_txt
-    display_prompt = def_prompt_txt + user_prompt_text
+    display_prompt = def_prompt_txt + final_prompt
     try:
-        if model_name == "gpt-5":
-            response = openai.responses.create(
-                model=model_name,
-                input=final_prompt,
-                response_format={"type": "json_object"}
-            )
+        if model_name.startswith("gpt-5"):
+            # Responses API; gpt-5 takes neither temperature nor a completion token limit here
+            request = {"model": model_name, "instructions": instructions, "input": final_prompt}
+            if response_format == "json_schema":
+                request["text"] = {"format": {"type": "json_schema", "name": "recipes", "strict": True,
+                                              "schema": recipe_model.RECIPES_SCHEMA}}
+            elif response_format == "json_object":
+                request["text"] = {"format": {"type": "json_object"}}
+            if on_token:
+                chunks = []
+                for event in openai.responses.create(stream=True, **request):
+                    if getattr(event, "type", "") == "response.output_text.delta" and event.delta:
+                        chunks.append(event.delta)
+                        on_token(event.delta)
+                return display_prompt, model_details, "".join(chunks)
+            response = openai.responses.create(**request)
             return display_prompt, model_details, getattr(response, "output_text", None)
         else:
-            response = openai.chat.completions.create(
-                model=model_name,
-                messages=[{"role": "user", "content": final_prompt}],
-                max_tokens=max_tokens,
-                temperature=temperature,
-                #response_format={"type": "json_object"}
-            )
+            request = {
+                "model": model_name,
+                "messages": [
+                    {"role": "system", "content": instructions},
+                    {"role": "user", "content": final_prompt},
+                ],
+                "max_tokens": max_tokens,
+                "temperature": temperature,
+            }
+            if response_format == "json_schema":
+                request["response_format"] = {"type": "json_schema", "json_schema": {
+                    "name": "recipes", "strict": True, "schema": recipe_model.RECIPES_SCHEMA}}
+            elif response_format == "json_object":
+                request["response_format"] = {"type": "json_object"}
+            if on_token:
+                chunks = []
+                for chunk in openai.chat.completions.create(stream=True, **request):
+                    delta = chunk.choices[0].delta.content if chunk.choices else None
+                    if delta:
+                        chunks.append(delta)
+                        on_token(delta)
+                return display_prompt, model_details, "".join(chunks)
+            response = openai.chat.completions.create(**request)
             return display_prompt, model_details, response.choices[0].message.content
     except Exception as e:
         print(f"Error fetching recipes from AI: {e}")
         return None, None, None
 
-def run(user_prompt=None):
+def recipe_cache_enabled():
+    return bool(app_settings.get_setting("recipe_cache_enabled", True))
+
+# Cache key for a recipe request: same pantry, prompt, model and model settings -> same key.
+def get_recipe_cache_key(ingredients, user_prompt=None):
+    recipes_count, max_tokens, temperature = get_other_settings()
+    return recipe_cache.make_key(ingredients, user_prompt, get_model_name(), temperature, max_tokens, recipes_count)
+
+# use_cache=False bypasses the recipe cache (always ask the model, but still store the answer).
+# use_cache=None follows recipe_cache_enabled in app_settings.json.
+# on_token: optional callback receiving the model's output as it streams (see get_recipes_from_ai).
+def run(user_prompt=None, use_cache=None, on_token=None):
     ingredients = fetch_ingredients()
     ingredients_qty = [f"{item['ingredient_name']} - {item['quantity']}" for item in ingredients]
     ingredients_str = ", ".join(ingredients_qty)
     if not ingredients:
         print("No ingredients found.")
         return "", "No ingredients found.", ""
+    cache_enabled = recipe_cache_enabled()
+    cache_key = get_recipe_cache_key(ingredients, user_prompt) if cache_enabled else None
+    if cache_key and use_cache is not False:
+        cached = recipe_cache.get(cache_key)
+        if cached:
+            print("Using cached recipe suggestions.")
+            return cached.get("prompt", ""), cached.get("model_details", ""), cached.get("recipes", "")
     openai_api_key = get_api_key()
     if not openai_api_key:
         print("Please set your OPENAI_API_KEY in data/api_key.txt.")
         return user_prompt or "", "Missing API key.", ""
-    openai.api_key = openai_api_key
+    get_ai_client().api_key = openai_api_key
     #user_prompt = input("Enter Leftover Saver prompt (or press Enter to use default): ").strip()
-    user_prompt, model_details, recipes = get_recipes_from_ai(ingredients_str, user_prompt)
+    user_prompt, model_details, recipes = get_recipes_from_ai(ingredients_str, user_prompt, on_token)
+    if cache_key and recipes:
+        try:
+            recipe_cache.put(
+                cache_key,
+                {"prompt": user_prompt or "", "model_details": model_details or "", "recipes": recipes},
+                max_entries=int(app_settings.get_setting("recipe_cache_max_entries", recipe_cache.DEFAULT_MAX_ENTRIES)),
+                max_bytes=int(float(app_settings.get_setting("recipe_cache_max_mb", recipe_cache.DEFAULT_MAX_MB)) * 1024 * 1024),
+            )
+        except (OSError, TypeError, ValueError) as e:
+            print(f"Error writing recipe cache: {e}")
     return user_prompt or "", model_details or "", recipes or ""
     #print(recipes if recipes else "No recipes returned.")
\ No newline at end of file
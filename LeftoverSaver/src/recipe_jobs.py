@@ -0,0 +1,142 @@
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+import data.get_app_settings as app_settings
+import src.all_ingredients as all_ingredients
+
+# Background recipe generation.
+# A POST enqueues a job on a small, bounded thread pool and gets a job id back right away;
+# the page then polls get_job() or follows stream_job() (tokens as the model produces them).
+
+DEFAULT_WORKERS = 2
+DEFAULT_MAX_PENDING = 16
+DEFAULT_TTL_SECONDS = 600
+
+_lock = threading.Lock()
+_jobs = {}
+_executor = None
+
+
+class RecipeJob:
+    """State of one recipe request; tokens are appended by the worker and read by SSE streams."""
+
+    def __init__(self, prompt, use_cache):
+        self.id = uuid.uuid4().hex
+        self.prompt = prompt
+        self.use_cache = use_cache
+        self.status = 'queued'  # queued -> running -> done | error
+        self.tokens = []
+        self.final_prompt = ''
+        self.model_details = ''
+        self.result = ''
+        self.error = None
+        self.finished_at = None
+        self.changed = threading.Condition()
+
+    def add_token(self, text):
+        with self.changed:
+            self.tokens.append(text)
+            self.changed.notify_all()
+
+    def finish(self, status, error=None):
+        with self.changed:
+            self.status = status
+            self.error = error
+            self.finished_at = time.time()
+            self.changed.notify_all()
+
+    def to_dict(self):
+        return {
+            'job_id': self.id,
+            'status': self.status,
+            'text': ''.join(self.tokens),
+            'result': self.result,
+            'final_prompt': self.final_prompt,
+            'model_details': self.model_details,
+            'error': self.error,
+        }
+
+
+def _setting(name, default):
+    try:
+        return int(app_settings.get_setting(name, default))
+    except (TypeError, ValueError):
+        return default
+
+
+def _get_executor():
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=max(1, _setting('recipe_job_workers', DEFAULT_WORKERS)),
+            thread_name_prefix='recipe-job',
+        )
+    return _executor
+
+
+def _run_job(job):
+    with job.changed:
+        job.status = 'running'
+        job.changed.notify_all()
+    try:
+        job.final_prompt, job.model_details, job.result = all_ingredients.run(
+            job.prompt, use_cache=job.use_cache, on_token=job.add_token
+        )
+    except Exception as e:
+        print(f"Error in recipe job {job.id}: {e}")
+        job.finish('error', str(e))
+        return
+    if job.result and not job.tokens:
+        # Cache hits and non-streaming fallbacks produce the whole answer at once
+        job.add_token(job.result)
+    job.finish('done' if job.result else 'error', None if job.result else (job.model_details or 'No recipes returned.'))
+
+
+def _prune(now):
+    ttl = _setting('recipe_job_ttl_seconds', DEFAULT_TTL_SECONDS)
+    expired = [job_id for job_id, job in _jobs.items() if job.finished_at and now - job.finished_at > ttl]
+    for job_id in expired:
+        del _jobs[job_id]
+
+
+# Enqueue a recipe request. Returns the job, or None when too many jobs are already waiting.
+def submit_job(prompt=None, use_cache=None):
+    """Start generating recipes in the background and return the new RecipeJob (None if the queue is full)."""
+    with _lock:
+        _prune(time.time())
+        pending = sum(1 for job in _jobs.values() if job.status in ('queued', 'running'))
+        if pending >= _setting('recipe_job_max_pending', DEFAULT_MAX_PENDING):
+            return None
+        job = RecipeJob(prompt, use_cache)
+        _jobs[job.id] = job
+    _get_executor().submit(_run_job, job)
+    return job
+
+
+def get_job(job_id):
+    """Return the RecipeJob with this id, or None if it is unknown or expired."""
+    with _lock:
+        return _jobs.get(job_id)
+
+
+# Yield ('token', text) for every chunk the model produces, then one ('done' | 'error', job).
+# keepalive_seconds: yield ('ping', None) when nothing arrived for that long, so proxies keep the stream open.
+def stream_job(job, keepalive_seconds=15):
+    """Generator over a job's tokens, ending with its final state."""
+    sent = 0
+    while True:
+        with job.changed:
+            if sent == len(job.tokens) and job.status in ('queued', 'running'):
+                job.changed.wait(keepalive_seconds)
+            tokens = job.tokens[sent:]
+            status = job.status
+        if tokens:
+            sent += len(tokens)
+            yield 'token', ''.join(tokens)
+        elif status in ('queued', 'running'):
+            yield 'ping', None
+        if status not in ('queued', 'running') and sent == len(job.tokens):
+            yield status, job
+            return
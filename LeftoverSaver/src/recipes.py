@@ -0,0 +1,219 @@
+import json
+import re
+from dataclasses import asdict, dataclass, field
+
+# Typed recipe model, the JSON schema the models are asked to follow, and parsers for
+# their output: parse_recipes() for a complete response, RecipeStreamParser / iter_recipes()
+# for a response that is still streaming in.
+
+
+@dataclass
+class RecipeIngredient:
+    name: str
+    quantity: str = ''  # free text, e.g. "2", "1 cup", "to taste"
+
+    def __str__(self):
+        return f"{self.quantity} {self.name}".strip()
+
+
+@dataclass
+class Recipe:
+    name: str
+    ingredients: list = field(default_factory=list)  # list of RecipeIngredient
+    steps: list = field(default_factory=list)  # list of str
+
+    @classmethod
+    def from_dict(cls, data):
+        """Build a Recipe from a decoded JSON object, tolerating the shapes older prompts produced."""
+        ingredients = []
+        raw_ingredients = data.get('ingredients') or []
+        if isinstance(raw_ingredients, str):
+            raw_ingredients = _LIST_SEPARATOR.split(raw_ingredients)
+        for item in raw_ingredients:
+            if isinstance(item, dict):
+                name = item.get('name') or item.get('ingredient_name') or item.get('ingredient') or ''
+                ingredients.append(RecipeIngredient(str(name).strip(), str(item.get('quantity') or '').strip()))
+            elif str(item).strip():
+                ingredients.append(RecipeIngredient(str(item).strip()))
+        steps = data.get('steps') or data.get('instructions') or []
+        if isinstance(steps, str):
+            steps = steps.splitlines()
+        return cls(
+            name=str(data.get('name') or data.get('title') or '').strip(),
+            ingredients=ingredients,
+            steps=[str(step).strip() for step in steps if str(step).strip()],
+        )
+
+    def to_dict(self):
+        return asdict(self)
+
+
+# Structured-output schema (strict mode requires every property listed and no extras)
+RECIPES_SCHEMA = {
+    'type': 'object',
+    'properties': {
+        'recipes': {
+            'type': 'array',
+            'items': {
+                'type': 'object',
+                'properties': {
+                    'name': {'type': 'string'},
+                    'ingredients': {
+                        'type': 'array',
+                        'items': {
+                            'type': 'object',
+                            'properties': {'name': {'type': 'string'}, 'quantity': {'type': 'string'}},
+                            'required': ['name', 'quantity'],
+                            'additionalProperties': False,
+                        },
+                    },
+                    'steps': {'type': 'array', 'items': {'type': 'string'}},
+                },
+                'required': ['name', 'ingredients', 'steps'],
+                'additionalProperties': False,
+            },
+        },
+    },
+    'required': ['recipes'],
+    'additionalProperties': False,
+}
+
+# The same shape in one line, for models that only get JSON mode or no response format at all
+RECIPES_SCHEMA_HINT = 'JSON: {"recipes":[{"name":str,"ingredients":[{"name":str,"quantity":str}],"steps":[str]}]}'
+
+_SPECIAL = re.compile(r'[\[\]{}"]')
+_STRING_SPECIAL = re.compile(r'["\\]')
+_LIST_SEPARATOR = re.compile(r'\s*[\n,]\s*')
+_FENCE = re.compile(r'^\s*```(?:json)?\s*|\s*```\s*$')
+
+
+class RecipeStreamParser:
+    """Incremental parser: feed() text as it arrives and get back each recipe whose object just closed.
+
+    Follows the same rules as parse_recipes(): recipes are the objects of a top-level array or of
+    the "recipes" array of a top-level object, and a bare top-level object with a "name" is a
+    single recipe (returned once it closes). Each character is scanned once, so parsing a whole
+    response costs O(n) however it is chunked.
+    """
+
+    def __init__(self):
+        self.text = ''
+        self.pos = 0
+        self.depth = 0
+        self.array_depth = None  # depth of the recipe array once found
+        self.start = -1  # start of the recipe object being read
+        self.root_start = -1  # start of a top-level object (maybe a bare recipe)
+        self.string_start = -1
+        self.last_key = None  # last string closed directly inside the top-level object
+        self.found_any = False
+        self.done = False
+        self.in_string = False
+        self.escaped = False
+
+    def feed(self, chunk):
+        """Add a chunk of model output; return the list of Recipes completed by it."""
+        found = []
+        if self.done:
+            return found
+        self.text += chunk
+        text = self.text
+        pos = self.pos
+        while pos < len(text) and not self.done:
+            if self.in_string:
+                if self.escaped:
+                    self.escaped = False
+                    pos += 1
+                    continue
+                match = _STRING_SPECIAL.search(text, pos)
+                if match is None:
+                    pos = len(text)
+                    break
+                pos = match.end()
+                if match.group() == '\\':
+                    self.escaped = True
+                else:
+                    self.in_string = False
+                    if self.depth == 1:
+                        self.last_key = text[self.string_start + 1:pos - 1]
+                continue
+            match = _SPECIAL.search(text, pos)
+            if match is None:
+                pos = len(text)
+                break
+            c = match.group()
+            pos = match.end()
+            if c == '"':
+                self.in_string = True
+                self.string_start = pos - 1
+            elif c == '[':
+                self.depth += 1
+                # A top-level array, or the "recipes" array of the top-level object
+                if self.array_depth is None and (self.depth == 1 or (self.depth == 2 and self.last_key == 'recipes')):
+                    self.array_depth = self.depth
+            elif c == '{':
+                self.depth += 1
+                if self.depth == 1:
+                    self.root_start = pos - 1
+                elif self.array_depth is not None and self.depth == self.array_depth + 1:
+                    self.start = pos - 1
+            elif c == '}':
+                if self.start >= 0 and self.depth == self.array_depth + 1:
+                    recipe = _decode_recipe(text[self.start:pos])
+                    if recipe is not None:
+                        found.append(recipe)
+                        self.found_any = True
+                    self.start = -1
+                elif self.depth == 1 and self.array_depth is None and self.root_start >= 0:
+                    recipe = _decode_recipe(text[self.root_start:pos], bare=True)
+                    if recipe is not None:
+                        found.append(recipe)
+                    self.done = True
+                self.depth = max(0, self.depth - 1)
+            else:  # ']'
+                if self.array_depth is not None and self.depth == self.array_depth:
+                    if self.array_depth == 1 and not self.found_any:
+                        self.array_depth = None  # prose brackets such as "[1]" before the JSON
+                    else:
+                        self.done = True
+                self.depth = max(0, self.depth - 1)
+        self.pos = pos
+        # Drop consumed text unless it may still be needed: a recipe object being read, or a
+        # top-level object that could turn out to be a bare recipe
+        if self.start < 0 and not (self.array_depth is None and self.depth > 0) and self.pos > 4096:
+            self.text = self.text[self.pos:]
+            self.pos = 0
+            self.root_start = -1
+        return found
+
+
+def _decode_recipe(blob, bare=False):
+    try:
+        data = json.loads(blob)
+    except ValueError:
+        return None
+    if not isinstance(data, dict) or (bare and 'name' not in data):
+        return None
+    return Recipe.from_dict(data)
+
+
+def iter_recipes(chunks):
+    """Yield each Recipe from an iterable of text chunks as soon as its JSON object is complete."""
+    parser = RecipeStreamParser()
+    for chunk in chunks:
+        yield from parser.feed(chunk)
+
+
+def parse_recipes(text):
+    """Return the list of Recipes in a complete model response ([] if it contains none)."""
+    if not text:
+        return []
+    try:
+        data = json.loads(_FENCE.sub('', text))
+    except ValueError:
+        # Prose around the JSON, or a truncated response: keep every recipe that did close
+        return RecipeStreamParser().feed(text)
+    if isinstance(data, dict):
+        data = data.get('recipes', [data] if 'name' in data else [])
+    if not isinstance(data, list):
+        return []
+    return [Recipe.from_dict(item) for item in data if isinstance(item, dict)]
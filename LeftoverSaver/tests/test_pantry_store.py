@@ -0,0 +1,58 @@
+import threading
+
+import pytest
+
+import data.pantry_store as pantry_store
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    path = str(tmp_path / 'pantry.sqlite3')
+    yield path
+    pantry_store.close(path)
+
+
+def test_new_database_is_not_seeded_from_the_app_pantry(db_path):
+    assert pantry_store.list_ingredients(db_path) == []
+
+
+def test_add_ingredients_upserts_and_skips_empty_quantities(db_path):
+    pantry_store.add_ingredients([{'ingredient_name': 'eggs', 'quantity': 2}, {'ingredient_name': 'salt', 'quantity': 0}], db_path)
+    pantry_store.add_ingredients([{'ingredient_name': 'milk', 'quantity': 1}, {'ingredient_name': 'eggs', 'quantity': 3}], db_path)
+    assert pantry_store.list_ingredients(db_path) == [
+        {'ingredient_name': 'eggs', 'quantity': 5},
+        {'ingredient_name': 'milk', 'quantity': 1},
+    ]
+
+
+def test_concurrent_upserts_are_not_lost(db_path):
+    def add_many():
+        for _ in range(50):
+            pantry_store.add_ingredients([{'ingredient_name': 'eggs', 'quantity': 1}, {'ingredient_name': 'milk', 'quantity': 2}], db_path)
+        pantry_store.close(db_path)
+
+    threads = [threading.Thread(target=add_many) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert pantry_store.list_ingredients(db_path) == [
+        {'ingredient_name': 'eggs', 'quantity': 200},
+        {'ingredient_name': 'milk', 'quantity': 400},
+    ]
+
+
+def test_write_from_another_thread_invalidates_the_snapshot(db_path):
+    pantry_store.add_ingredients([{'ingredient_name': 'eggs', 'quantity': 1}], db_path)
+    assert pantry_store.list_ingredients(db_path) == [{'ingredient_name': 'eggs', 'quantity': 1}]
+
+    writer = threading.Thread(target=pantry_store.add_ingredients, args=([{'ingredient_name': 'eggs', 'quantity': 4}], db_path))
+    writer.start()
+    writer.join()
+    assert pantry_store.list_ingredients(db_path) == [{'ingredient_name': 'eggs', 'quantity': 5}]
+
+
+def test_returned_lists_do_not_share_the_snapshot(db_path):
+    pantry_store.add_ingredients([{'ingredient_name': 'eggs', 'quantity': 1}], db_path)
+    pantry_store.list_ingredients(db_path)[0]['quantity'] = 99
+    assert pantry_store.list_ingredients(db_path) == [{'ingredient_name': 'eggs', 'quantity': 1}]
@@ -0,0 +1,56 @@
+import os
+
+import data.recipe_cache as recipe_cache
+
+
+def _key(ingredients, prompt='Quick dinners', model='gpt-4o', temperature=0.7, max_tokens=800):
+    return recipe_cache.make_key(ingredients, prompt, model, temperature, max_tokens, 4)
+
+
+def test_key_ignores_order_case_whitespace_and_duplicate_entries():
+    a = _key([{'ingredient_name': 'Eggs ', 'quantity': 2}, {'ingredient_name': 'milk', 'quantity': 1},
+              {'ingredient_name': 'eggs', 'quantity': 1}], prompt=' Quick   dinners')
+    b = _key([{'ingredient_name': 'milk', 'quantity': 1}, {'ingredient_name': 'eggs', 'quantity': 3}])
+    assert a == b
+
+
+def test_key_changes_with_quantities_prompt_and_model_settings():
+    pantry = [{'ingredient_name': 'eggs', 'quantity': 2}]
+    base = _key(pantry)
+    assert base != _key([{'ingredient_name': 'eggs', 'quantity': 3}])
+    assert base != _key(pantry, prompt='Breakfast')
+    assert base != _key(pantry, model='gpt-4')
+    assert base != _key(pantry, temperature=0.2)
+    assert base != _key(pantry, max_tokens=500)
+
+
+def _age(cache_dir, key, mtime):
+    os.utime(os.path.join(cache_dir, key + '.json'), (mtime, mtime))
+
+
+def test_evicts_least_recently_used_entries_beyond_max_entries(tmp_path):
+    cache_dir = str(tmp_path)
+    for i, key in enumerate(('a', 'b', 'c')):
+        recipe_cache.put(key, {'recipes': key}, max_entries=3, cache_dir=cache_dir)
+        _age(cache_dir, key, 1000 + i)
+    # Reading 'a' makes it the most recently used, so 'b' is evicted next
+    assert recipe_cache.get('a', cache_dir=cache_dir) == {'recipes': 'a'}
+    recipe_cache.put('d', {'recipes': 'd'}, max_entries=3, cache_dir=cache_dir)
+    assert sorted(os.listdir(cache_dir)) == ['a.json', 'c.json', 'd.json']
+    assert recipe_cache.get('b', cache_dir=cache_dir) is None
+
+
+def test_evicts_down_to_max_bytes(tmp_path):
+    cache_dir = str(tmp_path)
+    for i, key in enumerate(('a', 'b', 'c')):
+        recipe_cache.put(key, {'recipes': 'x' * 1000}, cache_dir=cache_dir)
+        _age(cache_dir, key, 1000 + i)
+    recipe_cache.put('d', {'recipes': 'x' * 1000}, max_bytes=2500, cache_dir=cache_dir)
+    assert sorted(os.listdir(cache_dir)) == ['c.json', 'd.json']
+
+
+def test_entries_from_another_cache_version_are_misses(tmp_path, monkeypatch):
+    cache_dir = str(tmp_path)
+    recipe_cache.put('a', {'recipes': 'old'}, cache_dir=cache_dir)
+    monkeypatch.setattr(recipe_cache, 'CACHE_VERSION', recipe_cache.CACHE_VERSION + 1)
+    assert recipe_cache.get('a', cache_dir=cache_dir) is None
@@ -0,0 +1,86 @@
+import threading
+
+import pytest
+
+import src.all_ingredients as all_ingredients
+import src.recipe_jobs as recipe_jobs
+
+
+@pytest.fixture(autouse=True)
+def clean_jobs():
+    recipe_jobs._jobs.clear()
+    yield
+    recipe_jobs._jobs.clear()
+
+
+def _events(job):
+    return [(event, value if event == 'token' else None) for event, value in recipe_jobs.stream_job(job, keepalive_seconds=5)]
+
+
+def test_stream_job_yields_tokens_then_one_final_event():
+    job = recipe_jobs.RecipeJob('prompt', None)
+
+    def work():
+        for token in ('{"recipes":', '[]', '}'):
+            job.add_token(token)
+        job.finish('done')
+
+    threading.Thread(target=work).start()
+    events = _events(job)
+    assert events[-1] == ('done', None)
+    assert [e for e, _ in events[:-1]] == ['token'] * (len(events) - 1)
+    assert ''.join(v for _, v in events[:-1]) == '{"recipes":[]}'
+
+
+def test_stream_job_replays_tokens_of_a_finished_job():
+    job = recipe_jobs.RecipeJob('prompt', None)
+    job.add_token('abc')
+    job.finish('error', 'boom')
+    assert _events(job) == [('token', 'abc'), ('error', None)]
+
+
+def test_submit_job_streams_model_output(monkeypatch):
+    def fake_run(prompt=None, use_cache=None, on_token=None):
+        on_token('{"recipes": ')
+        on_token('[]}')
+        return 'final prompt', 'details', '{"recipes": []}'
+
+    monkeypatch.setattr(all_ingredients, 'run', fake_run)
+    job = recipe_jobs.submit_job('quick dinners')
+    events = _events(job)
+    assert events[-1] == ('done', None)
+    assert ''.join(v for e, v in events if e == 'token') == '{"recipes": []}'
+    assert recipe_jobs.get_job(job.id).to_dict()['final_prompt'] == 'final prompt'
+
+
+def test_cached_answer_arrives_as_one_token(monkeypatch):
+    monkeypatch.setattr(all_ingredients, 'run', lambda prompt=None, use_cache=None, on_token=None: ('p', 'm', '{"recipes": []}'))
+    job = recipe_jobs.submit_job()
+    assert _events(job) == [('token', '{"recipes": []}'), ('done', None)]
+
+
+def test_failed_run_ends_with_error(monkeypatch):
+    def fake_run(prompt=None, use_cache=None, on_token=None):
+        raise RuntimeError('model unavailable')
+
+    monkeypatch.setattr(all_ingredients, 'run', fake_run)
+    job = recipe_jobs.submit_job()
+    assert _events(job) == [('error', None)]
+    assert job.error == 'model unavailable'
+
+
+def test_submit_job_rejects_when_queue_is_full(monkeypatch):
+    release = threading.Event()
+
+    def blocking_run(prompt=None, use_cache=None, on_token=None):
+        release.wait(5)
+        return 'p', 'm', '{"recipes": []}'
+
+    monkeypatch.setattr(all_ingredients, 'run', blocking_run)
+    monkeypatch.setattr(recipe_jobs, '_setting', lambda name, default: 1 if name == 'recipe_job_max_pending' else default)
+    first = recipe_jobs.submit_job()
+    try:
+        assert recipe_jobs.submit_job() is None
+    finally:
+        release.set()
+    assert _events(first)[-1] == ('done', None)
@@ -0,0 +1,106 @@
+import json
+
+import pytest
+
+from src.recipes import Recipe, RecipeIngredient, RecipeStreamParser, iter_recipes, parse_recipes
+
+RESPONSE = json.dumps({
+    'recipes': [
+        {
+            'name': 'Tomato Soup',
+            'ingredients': [{'name': 'tomato', 'quantity': '3'}, {'name': 'salt', 'quantity': 'to taste'}],
+            'steps': ['Chop the tomatoes {roughly}.', 'Simmer "20 min" [covered].'],
+        },
+        {
+            'name': 'Omelette',
+            'ingredients': [{'name': 'egg', 'quantity': '2'}],
+            'steps': ['Whisk.', 'Fry.'],
+        },
+    ],
+})
+
+
+def _chunks(text, size):
+    return [text[i:i + size] for i in range(0, len(text), size)]
+
+
+def _names(recipes):
+    return [recipe.name for recipe in recipes]
+
+
+@pytest.mark.parametrize('size', [1, 3, 17, 4096])
+def test_stream_parser_yields_each_recipe_whatever_the_chunking(size):
+    recipes = list(iter_recipes(_chunks(RESPONSE, size)))
+
+    assert _names(recipes) == ['Tomato Soup', 'Omelette']
+    assert recipes[0].ingredients[1] == RecipeIngredient('salt', 'to taste')
+    assert recipes[0].steps[1] == 'Simmer "20 min" [covered].'
+
+
+def test_stream_parser_returns_a_recipe_as_soon_as_its_object_closes():
+    parser = RecipeStreamParser()
+    first_end = RESPONSE.index('}]', RESPONSE.index('Simmer')) + 2
+
+    assert _names(parser.feed(RESPONSE[:first_end])) == ['Tomato Soup']
+    assert _names(parser.feed(RESPONSE[first_end:])) == ['Omelette']
+
+
+def test_fenced_response_is_parsed_by_both_parsers():
+    text = '```json\n' + RESPONSE + '\n```'
+
+    assert _names(parse_recipes(text)) == ['Tomato Soup', 'Omelette']
+    assert _names(iter_recipes(_chunks(text, 5))) == ['Tomato Soup', 'Omelette']
+
+
+def test_truncated_response_keeps_the_recipes_that_closed():
+    text = RESPONSE[:RESPONSE.index('Fry')]
+
+    assert _names(parse_recipes(text)) == ['Tomato Soup']
+    assert _names(iter_recipes(_chunks(text, 7))) == ['Tomato Soup']
+
+
+def test_bare_recipe_object_is_one_recipe_not_its_ingredients():
+    text = json.dumps({'name': 'Solo', 'ingredients': [{'name': 'egg', 'quantity': '1'}], 'steps': ['Boil.']})
+
+    assert _names(parse_recipes(text)) == ['Solo']
+    assert _names(iter_recipes(_chunks(text, 4))) == ['Solo']
+
+
+def test_only_the_recipes_array_is_read():
+    text = json.dumps({
+        'notes': [{'name': 'not a recipe'}],
+        'recipes': [{'name': 'Salad', 'ingredients': ['lettuce'], 'steps': ['Toss.']}],
+        'extras': [{'name': 'also not a recipe'}],
+    })
+
+    assert _names(parse_recipes(text)) == ['Salad']
+    assert _names(iter_recipes(_chunks(text, 6))) == ['Salad']
+
+
+def test_prose_around_the_json_is_skipped():
+    text = 'Here are ideas [1] for you:\n' + RESPONSE + '\nEnjoy!'
+
+    assert _names(parse_recipes(text)) == ['Tomato Soup', 'Omelette']
+    assert _names(iter_recipes(_chunks(text, 9))) == ['Tomato Soup', 'Omelette']
+
+
+def test_top_level_array_of_recipes():
+    text = json.dumps([{'name': 'A'}, {'name': 'B'}])
+
+    assert _names(parse_recipes(text)) == ['A', 'B']
+    assert _names(iter_recipes(_chunks(text, 2))) == ['A', 'B']
+
+
+def test_from_dict_splits_string_ingredients_and_steps():
+    recipe = Recipe.from_dict({'title': 'Pancakes', 'ingredients': 'eggs, milk\nflour', 'instructions': 'Mix.\nFry.'})
+
+    assert recipe.name == 'Pancakes'
+    assert recipe.ingredients == [RecipeIngredient('eggs'), RecipeIngredient('milk'), RecipeIngredient('flour')]
+    assert recipe.steps == ['Mix.', 'Fry.']
+
+
+def test_from_dict_accepts_legacy_ingredient_keys():
+    recipe = Recipe.from_dict({'name': 'Toast', 'ingredients': [{'ingredient_name': 'bread', 'quantity': 2}]})
+
+    assert recipe.ingredients == [RecipeIngredient('bread', '2')]
+    assert str(recipe.ingredients[0]) == '2 bread'
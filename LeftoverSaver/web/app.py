@@ -1,32 +1,89 @@
-from flask import Flask, render_template, request, redirect, url_for, jsonify
+from flask import Flask, render_template, request, redirect, url_for, jsonify, Response, stream_with_context
+import json
 import os
 import sys
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 from data.get_set_ing_data import update_ingredients, read_ingredients
 import src.all_ingredients as all_ingredients
+import src.recipe_jobs as recipe_jobs
+import src.recipes as recipes_parser
 
 app = Flask(__name__)
 @app.route('/recipes')
 def recipes_page():
+    all_ingredients.preload_ai_client()
     return render_template('recipes.html')
 
 @app.route('/get_recipes', methods=['POST'])
 def get_recipes():
     data = request.get_json()
     prompt = data.get('prompt', None)
-    prompt_text, model_details, result = all_ingredients.run(prompt)
-    recipes = []
-    if result:
-        try:
-            recipes = [r.replace('\n', '').strip() for r in result.split('\n\n') if r.strip()]
-        except Exception:
-            recipes = []
+    # {"no_cache": true} always asks the model instead of returning a cached answer
+    use_cache = False if data.get('no_cache') else None
+    prompt_text, model_details, result = all_ingredients.run(prompt, use_cache=use_cache)
     return jsonify({
-        'recipes': recipes,
+        'recipes': structured_recipes(result),
         'final_prompt': prompt_text or "",
         'model_details': model_details or ""
     })
 
+# The model answers in JSON (see src/recipes.py); returns a list of
+# {'name': ..., 'ingredients': [{'name': ..., 'quantity': ...}], 'steps': [...]} dicts.
+def structured_recipes(result):
+    return [recipe.to_dict() for recipe in recipes_parser.parse_recipes(result)]
+
+# Asynchronous mode: POST returns a job id immediately (202); the recipes are generated on a
+# bounded worker pool. Fetch the result with GET /recipe_jobs/<id> (polling) or follow
+# GET /recipe_jobs/<id>/stream (server-sent events: "token" with the model's output as it arrives,
+# "recipe" with each parsed recipe as soon as it is complete, then "done").
+@app.route('/recipe_jobs', methods=['POST'])
+def create_recipe_job():
+    data = request.get_json(silent=True) or {}
+    use_cache = False if data.get('no_cache') else None
+    job = recipe_jobs.submit_job(data.get('prompt', None), use_cache=use_cache)
+    if job is None:
+        return jsonify({'error': 'Too many recipe requests in progress, please try again shortly.'}), 503
+    return jsonify({
+        'job_id': job.id,
+        'status': job.status,
+        'status_url': url_for('recipe_job_status', job_id=job.id),
+        'stream_url': url_for('recipe_job_stream', job_id=job.id)
+    }), 202
+
+@app.route('/recipe_jobs/<job_id>')
+def recipe_job_status(job_id):
+    job = recipe_jobs.get_job(job_id)
+    if job is None:
+        return jsonify({'error': 'Unknown recipe job.'}), 404
+    payload = job.to_dict()
+    payload['recipes'] = structured_recipes(job.result) if job.status == 'done' else []
+    return jsonify(payload)
+
+@app.route('/recipe_jobs/<job_id>/stream')
+def recipe_job_stream(job_id):
+    job = recipe_jobs.get_job(job_id)
+    if job is None:
+        return jsonify({'error': 'Unknown recipe job.'}), 404
+
+    def events():
+        parser = recipes_parser.RecipeStreamParser()
+        for event, value in recipe_jobs.stream_job(job):
+            if event == 'token':
+                yield f"event: token\ndata: {json.dumps(value)}\n\n"
+                # Each recipe is sent as soon as its JSON object is complete
+                for recipe in parser.feed(value):
+                    yield f"event: recipe\ndata: {json.dumps(recipe.to_dict())}\n\n"
+            elif event == 'ping':
+                yield ": keepalive\n\n"
+            else:
+                payload = value.to_dict()
+                payload['recipes'] = structured_recipes(value.result)
+                # One final "done" event for success and failure alike ("error" is reserved by EventSource)
+                yield f"event: done\ndata: {json.dumps(payload)}\n\n"
+
+    return Response(stream_with_context(events()), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
 @app.route('/', methods=['GET', 'POST'])
 def index():
     success_message = None